@@ -0,0 +1,287 @@
+"""Scripted performance scenarios for Space Shooter.
+
+Each scenario sets up a real Game (headless, fixed seed) and drives it with
+scripted input for a fixed number of ticks, once simulation-only and once
+drawing every tick to an offscreen surface (or, with --renderer texture, a
+hidden window). Frame times and the per-system breakdown from
+perf.FrameProfiler are reported as JSON.
+
+    python benchmark.py                       # all scenarios
+    python benchmark.py --scenario beam_sweep --ticks 1200 --output results.json
+    python benchmark.py --renderer texture    # rendered runs with the SDL2 texture renderer
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import pygame
+import controls
+import enemy_bullets
+import pool
+from game import Game
+from perf import FrameProfiler
+from sprites import Explosion
+
+SEED = 1234
+DEFAULT_TICKS = 600
+DEFAULT_WARMUP = 60
+
+# 场景注册表：名称 -> Scenario
+SCENARIOS = {}
+
+# 场景自身的随机数（如爆炸位置），每次运行前按种子重置
+scenario_rng = random.Random()
+
+
+class Scenario:
+    """A named benchmark setup: the ship, formation and input to start with plus per-tick hooks"""
+
+    def __init__(self, name, description, setup, ship='interceptor', formation=1, inputs=None, tick=None):
+        self.name = name
+        self.description = description
+        self.setup = setup
+        self.ship = ship
+        self.formation = formation
+        self.inputs = inputs  # 返回输入位迭代器的函数，None表示无输入
+        self.tick = tick  # 每步之后调用，用于维持场景负载
+
+
+def scenario(name, description, **options):
+    """Register the decorated function as a scenario's setup(game)"""
+    def register(setup):
+        SCENARIOS[name] = Scenario(name, description, setup, **options)
+        return setup
+    return register
+
+
+def keep_alive(game):
+    """Keep the player in the game so a scenario measures the same load throughout
+
+    Called after setup and after every tick (respawned ships start vulnerable).
+    """
+    game.showing_round_announcement = False
+    game.lives = 10 ** 6
+    for ship in game.player_ships:
+        ship.is_invulnerable = True
+        ship.invulnerable_timer = float('inf')
+
+
+def top_up_enemies(game, count):
+    """Spawn enemies until there are count of them
+
+    The spawn director is paused, so the scenario keeps exactly count enemies
+    instead of the director's budget for the round on top of them.
+    """
+    game.director.paused = True
+    game.director.queue.clear()
+    while len(game.enemies) < count:
+        game.spawn_enemy()
+
+
+def count_sprites(game):
+    """Return the number of sprites plus bullet and particle entities in the game"""
+    return len(game.all_sprites) + sum(len(entities) for entities in game.entity_lists()) + len(game.world)
+
+
+def fire_every_tick():
+    # 非光束武器只在按下空格时射击，每步都按一次，射速由武器冷却决定
+    return itertools.repeat(controls.FIRE | controls.PRESS_FIRE)
+
+
+def sweep_inputs():
+    """Hold fire and sweep left and right across the screen"""
+    while True:
+        for _ in range(45):
+            yield controls.FIRE | controls.LEFT
+        for _ in range(90):
+            yield controls.FIRE | controls.RIGHT
+        for _ in range(45):
+            yield controls.FIRE | controls.LEFT
+
+
+def stay_on_bullet_hell(game):
+    boss = game.boss
+    if boss is not None and boss.current_phase['attack_patterns'] != ['bullet_hell']:
+        # 复制当前（最终）相位，保留其攻击间隔，避免修改共享的Boss设计数据
+        boss.current_phase = dict(boss.current_phase, attack_patterns=['bullet_hell'])
+
+
+@scenario('boss_bullet_hell', "Boss in its final phase firing only the bullet_hell pattern at a stationary player",
+          tick=stay_on_bullet_hell)
+def boss_bullet_hell(game):
+    for enemy in list(game.enemies):
+        enemy.kill()
+    game.spawn_boss()
+    boss = game.boss
+    # 血量低于最后一个阈值，由update_phase()进入真正的最终阶段（800ms攻击间隔、2倍速度）；
+    # 血量足够大，场景中不会被打死
+    boss.max_health = 10 ** 9
+    boss.health = boss.max_health // 10
+    boss.update_phase()
+    boss.rect.y = 100
+    stay_on_bullet_hell(game)
+
+
+@scenario('missile_barrage', "Three-ship formation firing missiles at 15 enemies",
+          formation=3, inputs=fire_every_tick, tick=lambda game: top_up_enemies(game, 15))
+def missile_barrage(game):
+    for ship in game.player_ships:
+        ship.current_weapon = 'missile'
+    top_up_enemies(game, 15)
+
+
+@scenario('beam_sweep', "Three-ship formation sweeping the beam weapon across a full wave",
+          formation=3, inputs=sweep_inputs, tick=lambda game: top_up_enemies(game, 10))
+def beam_sweep(game):
+    for ship in game.player_ships:
+        ship.current_weapon = 'beam'
+    top_up_enemies(game, 10)
+
+
+BULLET_COLORS = [(255, 100, 0), (255, 0, 128), (0, 200, 255), (255, 255, 0)]
+
+
+def top_up_enemy_bullets(game, count):
+    """Fire slow boss-owned bullets from random points until count enemy bullets are alive"""
+    missing = count - len(game.world.tables[enemy_bullets.ENEMY_BULLET.key])
+    if missing <= 0:
+        return
+    uniform = scenario_rng.uniform
+    enemy_bullets.spawn_volley(game.world, [uniform(0, 1024) for _ in range(missing)],
+                               [uniform(0, 768) for _ in range(missing)],
+                               [uniform(-1, 1) for _ in range(missing)], [uniform(-1, 1) for _ in range(missing)],
+                               10, [BULLET_COLORS[i % len(BULLET_COLORS)] for i in range(missing)], 4, game.boss)
+
+
+@scenario('enemy_bullets_5000', "5000 live enemy bullets owned by a boss drifting around a stationary player",
+          tick=lambda game: top_up_enemy_bullets(game, 5000))
+def enemy_bullets_5000(game):
+    boss_bullet_hell(game)
+    game.boss.shoot_delay = float('inf')  # 子弹只由场景补充
+    top_up_enemy_bullets(game, 5000)
+
+
+def explode_50(game):
+    if game.game_clock.tick_count % 60 == 1:
+        for _ in range(50):
+            Explosion((scenario_rng.randrange(1024), scenario_rng.randrange(768)), 40, game.particles)
+
+
+@scenario('explosions_50', "50 simultaneous explosions every second", tick=explode_50)
+def explosions_50(game):
+    explode_50(game)
+
+
+@scenario('round_10_density', "Round 10 enemy stats and spawn density with the player firing",
+          inputs=fire_every_tick, tick=lambda game: top_up_enemies(game, 15))
+def round_10_density(game):
+    game.current_round = 10
+    game.score_for_boss = float('inf')  # 只测试普通敌人
+    for enemy in list(game.enemies):
+        enemy.kill()
+    top_up_enemies(game, 15)
+
+
+def run_scenario(scenario, ticks=DEFAULT_TICKS, warmup=DEFAULT_WARMUP, render=False, seed=SEED, backend='surface'):
+    """Run one scenario and return its profiler report plus entity counts"""
+    # 游戏的控制台输出不计入测量
+    with contextlib.redirect_stdout(io.StringIO()):
+        scenario_rng.seed(seed)
+        game = Game(headless=True, render=render, seed=seed, backend=backend)
+        game.start_game(scenario.ship, scenario.formation)
+        keep_alive(game)
+        scenario.setup(game)
+        if scenario.inputs is not None:
+            game.input_frames = scenario.inputs()
+
+        profiler = FrameProfiler()
+        peak_sprites = 0
+        for i in range(warmup + ticks):
+            if i == warmup:
+                game.profiler = profiler
+            profiler.begin_frame()
+            game.step()
+            if render:
+                game.draw()
+            profiler.end_frame()
+            keep_alive(game)
+            if scenario.tick is not None:
+                scenario.tick(game)
+            peak_sprites = max(peak_sprites, count_sprites(game))
+
+    report = profiler.report()
+    if render:
+        report['renderer'] = game.renderer.backend  # 实际使用的后端（纹理后端不可用时回退到surface）
+    report['peak_sprites'] = peak_sprites
+    report['final_sprites'] = count_sprites(game)
+    report['pools'] = pool.stats()
+    report['despawned'] = game.despawner.stats()
+    return report
+
+
+def run(names=None, ticks=DEFAULT_TICKS, warmup=DEFAULT_WARMUP, render=True, seed=SEED, backend='surface'):
+    """Run the named scenarios (default: all) and return the JSON report
+
+    backend is the renderer of the rendered runs ('surface' or 'texture').
+    """
+    results = {}
+    for name in names or SCENARIOS:
+        scenario = SCENARIOS[name]
+        result = {'description': scenario.description,
+                  'headless': run_scenario(scenario, ticks, warmup, False, seed)}
+        if render:
+            result['rendered'] = run_scenario(scenario, ticks, warmup, True, seed, backend)
+        results[name] = result
+        print(f"{name}: headless {result['headless']['frame_ms']['mean']:.2f} ms/tick"
+              + (f", rendered {result['rendered']['frame_ms']['mean']:.2f} ms/tick" if render else ''),
+              file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'ticks': ticks,
+            'warmup': warmup,
+            'seed': seed,
+            'renderer': backend if render else None,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'scenarios': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter scenario benchmarks")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help='scenario to run (repeatable, default: all)')
+    parser.add_argument('--ticks', type=int, default=DEFAULT_TICKS, help='measured ticks per run')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help='unmeasured ticks before measuring')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--no-render', action='store_true', help='skip the rendered runs')
+    parser.add_argument('--renderer', choices=['surface', 'texture'], default='surface',
+                        help='renderer of the rendered runs (texture draws into a hidden window)')
+    parser.add_argument('--output', metavar='PATH', help='write the JSON report to a file instead of stdout')
+    parser.add_argument('--list', action='store_true', help='list the scenarios and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for scenario in SCENARIOS.values():
+            print(f"{scenario.name:20} {scenario.description}")
+        return
+
+    report = run(args.scenario, args.ticks, args.warmup, not args.no_render, args.seed, args.renderer)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
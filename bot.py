@@ -0,0 +1,169 @@
+import math
+import controls
+import enemy_bullets
+
+SCREEN_WIDTH = 1024
+SCREEN_HEIGHT = 768
+
+# 候选移动方向（包括不动）
+MOVES = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+_MOVE_BITS = {-1: controls.LEFT, 1: controls.RIGHT}
+_MOVE_BITS_Y = {-1: controls.UP, 1: controls.DOWN}
+_FORMATION_BITS = {1: controls.PRESS_1, 2: controls.PRESS_2, 3: controls.PRESS_3}
+
+LOOKAHEAD = (3, 6, 10, 16)  # 预测威胁位置的步数
+THREAT_RANGE = 320  # 只考虑这个距离内的子弹和敌人
+SAFE_MARGIN = 14  # 与威胁保持的额外距离（像素）
+HOME_Y = SCREEN_HEIGHT - 110  # 飞船平时停留的高度
+WEAPON_HOLD_TICKS = 180  # 换武器后至少保持的步数，避免来回切换
+
+
+class Bot:
+    """Autopilot that plays through the same input bits as the keyboard.
+
+    Assign it to Game.input_frames: every tick it looks at the enemies, their
+    bullets and the power-ups, picks the move whose predicted path keeps furthest from
+    enemy bullets and ships while lining up under a target, and holds fire.
+    It also switches to a weapon that suits the situation and asks for the
+    given formation, one key press at a time like a player would.
+    """
+
+    def __init__(self, game, formation=None):
+        self.game = game
+        self.formation = formation  # 希望的编队（1-3），None表示不改变
+        self.last_positions = {}  # 精灵 -> 上一步的中心位置，用于估计实际速度
+        self.weapon_hold = 0
+        self.tick = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.decide()
+
+    def decide(self):
+        """Return the input bits for the current tick"""
+        game = self.game
+        self.tick += 1
+        if game.state != 'playing' or not game.player_ships:
+            self.last_positions = {}
+            return 0
+
+        threats, power_ups, enemies = self.scan()
+        ship = game.player_ships[0]
+        x, y = ship.rect.center
+        threats = [threat for threat in threats
+                   if abs(threat[0] - x) < THREAT_RANGE and abs(threat[1] - y) < THREAT_RANGE]
+        target = self.pick_target(ship, enemies)
+
+        best_bits, best_score = 0, None
+        for dx, dy in MOVES:
+            score = self.score_move(ship, dx, dy, threats, power_ups, target)
+            if best_score is None or score < best_score:
+                best_bits, best_score = self.move_bits(dx, dy), score
+
+        bits = best_bits | controls.FIRE
+        if enemies:
+            bits |= controls.PRESS_FIRE  # 非光束武器每次按下空格才射击，射速由武器冷却限制
+        return bits | self.key_press(ship, enemies)
+
+    def scan(self):
+        """Return (threats, power-up positions, enemies) from the game's sprite groups
+
+        Threats are (x, y, vx, vy, radius) tuples for the enemies and the
+        bullets they own (the ones the game checks against the player).
+        Enemy velocities are measured from the previous tick so they include
+        everything that moves the sprite.
+        """
+        positions = {}
+        threats = []
+        enemies = list(self.game.enemies)
+        for enemy in enemies:
+            threats.append(self.threat(enemy, positions, 0.8))
+        self.last_positions = positions
+        # 子弹直线飞行，速度直接取自子弹表格
+        threats.extend((x, y, vx, vy, width / 2)
+                       for x, y, vx, vy, width in enemy_bullets.owned_by(self.game.world, self.game.enemies))
+        power_ups = [power_up.rect.center for power_up in self.game.power_ups]
+        return threats, power_ups, enemies
+
+    def threat(self, sprite, positions, scale):
+        x, y = sprite.rect.center
+        positions[sprite] = (x, y)
+        last = self.last_positions.get(sprite)
+        if last is not None:
+            vx, vy = x - last[0], y - last[1]
+        else:
+            vx, vy = sprite.speed_x, sprite.speed_y
+        return x, y, vx, vy, max(sprite.rect.width, sprite.rect.height) / 2 * scale
+
+    def pick_target(self, ship, enemies):
+        """Return the x position to line up under: the boss, or the lowest enemy above the ship"""
+        boss = self.game.boss
+        if boss is not None and boss.alive():
+            return boss.rect.centerx
+        above = [enemy for enemy in enemies if enemy.rect.bottom < ship.rect.top and enemy.rect.bottom > 0]
+        if not above:
+            return None
+        return max(above, key=lambda enemy: enemy.rect.bottom).rect.centerx
+
+    def score_move(self, ship, dx, dy, threats, power_ups, target):
+        """Lower is better: predicted closeness to threats plus distance from where we want to be
+
+        threats should already be limited to the ones near the ship.
+        """
+        x, y = ship.rect.center
+        half_w, half_h = ship.rect.width / 2, ship.rect.height / 2
+        ship_radius = min(half_w, half_h) * 0.8
+        score = 0.0
+        end_x = end_y = 0
+        for ticks in LOOKAHEAD:
+            # 按住方向键时的位置（与Player.update一样限制在屏幕内）
+            px = min(max(x + dx * ship.speed_x * ticks, half_w), SCREEN_WIDTH - half_w)
+            py = min(max(y + dy * ship.speed_y * ticks, half_h), SCREEN_HEIGHT - half_h)
+            end_x, end_y = px, py
+            weight = 1.0 / ticks
+            for tx, ty, vx, vy, radius in threats:
+                distance = math.hypot(tx + vx * ticks - px, ty + vy * ticks - py)
+                reach = radius + ship_radius + SAFE_MARGIN
+                if distance < reach:
+                    score += (reach - distance) / reach * 1000 * weight
+
+        # 贴边时难以躲避
+        edge = min(end_x, SCREEN_WIDTH - end_x)
+        if edge < 80:
+            score += (80 - edge) * 0.5
+        score += abs(end_y - HOME_Y) * 0.05
+        if target is not None:
+            score += abs(end_x - target) * 0.1
+        for px, py in power_ups:
+            if abs(px - x) < 250 and py < SCREEN_HEIGHT:
+                score -= max(0.0, 250 - math.hypot(px - end_x, py - end_y)) * 0.1
+        return score
+
+    def move_bits(self, dx, dy):
+        return _MOVE_BITS.get(dx, 0) | _MOVE_BITS_Y.get(dy, 0)
+
+    def wanted_weapon(self, enemies):
+        boss = self.game.boss
+        if boss is not None and boss.alive():
+            return 'beam'
+        return 'missile' if len(enemies) >= 6 else 'laser'
+
+    def key_press(self, ship, enemies):
+        """Return at most one key press bit: formation first, then weapon switching"""
+        if self.tick % 2:
+            return 0  # 每隔一步才按键，与人手的按键节奏相近
+        if self.formation is not None and self.game.formation_type != self.formation:
+            return _FORMATION_BITS[self.formation]
+        if self.weapon_hold > 0:
+            self.weapon_hold -= 2
+            return 0
+        wanted = self.wanted_weapon(enemies)
+        if ship.current_weapon == wanted:
+            return 0
+        # TAB按顺序切换到下一种武器（见 Player.switch_weapon）
+        weapons = list(ship.weapons)
+        if weapons[(weapons.index(ship.current_weapon) + 1) % len(weapons)] == wanted:
+            self.weapon_hold = WEAPON_HOLD_TICKS
+        return controls.PRESS_TAB
@@ -0,0 +1,97 @@
+import pygame
+
+# 每个模拟步的输入用一个整数的位表示，录像按此格式保存
+# 持续按住的按键（pygame.key.get_pressed()）
+LEFT = 1 << 0
+RIGHT = 1 << 1
+UP = 1 << 2
+DOWN = 1 << 3
+FIRE = 1 << 4
+HELD_MASK = LEFT | RIGHT | UP | DOWN | FIRE
+
+# 本步按下的按键（KEYDOWN事件）
+PRESS_FIRE = 1 << 5
+PRESS_TAB = 1 << 6
+PRESS_1 = 1 << 7
+PRESS_2 = 1 << 8
+PRESS_3 = 1 << 9
+PRESS_ESC = 1 << 10
+
+HELD_KEYS = {
+    LEFT: (pygame.K_LEFT, pygame.K_a),
+    RIGHT: (pygame.K_RIGHT, pygame.K_d),
+    UP: (pygame.K_UP, pygame.K_w),
+    DOWN: (pygame.K_DOWN, pygame.K_s),
+    FIRE: (pygame.K_SPACE,),
+}
+
+# 回放时按此顺序重新生成KEYDOWN事件
+PRESS_KEYS = {
+    PRESS_ESC: pygame.K_ESCAPE,
+    PRESS_TAB: pygame.K_TAB,
+    PRESS_1: pygame.K_1,
+    PRESS_2: pygame.K_2,
+    PRESS_3: pygame.K_3,
+    PRESS_FIRE: pygame.K_SPACE,
+}
+_PRESS_BITS = {key: bit for bit, key in PRESS_KEYS.items()}
+
+
+def held_bits(keys):
+    """Return the held-key bits for a pygame.key.get_pressed() result"""
+    bits = 0
+    for bit, key_codes in HELD_KEYS.items():
+        if any(keys[key] for key in key_codes):
+            bits |= bit
+    return bits
+
+
+def is_recorded_press(event):
+    """True for KEYDOWN events that are recorded as press bits"""
+    return event.type == pygame.KEYDOWN and event.key in _PRESS_BITS
+
+
+def press_bits(events):
+    """Return the press bits for the KEYDOWN events the game records"""
+    bits = 0
+    for event in events:
+        if event.type == pygame.KEYDOWN:
+            bits |= _PRESS_BITS.get(event.key, 0)
+    return bits
+
+
+def press_events(bits):
+    """Recreate the KEYDOWN events for recorded press bits, in a fixed order"""
+    return [pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0)
+            for bit, key in PRESS_KEYS.items() if bits & bit]
+
+
+class Controls:
+    """Input state of the current tick, read by the player ships instead of the keyboard.
+
+    The game fills it from the keyboard, a replay or an autopilot once per tick,
+    so the simulation never depends on live device state.
+    """
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @property
+    def left(self):
+        return bool(self.bits & LEFT)
+
+    @property
+    def right(self):
+        return bool(self.bits & RIGHT)
+
+    @property
+    def up(self):
+        return bool(self.bits & UP)
+
+    @property
+    def down(self):
+        return bool(self.bits & DOWN)
+
+    @property
+    def fire(self):
+        return bool(self.bits & FIRE)
@@ -0,0 +1,244 @@
+"""Replay corpus regression benchmark for Space Shooter.
+
+Plays every recorded session in benchmarks/corpus headless, once
+simulation-only and once drawing to an offscreen surface, and compares frame
+times, the per-system breakdown and allocation counts against a stored
+baseline. Exits with status 1 when a metric regresses by more than the
+threshold.
+
+    python corpus.py                          # compare against benchmarks/baseline.json
+    python corpus.py --threshold 0.4 --no-render
+    python corpus.py --renderer texture       # rendered runs with the SDL2 texture renderer
+    python corpus.py --update-baseline        # store this machine's numbers as the baseline
+    python corpus.py --generate               # re-record the corpus with the scripted players
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import pygame
+import controls
+import pool
+from game import Game
+from perf import FrameProfiler
+from replay import Replay
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'corpus')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = float(os.getenv('BENCH_THRESHOLD', '0.25'))  # 允许的相对退化（0.25 = 慢25%）
+
+# 低于这些值的指标噪声太大，只在超出绝对余量后才算退化
+MIN_SYSTEM_MS = 0.05
+MIN_COLLECTIONS = 5
+MIN_BLOCKS = 2000
+WARMUP_TICKS = 300
+
+# 录像来源：没有真人录像，用固定种子的脚本玩家录制（见 scripted_player）
+CORPUS_SESSIONS = {
+    'weave_machine_gun': dict(seed=11, ship='interceptor', formation=1, weapon=0, ticks=2400),
+    'formation_missiles': dict(seed=23, ship='guardian', formation=3, weapon=5, ticks=2400),
+    'beam_pair': dict(seed=37, ship='striker', formation=2, weapon=3, ticks=2400),
+}
+
+
+def scripted_player(seed, weapon=0):
+    """Yield input bits of a simple scripted player: switch weapon, then weave and shoot
+
+    weapon is the number of TAB presses at the start (武器顺序见 Player.weapons).
+    """
+    script_rng = random.Random(seed)
+    for _ in range(weapon):
+        yield controls.PRESS_TAB
+        yield 0
+    tick = 0
+    while True:
+        move = script_rng.choice((controls.LEFT, controls.RIGHT, controls.LEFT | controls.UP,
+                                  controls.RIGHT | controls.DOWN, 0))
+        for _ in range(script_rng.randint(10, 60)):
+            bits = move | controls.FIRE
+            if tick % 6 == 0:
+                bits |= controls.PRESS_FIRE
+            tick += 1
+            yield bits
+
+
+def generate(names=None, directory=CORPUS_DIR):
+    """Record the corpus sessions (default: all) into directory"""
+    os.makedirs(directory, exist_ok=True)
+    for name in names or CORPUS_SESSIONS:
+        session = CORPUS_SESSIONS[name]
+        path = os.path.join(directory, f"{name}.rpl")
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = Game(headless=True, seed=session['seed'], record_path=path)
+            game.start_game(session['ship'], session['formation'])
+            game.input_frames = scripted_player(session['seed'], session['weapon'])
+            game.run_headless(session['ticks'])
+            game.stop_recording()
+        print(f"{name}: {len(Replay.load(path))} ticks, {os.path.getsize(path)} bytes", file=sys.stderr)
+
+
+def corpus_files(directory=CORPUS_DIR):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.rpl'))
+
+
+def run_replay(replay, render=False, max_ticks=None, backend='surface'):
+    """Play a replay to the end (or max_ticks) and return its profiler report plus allocation counts and outcome"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(headless=True, render=render, backend=backend)
+        game.play_replay(replay)
+        profiler = FrameProfiler()
+        game.profiler = profiler
+
+        gc.collect()
+        collections = [stats['collections'] for stats in gc.get_stats()]
+        blocks = peak_blocks = sys.getallocatedblocks()
+        while game.running and game.state != 'game_over':
+            if max_ticks is not None and len(profiler.frames) >= max_ticks:
+                break
+            profiler.begin_frame()
+            if not game.step():
+                profiler.end_frame()
+                break
+            if render:
+                game.draw()
+            profiler.end_frame()
+            peak_blocks = max(peak_blocks, sys.getallocatedblocks())
+        collections = [stats['collections'] - before for stats, before in zip(gc.get_stats(), collections)]
+        net_blocks = sys.getallocatedblocks() - blocks
+
+    report = profiler.report()
+    if render:
+        report['renderer'] = game.renderer.backend  # 实际使用的后端（纹理后端不可用时回退到surface）
+    report['allocations'] = {
+        'gc_collections': collections,  # 各代垃圾回收次数，反映容器对象的分配量
+        'net_blocks': net_blocks,  # 运行前后存活内存块之差，持续增长说明有泄漏
+        'peak_blocks': peak_blocks - blocks,
+        'pools': pool.stats(),  # 对象池的复用情况
+        'despawned': game.despawner.stats(),  # 因离开竞技场或超时被移除的实体数
+    }
+    report['outcome'] = {'ticks': game.replay_tick, 'score': game.score, 'round': game.current_round}
+    return report
+
+
+def run(paths, render=True, backend='surface'):
+    """Play every replay file, headless and (optionally) rendered with the given backend, and return the JSON report"""
+    results = {}
+    if paths:
+        # 预热：首局会生成音效、加载字体等，不计入测量
+        run_replay(Replay.load(paths[0]), render, WARMUP_TICKS, backend)
+    for path in paths:
+        replay = Replay.load(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        result = {'ticks': len(replay), 'headless': run_replay(replay, False)}
+        if render:
+            result['rendered'] = run_replay(replay, True, backend=backend)
+        results[name] = result
+        print(f"{name}: headless {result['headless']['frame_ms']['mean']:.2f} ms/tick"
+              + (f", rendered {result['rendered']['frame_ms']['mean']:.2f} ms/tick" if render else ''),
+              file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'renderer': backend if render else None,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'replays': results,
+    }
+
+
+def _check(problems, label, current, baseline, threshold, slack):
+    """Record a regression if current exceeds baseline by more than threshold (and the absolute slack)"""
+    limit = max(baseline * (1 + threshold), baseline + slack)
+    if current > limit:
+        change = f"+{(current / baseline - 1) * 100:.0f}%" if baseline > 0 else "new"
+        problems.append(f"{label}: {current:g} > baseline {baseline:g} ({change})")
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of regressions of report against baseline (empty when within the threshold)"""
+    problems = []
+    for name, result in report['replays'].items():
+        expected = baseline['replays'].get(name)
+        if expected is None:
+            continue  # 基线中没有的新录像，更新基线后才参与比较
+        for mode in ('headless', 'rendered'):
+            if mode not in result or mode not in expected:
+                continue
+            current, base = result[mode], expected[mode]
+            label = f"{name}/{mode}"
+            if current.get('renderer', 'surface') != base.get('renderer', 'surface'):
+                continue  # 不同渲染后端的耗时不可比
+            if current['outcome'] != base['outcome']:
+                # 游戏逻辑变化导致录像结果不同，性能数据不再可比
+                problems.append(f"{label}: outcome {current['outcome']} differs from baseline {base['outcome']}, "
+                                "re-record the corpus and update the baseline")
+                continue
+            _check(problems, f"{label} frame_ms.mean", current['frame_ms']['mean'],
+                   base['frame_ms']['mean'], threshold, 0)
+            _check(problems, f"{label} frame_ms.p95", current['frame_ms']['p95'],
+                   base['frame_ms']['p95'], threshold, 0)
+            for system, stats in base['systems'].items():
+                if system in current['systems']:
+                    _check(problems, f"{label} {system}.mean", current['systems'][system]['mean'],
+                           stats['mean'], threshold, MIN_SYSTEM_MS)
+            for generation, (now, before) in enumerate(zip(current['allocations']['gc_collections'],
+                                                           base['allocations']['gc_collections'])):
+                _check(problems, f"{label} gc_collections[{generation}]", now, before, threshold, MIN_COLLECTIONS)
+            _check(problems, f"{label} net_blocks", current['allocations']['net_blocks'],
+                   base['allocations']['net_blocks'], threshold, MIN_BLOCKS)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter replay corpus benchmark")
+    parser.add_argument('--corpus', default=CORPUS_DIR, help='directory of .rpl files to play')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline report to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed relative regression per metric (default: BENCH_THRESHOLD env var or 0.25)')
+    parser.add_argument('--no-render', action='store_true', help='skip the rendered runs')
+    parser.add_argument('--renderer', choices=['surface', 'texture'], default='surface',
+                        help='renderer of the rendered runs (texture draws into a hidden window)')
+    parser.add_argument('--output', metavar='PATH', help='also write the JSON report to a file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write this run as the new baseline instead of comparing')
+    parser.add_argument('--generate', action='store_true',
+                        help='re-record the corpus sessions with the scripted players and exit')
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        generate(directory=args.corpus)
+        return 0
+
+    report = run(corpus_files(args.corpus), not args.no_render, args.renderer)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    problems = compare(report, baseline, args.threshold)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    print(f"no regressions beyond {args.threshold * 100:.0f}%", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
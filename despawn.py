@@ -0,0 +1,84 @@
+"""Removal of projectiles and effects that left the arena or outlived their lifetime.
+
+One Despawner holds the arena rectangle and a margin per kind of entity: an
+entity is culled for 'bounds' once its rect lies completely outside the
+arena grown by its margin, on any side. Entities with a lifetime (a
+lifetime column in the ECS tables, a lifetime attribute on sprites and
+entities, in ms of simulation time since their born tick) are culled for
+'lifetime' when it runs out, so shots that never leave the arena, such as
+missiles circling a target, do not live forever either.
+
+Every removal is counted by kind and reason; stats() is reported by the
+benchmark and the replay corpus next to the object pool statistics.
+Particles are not culled here, they fade out on their own.
+"""
+import numpy as np
+import game_clock
+
+# 各类实体超出竞技场多少像素后移除：玩家子弹一离开屏幕就移除（不会击中还没进入屏幕的敌人），
+# 敌人子弹保留50像素缓冲
+MARGINS = {'bullet': 0, 'enemy_bullet': 50, 'power_up': 0}
+REASONS = ('bounds', 'lifetime')
+
+
+class Despawner:
+    """Culls entities outside arena (a pygame.Rect) grown by the margin of their kind"""
+
+    def __init__(self, arena, margins=None):
+        self.arena = arena.copy()
+        self.margins = dict(MARGINS if margins is None else margins)
+        self.counts = {}  # 种类 -> {原因: 数量}
+
+    def limits(self, kind):
+        """Return (left, top, right, bottom) of the arena grown by the margin of kind"""
+        margin = self.margins.get(kind, 0)
+        arena = self.arena
+        return arena.left - margin, arena.top - margin, arena.right + margin, arena.bottom + margin
+
+    def count(self, kind, reason, number=1):
+        if number:
+            counts = self.counts.setdefault(kind, dict.fromkeys(REASONS, 0))
+            counts[reason] += number
+
+    def cull_tables(self, tables, kind='bullet'):
+        """Drop the rows of ECS tables (left/top/width/height, born/lifetime columns) that are out"""
+        left, top, right, bottom = self.limits(kind)
+        now = game_clock.get_ticks()
+        for table in tables:
+            if not table.count:
+                continue
+            x, y = table['left'], table['top']
+            outside = (x + table['width'] < left) | (x > right) | (y + table['height'] < top) | (y > bottom)
+            expired = ~outside & (now - table['born'] > table['lifetime'])
+            gone = outside | expired
+            if gone.any():
+                self.count(kind, 'bounds', int(np.count_nonzero(outside)))
+                self.count(kind, 'lifetime', int(np.count_nonzero(expired)))
+                table.compact(~gone)
+
+    def cull(self, entities, kind):
+        """Kill the sprites or entities of a group or list that are out
+
+        An entity's lifetime is its lifetime attribute (None: no limit),
+        counted from its born tick.
+        """
+        left, top, right, bottom = self.limits(kind)
+        now = game_clock.get_ticks()
+        for entity in entities:
+            rect = entity.rect
+            if rect.right < left or rect.left > right or rect.bottom < top or rect.top > bottom:
+                reason = 'bounds'
+            elif entity.lifetime is not None and now - entity.born > entity.lifetime:
+                reason = 'lifetime'
+            else:
+                continue
+            entity.kill()
+            self.count(kind, reason)
+
+    def reset_stats(self):
+        """Start counting afresh, e.g. for a new game"""
+        self.counts = {}
+
+    def stats(self):
+        """Return {kind: {reason: number of culled entities}}"""
+        return {kind: dict(counts) for kind, counts in self.counts.items()}
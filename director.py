@@ -0,0 +1,112 @@
+"""Spawning of the regular enemies: waves drawn from an alias table within a per-round budget.
+
+Every enemy type costs its points / 50 (a scout 2, an elite 6) and every
+round has a budget for the total cost of the live regular enemies, growing
+with the round up to a fixed limit. Once a quarter of the budget is free the
+SpawnDirector plans a wave that fills it: types are drawn from an alias table
+(Vose's method, built once from the type weights, one random number per
+draw) until the next one would not fit. The enemies of a wave enter one every
+interval ms instead of all in one tick.
+
+Planned enemies are built ahead of their entry, one per tick (the Enemy
+constructor draws the ship). During the round announcement nothing enters,
+so the opening wave of a round is built while the announcement shows and
+enters when it ends.
+"""
+from collections import deque
+import game_clock
+import rng
+from sprites import Enemy
+
+# 各类敌人出现的权重
+ENEMY_WEIGHTS = {
+    'scout': 0.3,    # 30% chance
+    'fighter': 0.2,  # 20% chance
+    'striker': 0.2,  # 20% chance for green ship
+    'elite': 0.15,   # 15% chance
+    'bomber': 0.15   # 15% chance
+}
+# 每个敌人占用的预算，按得分计：越强的敌人越贵
+ENEMY_COSTS = {enemy_type: Enemy.ENEMY_DESIGNS[enemy_type]['points'] // 50 for enemy_type in ENEMY_WEIGHTS}
+BUDGET_BASE = 20  # 第0关的预算（约6个敌人），每关增加BUDGET_PER_ROUND（约多一个敌人）
+BUDGET_PER_ROUND = 4
+WAVE_FRACTION = 0.25  # 空出这部分预算后才计划下一波
+
+
+class AliasTable:
+    """Draws keys with fixed weights in O(1) time per draw (Vose's alias method)"""
+
+    def __init__(self, weights):
+        self.keys = list(weights)
+        count = len(self.keys)
+        total = sum(weights.values())
+        scaled = [weight * count / total for weight in weights.values()]
+        # 每一列以probability的概率取自己，否则取alias；剩下的列（只差浮点误差）总是取自己
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+    def draw(self, random):
+        """Return a key drawn with one number from random (a random.Random)"""
+        column, side = divmod(random.random() * len(self.keys), 1)
+        column = int(column)
+        return self.keys[column if side < self.probability[column] else self.alias[column]]
+
+
+class SpawnDirector:
+    """Plans the waves of regular enemies of a game and lets them enter one by one"""
+
+    def __init__(self, budget_limit=90, interval=100):
+        self.budget_limit = budget_limit
+        self.interval = interval
+        self.types = AliasTable(ENEMY_WEIGHTS)
+        self.queue = deque()  # 计划中的敌人：[类型, 预先建造的Enemy或None]
+        self.next_entry = 0  # 下一个敌人最早入场的时间
+        self.paused = False  # 为True时既不计划也不放入敌人（基准场景自己维持固定数量的敌人）
+
+    def budget(self, round_number):
+        """Return the total cost the live regular enemies of a round may have"""
+        return min(BUDGET_BASE + BUDGET_PER_ROUND * round_number, self.budget_limit)
+
+    def draw_type(self):
+        return self.types.draw(rng.gameplay)
+
+    def start_round(self):
+        """Drop the planned enemies of the last round (the next wave is planned for the new one)"""
+        self.queue.clear()
+
+    def plan(self, free):
+        """Queue enemies of random types until the next one would cost more than free"""
+        while True:
+            enemy_type = self.draw_type()
+            if ENEMY_COSTS[enemy_type] > free:
+                return
+            free -= ENEMY_COSTS[enemy_type]
+            self.queue.append([enemy_type, None])
+
+    def update(self, game):
+        """Plan a wave if there is room, let the next enemy enter and build one ahead"""
+        if self.paused:
+            return
+        if not self.queue:
+            budget = self.budget(game.current_round)
+            free = budget - sum(ENEMY_COSTS.get(enemy.enemy_type, 0) for enemy in game.enemies)
+            if free >= budget * WAVE_FRACTION:
+                self.plan(free)
+        now = game_clock.get_ticks()
+        if self.queue and not game.showing_round_announcement and now >= self.next_entry:
+            enemy_type, enemy = self.queue.popleft()
+            game.spawn_enemy(enemy or Enemy(enemy_type, game.current_round))
+            self.next_entry = now + self.interval
+        # 预先建造下一个计划中的敌人
+        for planned in self.queue:
+            if planned[1] is None:
+                planned[1] = Enemy(planned[0], game.current_round)
+                break
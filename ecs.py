@@ -0,0 +1,216 @@
+"""Entity-component-system core: archetype tables of component arrays and the systems that run over them.
+
+A Component is a named group of fields with default values. An archetype is
+a fixed set of components; all entities of one archetype are the rows of a
+Table, which keeps one contiguous NumPy array per numeric field (structure of
+arrays) and a plain list per field that holds Python objects (images,
+targets). A Bundle names the components an entity is spawned with plus
+default field values, e.g. one bundle per bullet type; bundles with the same
+components share a table.
+
+Systems are functions run over every table that has the components they
+need. They work on whole columns at once where they can, and World.run()
+books each one to its own FrameProfiler lap.
+"""
+import numpy as np
+
+
+def _column_type(value):
+    """Return the NumPy dtype for a default value, or None for an object (list) column"""
+    if isinstance(value, bool):
+        return np.bool_
+    if isinstance(value, int):
+        return np.int64
+    if isinstance(value, float):
+        return np.float64
+    return None
+
+
+class Component:
+    """A named group of fields; the type of each field's column follows its default value"""
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields  # 字段名 -> 默认值
+
+    def __repr__(self):
+        return f"Component({self.name!r})"
+
+
+class Bundle:
+    """The components an entity is spawned with and default values for their fields"""
+
+    def __init__(self, name, components, **defaults):
+        self.name = name
+        self.components = tuple(components)
+        self.key = frozenset(component.name for component in self.components)
+        self.defaults = {}
+        for component in self.components:
+            self.defaults.update(component.fields)
+        unknown = set(defaults) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"bundle {name!r} sets unknown fields {sorted(unknown)}")
+        self.defaults.update(defaults)
+
+
+class Table:
+    """All entities of one archetype, one column per field.
+
+    Rows are dense: remove() moves the last row into the hole, compact() drops
+    many rows at once and keeps the order of the others.
+    """
+
+    def __init__(self, components, capacity=64):
+        self.components = frozenset(component.name for component in components)
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.columns = {}
+        for component in components:
+            for field, default in component.fields.items():
+                dtype = _column_type(default)
+                self.columns[field] = [] if dtype is None else np.zeros(self.capacity, dtype)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, field):
+        """Return the live part of a column: an array view or the object list"""
+        column = self.columns[field]
+        return column if isinstance(column, list) else column[:self.count]
+
+    def has(self, *components):
+        return all(component.name in self.components for component in components)
+
+    def reserve(self, capacity):
+        """Grow the numeric columns to hold at least capacity rows"""
+        if capacity <= self.capacity:
+            return
+        for field, column in self.columns.items():
+            if not isinstance(column, list):
+                grown = np.zeros(capacity, column.dtype)
+                grown[:self.count] = column[:self.count]
+                self.columns[field] = grown
+        self.capacity = capacity
+
+    def append(self, values):
+        """Add a row with the given value for every field and return its index"""
+        row = self.count
+        if row == self.capacity:
+            self.reserve(self.capacity * 2)
+        for field, column in self.columns.items():
+            if isinstance(column, list):
+                column.append(values[field])
+            else:
+                column[row] = values[field]
+        self.count += 1
+        return row
+
+    def extend(self, count, values):
+        """Add count rows at once and return the index of the first
+
+        A value is either one value for all rows or, for numeric fields, an
+        array of count values and, for object fields, a list of count values.
+        """
+        start = self.count
+        if start + count > self.capacity:
+            self.reserve(max(self.capacity * 2, start + count))
+        for field, column in self.columns.items():
+            value = values[field]
+            if isinstance(column, list):
+                column.extend(value if isinstance(value, list) else [value] * count)
+            else:
+                column[start:start + count] = value
+        self.count += count
+        return start
+
+    def remove(self, row):
+        """Delete a row by moving the last row into its place"""
+        last = self.count - 1
+        for column in self.columns.values():
+            if isinstance(column, list):
+                column[row] = column[last]
+                column.pop()
+            else:
+                column[row] = column[last]
+        self.count = last
+
+    def compact(self, keep):
+        """Keep only the rows where the boolean array keep is true, in their current order"""
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+        for field, column in self.columns.items():
+            if isinstance(column, list):
+                column[:] = [value for value, alive in zip(column, keep) if alive]
+            else:
+                column[:kept] = column[:self.count][keep]
+        self.count = kept
+
+    def clear(self):
+        for column in self.columns.values():
+            if isinstance(column, list):
+                column.clear()
+        self.count = 0
+
+
+class World:
+    """Tables of entities by archetype plus the systems run over them every step"""
+
+    def __init__(self):
+        self.tables = {}  # 组件名集合 -> Table，按创建顺序
+        self.systems = []  # [(名称, 函数, 组件)]
+        self._queries = {}
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables.values())
+
+    def register(self, bundle, capacity=64):
+        """Create the table for a bundle's archetype (if needed) and return it
+
+        Registering every bundle up front fixes the order tables are visited in.
+        """
+        table = self.tables.get(bundle.key)
+        if table is None:
+            table = self.tables[bundle.key] = Table(bundle.components, capacity)
+            self._queries.clear()
+        return table
+
+    def spawn(self, bundle, **values):
+        """Add an entity made of the bundle's components; return (table, row)"""
+        table = self.register(bundle)
+        return table, table.append({**bundle.defaults, **values})
+
+    def spawn_batch(self, bundle, count, **values):
+        """Add count entities of a bundle at once (see Table.extend); return (table, first row)"""
+        table = self.register(bundle)
+        return table, table.extend(count, {**bundle.defaults, **values})
+
+    def query(self, *components):
+        """Return the tables that have all the given components, in creation order"""
+        key = tuple(component.name for component in components)
+        tables = self._queries.get(key)
+        if tables is None:
+            tables = self._queries[key] = [table for table in self.tables.values() if table.has(*components)]
+        return tables
+
+    def despawn(self, field, value):
+        """Remove every entity whose field is value (e.g. the bullets of a destroyed ship)"""
+        for table in self.tables.values():
+            if field in table.columns and table.count:
+                table.compact(np.array([item is not value for item in table[field]], dtype=bool))
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+
+    def add_system(self, name, function, *components):
+        """Run function(world, table) on every non-empty table with the components each step"""
+        self.systems.append((name, function, components))
+
+    def run(self, profiler):
+        """Run every system once, booking each to its own profiler lap"""
+        for name, function, components in self.systems:
+            for table in self.query(*components):
+                if table.count:
+                    function(self, table)
+            profiler.lap(name)
@@ -0,0 +1,170 @@
+"""Enemy bullets as ECS entities in the same World as the player bullets (see projectiles.py).
+
+All enemy bullets are rows of one table: position, velocity, rect, damage,
+style, collision radius and owner are columns, so the shared bullet systems
+move them, despawn.py culls them and projectiles.draw_list() draws them
+together with the player bullets, all in whole-column passes. This module
+adds their glow trail, spawning (one bullet, or a boss volley in one
+batch), the test against a player ship and the queries of the bot and the
+environment.
+
+The look of a bullet is a style, an index into STYLES of (color, size)
+pairs; every bullet of a style is drawn with the same cached image.
+"""
+import functools
+import numpy as np
+import pygame
+import game_clock
+import rng
+from ecs import Bundle, Component
+from entities import particle_pool
+from projectiles import BODY, POSITION, VELOCITY, Hit, round_half_away
+
+# owner是发射子弹的敌人，只有仍在敌人组中的敌人的子弹会击中玩家；born/lifetime见despawn.py
+HOSTILE = Component('hostile', damage=0.0, owner=None, style=0, born=0, lifetime=10000)
+GLOW = Component('glow', last_glow=0, glow_delay=50)  # 每50ms留下一个发光拖尾粒子
+# 每步最多生成的拖尾粒子数（普通Boss战远低于此数）；弹幕极密时等待最久的子弹优先，拖尾变稀疏
+GLOW_BUDGET = 128
+ENEMY_BULLET = Bundle('enemy_bullet', (POSITION, VELOCITY, BODY, HOSTILE, GLOW))
+
+STYLES = []  # 样式编号 -> (颜色, 半径)
+_styles = {}
+
+
+def style(color, size):
+    """Return the style index of bullets of the given color and radius"""
+    key = (tuple(color), int(size))
+    index = _styles.get(key)
+    if index is None:
+        index = _styles[key] = len(STYLES)
+        STYLES.append(key)
+    return index
+
+
+@functools.lru_cache(maxsize=256)
+def bullet_image(color, size):
+    """Return the shared image of an enemy bullet of the given color and radius"""
+    image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    # 子弹主体
+    pygame.draw.circle(image, color, (size, size), size)
+    # 发光效果
+    glow_color = tuple(min(c + 100, 255) for c in color[:3])  # 更亮的颜色
+    pygame.draw.circle(image, glow_color, (size, size), size // 2)
+    return image
+
+
+@functools.lru_cache(maxsize=256)
+def glow_color(index):
+    """Return the trail particle color of a style"""
+    color, _ = STYLES[index]
+    return tuple(min(c + 50, 255) for c in color[:3])
+
+
+def speed(value):
+    """Convert a pattern speed to the per-tick velocity of the bullet
+
+    Enemy bullets fly at 0.7 times the speed they are fired with, and the
+    speeds were tuned for two updates per tick.
+    """
+    return value * 0.7 * 2
+
+
+def register(world, capacity=128):
+    """Add the enemy bullet table and its trail system to a bullet World"""
+    world.register(ENEMY_BULLET, capacity)
+    world.add_system('enemy_bullet_trails', emit_glow, BODY, GLOW)
+
+
+def spawn(world, x, y, speed_x, speed_y, damage=10, color=(255, 100, 0), size=6, owner=None):
+    """Spawn an enemy bullet centered on x, y; return (table, row)"""
+    image = bullet_image(tuple(color), size)
+    width = size * 2
+    now = game_clock.get_ticks()
+    # 与pygame.Rect一样取整：rect.center = (x, y)
+    return world.spawn(ENEMY_BULLET, x=float(x), y=float(y), vx=speed(speed_x), vy=speed(speed_y),
+                       left=int(round_half_away(np.float64(x))) - width // 2,
+                       top=int(round_half_away(np.float64(y))) - width // 2,
+                       width=width, height=width, radius=0.5 * (2 * width ** 2) ** 0.5, image=image,
+                       damage=damage, owner=owner, style=style(color, size), born=now, last_glow=now)
+
+
+def spawn_volley(world, x, y, speed_x, speed_y, damage, colors, size=6, owner=None):
+    """Spawn a whole volley in one batch from arrays of centers and speeds and a list of colors"""
+    count = len(x)
+    if not count:
+        return
+    styles = [style(color, size) for color in colors]
+    width = size * 2
+    now = game_clock.get_ticks()
+    world.spawn_batch(ENEMY_BULLET, count, x=x, y=y, vx=speed(np.asarray(speed_x)), vy=speed(np.asarray(speed_y)),
+                      left=round_half_away(np.asarray(x)) - width // 2,
+                      top=round_half_away(np.asarray(y)) - width // 2,
+                      width=width, height=width, radius=0.5 * (2 * width ** 2) ** 0.5,
+                      image=[bullet_image(STYLES[index][0], size) for index in styles],
+                      damage=damage, owner=owner, style=np.array(styles), born=now, last_glow=now)
+
+
+def emit_glow(world, table):
+    """Leave a glowing trail particle behind every bullet whose particle delay has passed (up to GLOW_BUDGET)"""
+    now = game_clock.get_ticks()
+    last = table['last_glow']
+    due = np.flatnonzero(now - last > table['glow_delay'])
+    if not due.size:
+        return
+    if due.size > GLOW_BUDGET:
+        due = np.sort(due[np.argpartition(last[due], GLOW_BUDGET)[:GLOW_BUDGET]])
+    centers_x = (table['left'] + table['width'] // 2)[due].tolist()
+    centers_y = (table['top'] + table['height'] // 2)[due].tolist()
+    styles = table['style'][due].tolist()
+    uniform = rng.cosmetic.uniform
+    world.particles.add(*[particle_pool.acquire(x, y, glow_color(index), uniform(-0.5, 0.5), uniform(-0.5, 0.5), size=2)
+                          for x, y, index in zip(centers_x, centers_y, styles)])
+    last[due] = now
+
+
+def collide_ship(world, ship, owners):
+    """Yield a Hit for every bullet of one of owners touching ship (killing it is up to the caller)
+
+    Same test as pygame.sprite.collide_circle, for all bullets at once.
+    """
+    radius = getattr(ship, 'radius', None)
+    if radius is None:
+        radius = 0.5 * (ship.rect.width ** 2 + ship.rect.height ** 2) ** 0.5
+    ship_x, ship_y = ship.rect.center
+    for table in world.query(HOSTILE, BODY):
+        count = len(table)
+        if not count:
+            continue
+        centers_x = table['left'] + table['width'] // 2
+        centers_y = table['top'] + table['height'] // 2
+        dx = centers_x - ship_x
+        dy = centers_y - ship_y
+        reach = table['radius'] + radius
+        rows = np.flatnonzero(dx * dx + dy * dy < reach * reach)
+        if not rows.size:
+            continue
+        dead = np.zeros(count, dtype=bool)
+        owner = table['owner']
+        damage = table['damage']
+        try:
+            for row in rows.tolist():
+                if owner[row] in owners:
+                    yield Hit((int(centers_x[row]), int(centers_y[row])), float(damage[row]), False, dead, row)
+        finally:
+            table.compact(~dead)
+
+
+def owned_by(world, owners):
+    """Return (center x, center y, vx, vy, width) of every bullet whose owner is in owners"""
+    bullets = []
+    for table in world.query(HOSTILE, BODY):
+        if not len(table):
+            continue
+        rows = [row for row, owner in enumerate(table['owner']) if owner in owners]
+        if not rows:
+            continue
+        width = table['width'][rows]
+        bullets.extend(zip((table['left'][rows] + width // 2).tolist(),
+                           (table['top'][rows] + table['height'][rows] // 2).tolist(),
+                           table['vx'][rows].tolist(), table['vy'][rows].tolist(), width.tolist()))
+    return bullets
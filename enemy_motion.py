@@ -0,0 +1,154 @@
+"""Movement of the regular enemies as ECS tables (see ecs.py): one vectorized step per movement pattern.
+
+Every regular enemy (all but the boss) is a row in the table of its movement
+pattern: straight down, zigzag or sine. The row holds its kinematics (rect,
+falling speed, wave phase and tilt) and the enemy sprite; the movement
+system advances all enemies of a pattern at once and writes their rects
+back in one pass. Enemy.update() is left with the per-enemy events
+(shooting, engine particles), and keep_in_bounds() respawns the enemies that
+fell off the bottom and stops them at the screen edges.
+
+Zigzag and sine enemies tilt with their wave. Their rect is the bounding box
+of the rotated ship, computed with pygame's own formula, so the rotated image
+itself is only made when the enemy is drawn (rotate_images()).
+"""
+import numpy as np
+import pygame
+import game_clock
+import rng
+from ecs import Bundle, Component, World
+from projectiles import round_half_away
+
+NAN = float('nan')
+# 与sprites.py中的敌人一样使用固定的屏幕大小
+SCREEN_WIDTH = 1024
+SCREEN_HEIGHT = 768
+RESPAWN_MARGIN = 50  # 超出屏幕底部多少像素后回到顶部
+
+# 与pygame.Rect相同的整数矩形和每步下落速度；serial是加入的先后，重生按此顺序抽取随机数
+MOTION = Component('motion', left=0, top=0, width=0, height=0, speed_y=0.0, serial=0, sprite=None)
+# 摆动：wave = sin/cos(时间 * frequency + offset)，每步横向移动 wave * drift，倾斜 wave * tilt 度；
+# base_width/base_height是未旋转图像的大小，drawn_angle是当前图像的角度（NaN表示尚未旋转）
+WAVE = Component('wave', offset=0, frequency=0.0, drift=0.0, tilt=0.0, angle=0.0,
+                 base_width=0, base_height=0, drawn_angle=NAN)
+ZIGZAG = Component('zigzag')  # wave = sin
+SINE = Component('sine')  # wave = cos
+
+BUNDLES = {
+    'straight': Bundle('straight', (MOTION,)),
+    'zigzag': Bundle('zigzag', (MOTION, WAVE, ZIGZAG), frequency=0.003, drift=3.0, tilt=30.0),
+    'sine': Bundle('sine', (MOTION, WAVE, SINE), frequency=0.002, drift=2.0, tilt=20.0),
+}
+
+
+def create_world(capacity=32):
+    """Return a World with a table for every movement pattern and the movement system registered"""
+    world = World()
+    for bundle in BUNDLES.values():
+        world.register(bundle, capacity)
+    world.add_system('enemy_movement', move, MOTION)
+    world.serial = 0
+    return world
+
+
+def add(world, enemy):
+    """Give a regular enemy its row; its rect, speed and angle are only read here"""
+    bundle = BUNDLES[enemy.movement_pattern]
+    rect = enemy.rect
+    values = dict(left=rect.x, top=rect.y, width=rect.width, height=rect.height,
+                  speed_y=float(enemy.speed_y), serial=world.serial, sprite=enemy)
+    if WAVE in bundle.components:
+        width, height = enemy.original_image.get_size()
+        values.update(offset=enemy.pattern_offset, angle=float(enemy.angle), base_width=width, base_height=height)
+    world.serial += 1
+    enemy.motion, _ = world.spawn(bundle, **values)
+
+
+def remove(enemy):
+    """Delete the row of a killed enemy"""
+    table = enemy.motion
+    enemy.motion = None
+    table.remove(table['sprite'].index(enemy))
+
+
+def clear(world):
+    for table in world.tables.values():
+        for enemy in table['sprite']:
+            enemy.motion = None
+    world.clear()
+
+
+def rotated_size(width, height, angle):
+    """Return the size of pygame.transform.rotate()'s image of a width x height surface, for arrays of angles"""
+    # pygame以单精度读入角度，取 |cos * w ± sin * h| 中较大的一个并截断为整数，
+    # 即 |cos| * w + |sin| * h（同号相加，浮点结果也完全相同）
+    radians = angle.astype(np.float32).astype(np.float64) * .01745329251994329
+    sin, cos = np.abs(np.sin(radians)), np.abs(np.cos(radians))
+    return (cos * width + sin * height).astype(np.int64), (sin * width + cos * height).astype(np.int64)
+
+
+def move(world, table):
+    """Move every enemy of one pattern by a tick and write the rects back to the sprites"""
+    left, top = table['left'], table['top']
+    width, height = table['width'], table['height']
+    sprites = table['sprite']
+    if table.has(WAVE):
+        phase = game_clock.get_ticks() * table['frequency'] + table['offset']
+        wave = np.sin(phase) if table.has(ZIGZAG) else np.cos(phase)
+        angle = table['angle']
+        angle[:] = wave * table['tilt']
+        # 倾斜后外接矩形的大小改变，中心不变
+        centers_x = left + width // 2
+        centers_y = top + height // 2
+        width[:], height[:] = rotated_size(table['base_width'], table['base_height'], angle)
+        left[:] = round_half_away(centers_x - width // 2 + wave * table['drift'])
+        top[:] = centers_y - height // 2
+        for enemy, tilt in zip(sprites, angle.tolist()):
+            enemy.angle = tilt
+    top[:] = round_half_away(top + table['speed_y'])
+    for enemy, rect in zip(sprites, zip(left.tolist(), top.tolist(), width.tolist(), height.tolist())):
+        enemy.rect.update(rect)
+
+
+def keep_in_bounds(world):
+    """Respawn the enemies below the screen at the top and stop the others at the left and right edges"""
+    fallen = []
+    for table in world.query(MOTION):
+        if table.count and table['top'].max() > SCREEN_HEIGHT + RESPAWN_MARGIN:
+            rows = np.flatnonzero(table['top'] > SCREEN_HEIGHT + RESPAWN_MARGIN).tolist()
+            fallen.extend((table['serial'][row], table, row) for row in rows)
+    # 与逐个更新时相同的随机数顺序：先加入的敌人先重生
+    for _, table, row in sorted(fallen, key=lambda item: item[0]):
+        enemy = table['sprite'][row]
+        left = table['left'][row] = rng.gameplay.randrange(SCREEN_WIDTH - int(table['width'][row]))
+        top = table['top'][row] = rng.gameplay.randrange(-100, -40)
+        table['speed_y'][row] = enemy.speed_y = enemy.design['speed']
+        enemy.rect.topleft = (left, top)
+
+    for table in world.query(MOTION):
+        if not table.count:
+            continue
+        left, width = table['left'], table['width']
+        if left.min() >= 0 and (left + width).max() <= SCREEN_WIDTH:
+            continue
+        low = left < 0
+        high = left + width > SCREEN_WIDTH
+        edge = np.flatnonzero(low | high)
+        left[:] = np.where(low, 0, np.where(high, SCREEN_WIDTH - width, left))
+        sprites = table['sprite']
+        for row, x in zip(edge.tolist(), left[edge].tolist()):
+            sprites[row].rect.x = x
+
+
+def rotate_images(world):
+    """Give the tilted enemies the image of their current angle (only needed for drawing)"""
+    for table in world.query(WAVE):
+        if not table.count:
+            continue
+        angle, drawn = table['angle'], table['drawn_angle']
+        rows = np.flatnonzero(angle != drawn)
+        sprites = table['sprite']
+        for row, tilt in zip(rows.tolist(), angle[rows].tolist()):
+            enemy = sprites[row]
+            enemy.image = pygame.transform.rotate(enemy.original_image, tilt)
+        drawn[rows] = angle[rows]
@@ -0,0 +1,156 @@
+"""Lightweight entities for the many short-lived objects (particles).
+
+An Entity has __slots__ instead of a per-instance dict and belongs to exactly
+one EntityList, a dense list that deletes by swapping the last entity into
+the hole. kill() and alive() are O(1) instead of walking group memberships
+like pygame.sprite.Sprite does.
+
+Entities keep .rect and .image, and EntityList has the parts of the
+pygame.sprite.Group API the game uses (add, remove, update, draw, empty,
+sprites, iteration), so drawing code and pygame.sprite.spritecollide work
+on them unchanged.
+"""
+import functools
+import pygame
+import rng
+from pool import Pool
+
+# 调试钩子：设置后 EntityList.update() 先用要更新的实体调用它（见 scheduler.Scheduler 的检查模式）
+update_hook = None
+
+
+class Entity:
+    """Base class of lightweight game objects kept in an EntityList"""
+    __slots__ = ('_list', '_slot')
+    pool = None  # 对象池（见 pool.Pool），kill() 后把对象交还给它
+
+    def __init__(self):
+        self._list = None
+        self._slot = 0
+
+    def alive(self):
+        return self._list is not None
+
+    def kill(self):
+        """Remove the entity from its list and hand it back to its pool"""
+        if self._list is not None:
+            self._list.remove(self)
+            if self.pool is not None:
+                self.pool.release(self)
+
+    def update(self):
+        pass
+
+
+class EntityList:
+    """Dense list of entities with O(1) swap-remove deletion.
+
+    Removing an entity moves the last one into its slot, so the order of the
+    entities is not kept. Iterating goes over a copy, so the loop body may kill
+    entities, as with a pygame Group.
+    """
+    __slots__ = ('entities',)
+
+    def __init__(self, *entities):
+        self.entities = []
+        self.add(*entities)
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __bool__(self):
+        return bool(self.entities)
+
+    def __iter__(self):
+        return iter(self.entities[:])
+
+    def __contains__(self, entity):
+        return entity._list is self
+
+    def sprites(self):
+        return self.entities[:]
+
+    def add(self, *entities):
+        """Append entities, taking them out of the list they were in"""
+        for entity in entities:
+            if entity._list is self:
+                continue
+            if entity._list is not None:
+                entity._list.remove(entity)
+            entity._list = self
+            entity._slot = len(self.entities)
+            self.entities.append(entity)
+
+    def remove(self, *entities):
+        items = self.entities
+        for entity in entities:
+            if entity._list is not self:
+                continue
+            last = items.pop()
+            if last is not entity:
+                # 用最后一个实体填补空位
+                items[entity._slot] = last
+                last._slot = entity._slot
+            entity._list = None
+
+    def update(self):
+        """Update every entity once; an update may kill the entity being updated"""
+        items = self.entities
+        if update_hook is not None:
+            update_hook(items)
+        # 倒序遍历：被删除的位置由已更新过的最后一个实体填补，新加入的实体留到下一次
+        for i in range(len(items) - 1, -1, -1):
+            if i < len(items):
+                items[i].update()
+
+    def draw(self, surface):
+        surface.blits([(entity.image, entity.rect) for entity in self.entities], False)
+
+    def empty(self):
+        """Kill every entity (returning pooled ones to their pool)"""
+        for entity in self.entities[:]:
+            entity.kill()
+
+
+@functools.lru_cache(maxsize=4096)
+def particle_image(size, color):
+    """Return the shared square image of a particle (particles never draw on their image)"""
+    image = pygame.Surface((size, size))
+    image.fill(color)
+    return image
+
+
+class Particle(Entity):
+    __slots__ = ('image', 'color', 'rect', 'x', 'y', 'speed_x', 'speed_y', 'gravity', 'alpha', 'fade_speed')
+
+    def __init__(self, x, y, color, speed_x, speed_y, size=3, gravity=0):
+        super().__init__()
+        self.reset(x, y, color, speed_x, speed_y, size, gravity)
+
+    def reset(self, x, y, color, speed_x, speed_y, size=3, gravity=0):
+        """(Re)initialize the particle; takes the constructor's arguments"""
+        self.image = particle_image(int(size), color)
+        self.color = color
+        self.rect = self.image.get_rect(center=(x, y))
+        self.x = float(x)
+        self.y = float(y)
+        # 参数按每步更新两次调校，现在每步只更新一次（见 scheduler.py）：
+        # 换算成两次更新的每步位移、速度变化和淡出
+        self.speed_x = speed_x * 2
+        self.speed_y = speed_y * 2 - gravity
+        self.gravity = gravity * 4
+        self.alpha = 255
+        self.fade_speed = rng.cosmetic.randint(5, 10) * 2
+
+    def update(self):
+        self.speed_y += self.gravity
+        self.x += self.speed_x
+        self.y += self.speed_y
+        self.rect.x = self.x
+        self.rect.y = self.y
+        self.alpha -= self.fade_speed
+        if self.alpha <= 0:
+            self.kill()
+
+
+particle_pool = Pool(Particle, 'particles', (0, 0, (0, 0, 0), 0, 0))
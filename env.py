@@ -0,0 +1,298 @@
+"""Gym-style environments over the headless game, for training agents.
+
+    env = SpaceShooterEnv()
+    observation, info = env.reset(seed=1)
+    observation, reward, terminated, truncated, info = env.step(action)
+
+Observations are flat float32 vectors of entity features (see
+OBSERVATION_LAYOUT), not pixels. VectorEnv runs several environments in
+worker processes and exchanges observations, rewards and actions through
+shared memory, so nothing is pickled per step. The game clock is a
+process-wide global, so use one SpaceShooterEnv per process.
+"""
+import contextlib
+import io
+import multiprocessing
+import math
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+import controls
+import enemy_bullets
+from game import Game, SCREEN_WIDTH, SCREEN_HEIGHT, INITIAL_LIVES
+from sprites import PowerUp
+
+# 离散动作：9个移动方向 × 是否射击，再加一个切换武器
+_MOVES = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+_DIRECTION_BITS = {-1: controls.LEFT, 1: controls.RIGHT}
+_DIRECTION_BITS_Y = {-1: controls.UP, 1: controls.DOWN}
+ACTIONS = ([_DIRECTION_BITS.get(dx, 0) | _DIRECTION_BITS_Y.get(dy, 0) for dx, dy in _MOVES]
+           + [_DIRECTION_BITS.get(dx, 0) | _DIRECTION_BITS_Y.get(dy, 0) | controls.FIRE | controls.PRESS_FIRE
+              for dx, dy in _MOVES]
+           + [controls.PRESS_TAB])
+
+MAX_ENEMIES = 16
+MAX_BULLETS = 64
+MAX_POWER_UPS = 4
+PLAYER_FEATURES = 9  # x, y, 生命, 护盾, 武器, 剩余生命, 编队飞船数, 是否有Boss, Boss生命
+ENEMY_FEATURES = 7  # 存在, x, y, vx, vy, 生命, 是否Boss
+BULLET_FEATURES = 5  # 存在, x, y, vx, vy
+POWER_UP_FEATURES = 3 + len(PowerUp.TYPES)  # 存在, x, y, 类型one-hot
+
+# 观测向量中各部分的 (起点, 形状)；敌人、子弹和道具按离主机的距离由近到远排列，空位为0
+OBSERVATION_LAYOUT = {}
+_offset = 0
+for _name, _shape in (('player', (PLAYER_FEATURES,)), ('enemies', (MAX_ENEMIES, ENEMY_FEATURES)),
+                      ('bullets', (MAX_BULLETS, BULLET_FEATURES)),
+                      ('power_ups', (MAX_POWER_UPS, POWER_UP_FEATURES))):
+    OBSERVATION_LAYOUT[_name] = (_offset, _shape)
+    _offset += math.prod(_shape)
+OBSERVATION_SIZE = _offset
+
+SCORE_REWARD = 0.01  # 每得1分的奖励
+DAMAGE_REWARD = 0.1  # 主机每损失1点生命的惩罚
+LIFE_REWARD = 10.0  # 每损失一条命的惩罚
+MAX_SPEED = 10.0  # 速度特征的归一化尺度（像素/步）
+
+
+def split_observation(observation):
+    """Return the observation's parts as a dict of arrays shaped per OBSERVATION_LAYOUT"""
+    return {name: observation[offset:offset + math.prod(shape)].reshape(shape)
+            for name, (offset, shape) in OBSERVATION_LAYOUT.items()}
+
+
+class SpaceShooterEnv:
+    """A headless game with a reset()/step() interface.
+
+    Actions are indexes into ACTIONS. Each step holds the action for
+    frame_skip simulation ticks (key presses only on the first one). The reward
+    is the score gained minus penalties for damage to the main ship and for
+    lost lives; an episode terminates on game over and is truncated after
+    max_steps steps.
+    """
+
+    action_count = len(ACTIONS)
+    observation_size = OBSERVATION_SIZE
+
+    def __init__(self, ship='interceptor', formation=1, frame_skip=1, max_steps=None, render=False):
+        self.ship = ship
+        self.formation = formation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.game = Game(headless=True, render=render)
+        self.steps = 0
+        self._score = 0
+        self._lives = 0
+        self._health = 0.0
+
+    def reset(self, seed=None):
+        """Start a new game; returns (observation, info)"""
+        game = self.game
+        game.fixed_seed = seed
+        # 控制台输出不属于环境接口
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.start_game(self.ship, self.formation)
+        game.input_frames = None
+        self.steps = 0
+        self._score, self._lives, self._health = game.score, game.lives, self.main_health()
+        return self.observe(), self.info()
+
+    def step(self, action):
+        """Apply an action; returns (observation, reward, terminated, truncated, info)"""
+        game = self.game
+        bits = ACTIONS[action]
+        frames = [bits] + [bits & controls.HELD_MASK] * (self.frame_skip - 1)
+        game.input_frames = iter(frames)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in frames:
+                game.step()
+                if game.state != 'playing':
+                    break
+        game.input_frames = None
+        self.steps += 1
+
+        reward = (game.score - self._score) * SCORE_REWARD
+        health = self.main_health()
+        if game.lives < self._lives:
+            reward -= (self._lives - game.lives) * LIFE_REWARD
+        else:
+            reward -= max(0.0, self._health - health) * DAMAGE_REWARD
+        self._score, self._lives, self._health = game.score, game.lives, health
+
+        terminated = game.state == 'game_over'
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def main_health(self):
+        ships = self.game.player_ships
+        return float(ships[0].health) if ships else 0.0
+
+    def info(self):
+        game = self.game
+        return {'score': game.score, 'round': game.current_round, 'lives': game.lives,
+                'tick': game.game_clock.tick_count}
+
+    def observe(self, out=None):
+        """Write the entity features into out (a float32 vector of OBSERVATION_SIZE) and return it"""
+        if out is None:
+            out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        else:
+            out.fill(0.0)
+        parts = split_observation(out)
+        game = self.game
+        if not game.player_ships:
+            return out
+        ship = game.player_ships[0]
+        x, y = ship.rect.center
+        boss = game.boss if game.boss is not None and game.boss.alive() else None
+        weapons = list(ship.weapons)
+        parts['player'][:] = (
+            x / SCREEN_WIDTH, y / SCREEN_HEIGHT, ship.health / ship.max_health, ship.shield / 50,
+            weapons.index(ship.current_weapon) / (len(weapons) - 1), game.lives / INITIAL_LIVES,
+            len(game.player_ships) / 3, boss is not None, boss.health / boss.max_health if boss else 0.0)
+
+        def nearest(sprites, count):
+            return sorted(sprites, key=lambda s: (s.rect.centerx - x) ** 2 + (s.rect.centery - y) ** 2)[:count]
+
+        enemies = nearest(game.enemies, MAX_ENEMIES)
+        for row, enemy in zip(parts['enemies'], enemies):
+            row[:] = (1.0, enemy.rect.centerx / SCREEN_WIDTH, enemy.rect.centery / SCREEN_HEIGHT,
+                      enemy.speed_x / MAX_SPEED, enemy.speed_y / MAX_SPEED,
+                      enemy.health / enemy.max_health, enemy.enemy_type == 'boss')
+        # 只有仍属于敌人的子弹才会击中玩家
+        bullets = sorted(enemy_bullets.owned_by(game.world, game.enemies),
+                         key=lambda b: (b[0] - x) ** 2 + (b[1] - y) ** 2)[:MAX_BULLETS]
+        for row, (bullet_x, bullet_y, vx, vy, _) in zip(parts['bullets'], bullets):
+            row[:] = (1.0, bullet_x / SCREEN_WIDTH, bullet_y / SCREEN_HEIGHT, vx / MAX_SPEED, vy / MAX_SPEED)
+        types = list(PowerUp.TYPES)
+        for row, power_up in zip(parts['power_ups'], nearest(game.power_ups, MAX_POWER_UPS)):
+            row[:3] = (1.0, power_up.rect.centerx / SCREEN_WIDTH, power_up.rect.centery / SCREEN_HEIGHT)
+            row[3 + types.index(power_up.type)] = 1.0
+        return out
+
+    def render(self):
+        """Return the current frame as an (height, width, 3) uint8 array (needs render=True)"""
+        if self.game.renderer is None:
+            raise RuntimeError("create the environment with render=True to render frames")
+        self.game.draw()
+        return pygame.surfarray.array3d(self.game.renderer.screen).swapaxes(0, 1)
+
+    def close(self):
+        pygame.quit()
+
+
+# 共享内存中每个环境一行：观测向量，以及 [奖励, 终止, 截断, 得分, 关卡, 生命]
+_RESULT_FIELDS = 6
+
+
+def _worker(index, count, connection, names, env_kwargs):
+    """Run one environment in a worker process, reading actions and writing results in shared memory"""
+    buffers = [shared_memory.SharedMemory(name=name) for name in names]
+    observations = np.ndarray((count, OBSERVATION_SIZE), dtype=np.float32, buffer=buffers[0].buf)
+    results = np.ndarray((count, _RESULT_FIELDS), dtype=np.float64, buffer=buffers[1].buf)
+    actions = np.ndarray((count,), dtype=np.int64, buffer=buffers[2].buf)
+    env = SpaceShooterEnv(**env_kwargs)
+    seed = None
+    try:
+        while True:
+            command, argument = connection.recv()
+            if command == 'reset':
+                seed = argument
+                env.reset(seed)
+                reward, terminated, truncated = 0.0, False, False
+            elif command == 'step':
+                _, reward, terminated, truncated, _ = env.step(int(actions[index]))
+            else:
+                break
+            info = env.info()
+            results[index] = (reward, terminated, truncated, info['score'], info['round'], info['lives'])
+            if terminated or truncated:
+                # 自动开始下一局：结果行报告结束的这一局，观测已属于新的一局
+                seed = None if seed is None else seed + count
+                env.reset(seed)
+            env.observe(observations[index])
+            connection.send(True)
+    finally:
+        env.close()
+        for buffer in buffers:
+            buffer.close()
+        connection.close()
+
+
+class VectorEnv:
+    """count SpaceShooterEnvs stepped together in worker processes.
+
+    reset() and step() return batched numpy arrays; episodes that end are
+    reset automatically (with the previous episode's seed + count). Only
+    command names travel through the pipes; observations, rewards and actions
+    live in shared memory.
+    """
+
+    def __init__(self, count, context=None, **env_kwargs):
+        self.count = count
+        self._context = context or multiprocessing.get_context()
+        self._memory = [
+            shared_memory.SharedMemory(create=True, size=count * OBSERVATION_SIZE * 4),
+            shared_memory.SharedMemory(create=True, size=count * _RESULT_FIELDS * 8),
+            shared_memory.SharedMemory(create=True, size=count * 8),
+        ]
+        self.observations = np.ndarray((count, OBSERVATION_SIZE), dtype=np.float32, buffer=self._memory[0].buf)
+        self._results = np.ndarray((count, _RESULT_FIELDS), dtype=np.float64, buffer=self._memory[1].buf)
+        self._actions = np.ndarray((count,), dtype=np.int64, buffer=self._memory[2].buf)
+        names = [memory.name for memory in self._memory]
+        self._connections = []
+        self._processes = []
+        for index in range(count):
+            parent, child = self._context.Pipe()
+            process = self._context.Process(target=_worker, args=(index, count, child, names, env_kwargs),
+                                            daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self.closed = False
+
+    def _broadcast(self, command, arguments):
+        for connection, argument in zip(self._connections, arguments):
+            connection.send((command, argument))
+        for connection in self._connections:
+            connection.recv()
+
+    def _infos(self):
+        return {'score': self._results[:, 3].astype(np.int64), 'round': self._results[:, 4].astype(np.int64),
+                'lives': self._results[:, 5].astype(np.int64)}
+
+    def reset(self, seed=None):
+        """Reset every environment (env i uses seed + i); returns (observations, infos)"""
+        self._broadcast('reset', [None if seed is None else seed + i for i in range(self.count)])
+        return self.observations.copy(), self._infos()
+
+    def step(self, actions):
+        """Step every environment; returns (observations, rewards, terminated, truncated, infos)"""
+        self._actions[:] = actions
+        self._broadcast('step', [None] * self.count)
+        results = self._results
+        return (self.observations.copy(), results[:, 0].astype(np.float32), results[:, 1] > 0,
+                results[:, 2] > 0, self._infos())
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self._connections:
+            with contextlib.suppress(OSError):
+                connection.send(('close', None))
+        for process in self._processes:
+            process.join(timeout=5)
+        for connection in self._connections:
+            connection.close()
+        for memory in self._memory:
+            memory.close()
+            memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
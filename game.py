@@ -1,16 +1,35 @@
 import os
+import math
+import time
+import argparse
+import itertools
+import functools
 import pygame
-import random
+import rng
 from termcolor import cprint
 from dotenv import load_dotenv
 from math import sin, pi
 from array import array
-from sprites import Player, Bullet, Enemy, Particle, Explosion, PowerUp
+from sprites import Player, Enemy, Explosion, PowerUp
+from sprites import particle_pool
+from entities import EntityList
 from menu import Menu
-
-# Initialize pygame and its mixer for sound
-pygame.init()
-pygame.mixer.init()
+from renderer import create_renderer
+import game_clock
+from game_clock import GameClock
+import controls
+from controls import Controls
+from replay import Replay
+import snapshot
+import projectiles
+import enemy_bullets
+import enemy_motion
+from perf import NullProfiler
+from scheduler import Scheduler
+from despawn import Despawner
+from director import SpawnDirector
+import pool
+from bot import Bot
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +38,22 @@ load_dotenv()
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
+SIM_STEP_MS = 1000 / FPS  # 固定模拟步长（实体速度均按60Hz每帧调校）
+MAX_CATCH_UP_TICKS = 5  # 每帧最多补算的模拟步数，防止"死亡螺旋"
+VSYNC = os.getenv('VSYNC', '0') == '1'  # 垂直同步驱动画面呈现
+TIME_SCALE = float(os.getenv('TIME_SCALE', '1.0'))  # 模拟时间倍率（0.5慢放，4快进，inf无上限快进）
 INITIAL_LIVES = 5  # 初始生命数
+RENDER_SCALE = float(os.getenv('RENDER_SCALE', '1.0'))  # 世界层内部渲染比例（如0.5或0.75），HUD保持原生分辨率
+RENDER_BACKEND = os.getenv('RENDER_BACKEND', 'surface')  # 'surface' 或 'texture'（SDL2纹理渲染）
+KEYFRAME_INTERVAL = int(os.getenv('KEYFRAME_INTERVAL', '600'))  # 录像中每隔多少步保存一个关键帧（默认10秒）
+SEED = os.getenv('SEED')  # 固定随机种子，相同种子和输入可复现同一局游戏；未设置时每局随机
+# 预先分配的数量（玩家子弹和敌人子弹的表格行数、对象池中的粒子），超出时按需增长
+POOL_BULLETS = int(os.getenv('POOL_BULLETS', '64'))
+POOL_ENEMY_BULLETS = int(os.getenv('POOL_ENEMY_BULLETS', '128'))
+POOL_PARTICLES = int(os.getenv('POOL_PARTICLES', '512'))
+SPAWN_BUDGET = int(os.getenv('SPAWN_BUDGET', '90'))  # 同时存在的普通敌人的总费用上限（见director.py）
+SPAWN_INTERVAL = int(os.getenv('SPAWN_INTERVAL', '100'))  # 同一波敌人依次入场的间隔（ms）
+CHECK_UPDATES = os.getenv('CHECK_UPDATES', '0') == '1'  # 调试：每步检查每个实体只被更新一次，重复更新时抛出AssertionError
 
 # Global debug state
 DEBUG_MODE = False  # 全局Debug模式，默认关闭
@@ -32,18 +66,31 @@ GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
 CYAN = (0, 255, 255)
 
-# Initialize game window
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Space Shooter")
 clock = pygame.time.Clock()
 
+def init_pygame(headless=False):
+    """Initialize pygame and its mixer for sound
+
+    Headless mode selects SDL's dummy video/audio drivers, so no window or audio
+    device is needed (e.g. on build servers).
+    """
+    if headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    pygame.init()
+    pygame.mixer.init()
+
 class ResourceLoader:
     """Handles loading and managing game resources"""
-    def __init__(self):
+    def __init__(self, audio=True):
         self.images = {}
         self.sounds = {}
+        self.audio = audio  # 无头模式下不加载也不播放音频
         self.base_path = os.path.dirname(os.path.abspath(__file__))
         
+        if not audio:
+            return
+        
         # 设置音量
         pygame.mixer.music.set_volume(0.5)  # BGM音量
         
@@ -88,7 +135,9 @@ class ResourceLoader:
         """Load an image and store it in the images dictionary"""
         try:
             path = os.path.join(self.base_path, 'resources', 'images', filename)
-            image = pygame.image.load(path).convert_alpha()
+            image = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:  # 无头模式没有显示模式，不能convert
+                image = image.convert_alpha()
             self.images[name] = image
             cprint(f"Loaded image: {name}", "green")
             return image
@@ -119,6 +168,8 @@ class ResourceLoader:
         
     def play_bgm(self, state):
         """Play background music based on game state"""
+        if not self.audio:
+            return
         try:
             pygame.mixer.music.stop()
             if state == 'menu':
@@ -138,6 +189,44 @@ class ResourceLoader:
             if DEBUG_MODE:
                 cprint(f"播放武器音效: {weapon_type}", "cyan")
 
+
+# HUD面板只创建一次，纹理渲染器每张面板只上传一次纹理
+@functools.lru_cache(maxsize=None)
+def translucent_panel(size, color, alpha, border_color=None):
+    """Return a panel filled with color at the given surface alpha, with an optional 2px border"""
+    surface = pygame.Surface(size)
+    surface.set_alpha(alpha)
+    surface.fill(color)
+    if border_color is not None:
+        pygame.draw.rect(surface, border_color, (0, 0, *size), 2)
+    return surface
+
+
+@functools.lru_cache(maxsize=None)
+def rounded_panel(size, color, border_radius):
+    """Return a per-pixel alpha panel with rounded corners"""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(surface, color, surface.get_rect(), border_radius=border_radius)
+    return surface
+
+
+@functools.lru_cache(maxsize=None)
+def glow(half_size, radius, color):
+    """Return a per-pixel alpha circle centered in a (2*half_size)² surface"""
+    surface = pygame.Surface((half_size * 2, half_size * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (half_size, half_size), radius)
+    return surface
+
+
+@functools.lru_cache(maxsize=None)
+def volume_bar(bar_width):
+    """Return the half-transparent BGM volume bar filled to bar_width of 180px"""
+    surface = translucent_panel((200, 30), BLACK, 128).copy()
+    pygame.draw.rect(surface, (100, 100, 100), [10, 10, 180, 10])
+    pygame.draw.rect(surface, GREEN, [10, 10, bar_width, 10])
+    return surface
+
+
 class ScreenShake:
     def __init__(self):
         self.shake_intensity = 0
@@ -147,29 +236,75 @@ class ScreenShake:
     def start_shake(self, intensity, duration):
         self.shake_intensity = intensity
         self.shake_duration = duration
-        self.shake_timer = pygame.time.get_ticks()
+        self.shake_timer = game_clock.get_ticks()
 
     def update(self):
-        if pygame.time.get_ticks() - self.shake_timer < self.shake_duration:
-            return (random.randint(-self.shake_intensity, self.shake_intensity),
-                    random.randint(-self.shake_intensity, self.shake_intensity))
+        if game_clock.get_ticks() - self.shake_timer < self.shake_duration:
+            return (rng.cosmetic.randint(-self.shake_intensity, self.shake_intensity),
+                    rng.cosmetic.randint(-self.shake_intensity, self.shake_intensity))
         else:
             return (0, 0)
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, render=None, seed=None, record_path=None, backend=None):
+        """Create the game
+
+        headless runs without a window or audio; render (default: not headless)
+        controls whether frames are drawn, to an offscreen surface when headless.
+        backend picks the renderer ('surface' or 'texture', default: RENDER_BACKEND,
+        or 'surface' when headless; a headless texture renderer uses a hidden window).
+        seed (default: the SEED env var) makes every game reproducible; without
+        one each game gets a fresh seed. With record_path each game's input is
+        recorded and saved there as a replay.
+        """
+        init_pygame(headless)
+        self.headless = headless
+        self.render_enabled = (not headless) if render is None else render
         self.running = True
         self.base_path = os.path.dirname(os.path.abspath(__file__))
-        self.resource_loader = ResourceLoader()
+        self.fixed_seed = seed if seed is not None else (int(SEED) if SEED else None)
+        self.seed = None
+        
+        # 输入层：每个模拟步的输入位，来自键盘或录像
+        self.controls = Controls()
+        self.record_path = record_path
+        self.recording = None  # 正在录制的Replay
+        self.input_frames = None  # 替代键盘的输入位迭代器（录像回放或脚本输入）
+        self.replay_tick = 0  # 已回放的步数
+        
+        # 性能分析：各系统结束时调用lap()，默认不做任何事
+        self.profiler = NullProfiler()
+        # 每个模拟步按阶段顺序运行的系统
+        self.scheduler = self.create_scheduler()
+        
+        # Simulation clock read by all sprites (pauses with the game, supports time scaling)
+        self.game_clock = GameClock(SIM_STEP_MS, TIME_SCALE).install()
+        self.resource_loader = ResourceLoader(audio=not headless)
         self.load_resources()
         
+        # 预先创建短生命周期的精灵，避免开火和爆炸时才分配
+        particle_pool.prewarm(POOL_PARTICLES)
+        
         # Screen shake
         self.screen_shake = ScreenShake()
         
+        # World layer renderer (surface or SDL2 texture backend; offscreen when headless)
+        self.renderer = None
+        if self.render_enabled:
+            if backend is None:
+                backend = 'surface' if headless else RENDER_BACKEND
+            self.renderer = create_renderer(backend,
+                                            SCREEN_WIDTH, SCREEN_HEIGHT, RENDER_SCALE,
+                                            "Space Shooter", VSYNC and not headless, offscreen=headless)
+        self.previous_positions = {}  # 上一个模拟步的精灵位置，用于插值渲染
+        
         # Power-ups
         self.power_ups = pygame.sprite.Group()
         self.power_up_spawn_chance = 0.2  # 20% chance to spawn power-up from destroyed enemies
         
+        # 竞技场就是屏幕：离开它（加上各类实体的余量）或超过存活时间的子弹和道具被移除
+        self.despawner = Despawner(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        
         # Formation management
         self.formation_type = 1
         self.player_ships = []  # List to hold all player ships
@@ -270,12 +405,31 @@ class Game:
         return icon
 
     def init_game(self):
+        # Restart simulation time and random streams for the new game
+        self.game_clock.reset()
+        self.seed = self.fixed_seed if self.fixed_seed is not None else rng.new_seed()
+        rng.seed(self.seed)
+        self.debug_print(f"随机种子: {self.seed}", "cyan")
+        
         # Create sprite groups
         self.all_sprites = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
+        self.particles = EntityList()
+        self.power_ups = pygame.sprite.Group()
+        self.emitters = {}  # 拥有子弹和粒子列表的精灵（有序集合），包括子弹仍在飞行的已死亡精灵
+        # 玩家子弹和敌人子弹是同一个ECS世界中的实体（见projectiles.py和enemy_bullets.py）
+        self.world = projectiles.create_world(POOL_BULLETS)
+        enemy_bullets.register(self.world, POOL_ENEMY_BULLETS)
+        self.world.particles = self.particles
+        # 普通敌人的移动（每种移动方式一个表格，见enemy_motion.py）
+        self.enemy_world = enemy_motion.create_world()
+        self.director = SpawnDirector(SPAWN_BUDGET, SPAWN_INTERVAL)
+        self.screen_shake = ScreenShake()
+        pool.reset_stats()  # 上一局的精灵随旧的精灵组一起丢弃
+        self.despawner.reset_stats()
         
-        # Initialize player ships
+        # Initialize player ships (新的一局不继承上一局的飞船和武器)
+        self.player_ships = []
         self.update_formation(1)  # Start with single ship
         
         # Reset round-related variables
@@ -284,8 +438,10 @@ class Game:
         self.boss = None
         self.boss_spawned = False
         self.score_for_boss = 1000  # Reset base score
+        self.round_transition = False
+        self.last_health_check = 100
         self.showing_round_announcement = True
-        self.round_announcement_start = pygame.time.get_ticks()
+        self.round_announcement_start = game_clock.get_ticks()
         
         # Reset lives
         self.lives = INITIAL_LIVES
@@ -299,20 +455,19 @@ class Game:
         gray_surface.fill((128, 128, 128, 128))
         self.life_icon_gray.blit(gray_surface, (0, 0))
         
-        # Spawn initial enemies
-        for _ in range(8):
-            self.spawn_enemy()
-            
+        # 第一波敌人由self.director在回合公告期间预先建造，公告结束后入场
+        
         # Score and UI with Chinese font support
         self.score = 0
         self.font, self.round_font = self.load_chinese_fonts()
+        self.ui_fonts = self.load_ui_fonts()
         
         # Background stars
         self.stars = []
         for _ in range(50):
-            x = random.randrange(SCREEN_WIDTH)
-            y = random.randrange(SCREEN_HEIGHT)
-            speed = random.uniform(0.5, 2.0)
+            x = rng.cosmetic.randrange(SCREEN_WIDTH)
+            y = rng.cosmetic.randrange(SCREEN_HEIGHT)
+            speed = rng.cosmetic.uniform(0.5, 2.0)
             self.stars.append([x, y, speed])
         
     def load_chinese_fonts(self):
@@ -417,9 +572,11 @@ class Game:
         """Load all game resources"""
         cprint("Loading game resources...", "yellow")
     
-    def handle_events(self):
-        """Handle game events"""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle game events (default: the pending pygame events)"""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
                 
@@ -429,10 +586,7 @@ class Game:
                     action, data = result
                     
                     if action == 'start':
-                        self.state = 'playing'
-                        self.selected_ship = data
-                        self.init_game()
-                        self.resource_loader.play_bgm('game')  # 切换到游戏背景音乐
+                        self.start_game(data)
                     elif action == 'quit':
                         self.running = False
                     
@@ -440,6 +594,7 @@ class Game:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.state = 'paused'
+                        self.game_clock.pause()
                     elif event.key == pygame.K_SPACE:
                         # Handle shooting for non-beam weapons
                         for ship in self.player_ships:
@@ -470,6 +625,7 @@ class Game:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.state = 'playing'
+                        self.game_clock.resume()
                     elif event.key == pygame.K_q:
                         self.state = 'menu'
                         self.resource_loader.play_bgm('menu')  # 返回菜单时切换回菜单音乐
@@ -479,29 +635,62 @@ class Game:
                     self.state = 'menu'
                     self.resource_loader.play_bgm('menu')  # Return to menu music
 
-    def spawn_enemy(self):
-        """Spawn a new enemy"""
-        # Enemy type weights
-        weights = {
-            'scout': 0.3,    # 30% chance
-            'fighter': 0.2,  # 20% chance
-            'striker': 0.2,  # 20% chance for green ship
-            'elite': 0.15,   # 15% chance
-            'bomber': 0.15   # 15% chance
-        }
-        
-        enemy_type = random.choices(list(weights.keys()), 
-                                  weights=list(weights.values()))[0]
+    def start_game(self, ship_type='interceptor', formation_type=1):
+        """Start a new game with the given ship (same as choosing it in the menu)"""
+        self.state = 'playing'
+        self.selected_ship = ship_type
+        self.init_game()
+        if formation_type != 1:
+            self.update_formation(formation_type)
+        if self.record_path:
+            self.recording = Replay(self.seed, ship_type, formation_type)
+        self.resource_loader.play_bgm('game')  # 切换到游戏背景音乐
+
+    def play_replay(self, replay, start_tick=0):
+        """Start a recorded game; step() then feeds its input instead of the keyboard's
+
+        With start_tick the game jumps to the nearest keyframe at or before it and
+        simulates forward from there. Replays of another simulation version
+        raise ReplayError, since they would desync.
+        """
+        replay.check_simulation_version()
+        self.fixed_seed = replay.seed
+        self.start_game(replay.ship_type, replay.formation_type)
+        self.replay_tick = 0
+        keyframe = replay.keyframe_before(start_tick) if start_tick else None
+        if keyframe is not None:
+            self.recording = None  # 从中间开始无法录制完整的一局
+            self.replay_tick, data = keyframe
+            snapshot.restore(self, snapshot.decode(data))
+        self.input_frames = replay.iter_from(self.replay_tick)
+        while self.replay_tick < start_tick and self.step():
+            pass
+
+    def stop_recording(self):
+        """Save the current game's input recording to record_path"""
+        if self.recording is None:
+            return
+        self.recording.save(self.record_path)
+        cprint(f"录像已保存: {self.record_path} ({len(self.recording)} ticks, "
+               f"{os.path.getsize(self.record_path)} bytes)", "green")
+        self.recording = None
+
+    def spawn_enemy(self, enemy=None):
+        """Spawn a regular enemy (a new one of a random type if none is given)"""
+        if enemy is None:
+            enemy = Enemy(self.director.draw_type(), self.current_round)
         
         # Create enemy at random position at top of screen
-        x = random.randrange(SCREEN_WIDTH - 40)
-        enemy = Enemy(enemy_type, self.current_round)
-        enemy.rect.x = x
-        enemy.rect.y = random.randrange(-100, -40)
+        enemy.world = self.world
+        enemy.rect.x = rng.gameplay.randrange(SCREEN_WIDTH - 40)
+        enemy.rect.y = rng.gameplay.randrange(-100, -40)
+        # 预先建造的敌人从入场时开始计时
+        enemy.last_shot = enemy.spawn_time = game_clock.get_ticks()
         
         self.all_sprites.add(enemy)
         self.enemies.add(enemy)
-        self.debug_print(f"Spawned a {enemy_type} enemy!", "red")
+        enemy_motion.add(self.enemy_world, enemy)
+        self.debug_print(f"Spawned a {enemy.enemy_type} enemy!", "red")
 
     def start_new_round(self):
         """Start a new round with increased difficulty"""
@@ -541,196 +730,246 @@ class Game:
         
         # Show round announcement
         self.showing_round_announcement = True
-        self.round_announcement_start = pygame.time.get_ticks()
+        self.round_announcement_start = game_clock.get_ticks()
         self.round_transition = False
         
-        # Clear all enemies
+        # Clear all enemies (the new round's first wave enters after the announcement)
         for enemy in self.enemies:
             enemy.kill()
-        
-        # Spawn new enemies for the round
-        for _ in range(8):
-            self.spawn_enemy()
+        self.director.start_round()
         
         cprint(f"Starting Round {self.current_round}!", "yellow", attrs=['bold'])
 
     def update(self):
         """Update game state"""
-        # Get the time since the last frame
-        now = pygame.time.get_ticks()
-        
         # Update background stars
         for star in self.stars:
             star[1] += star[2]
             if star[1] > SCREEN_HEIGHT:
                 star[1] = 0
-                star[0] = random.randrange(SCREEN_WIDTH)
+                star[0] = rng.cosmetic.randrange(SCREEN_WIDTH)
         
         if self.state == 'menu':
             self.menu.update_stars()
             
         elif self.state == 'playing':
-            # Handle continuous key presses for beam weapon
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE] and len(self.player_ships) > 0:
-                # Only handle continuous firing for beam weapon
-                if self.player_ships[0].current_weapon == 'beam':
-                    for ship in self.player_ships:
-                        ship.shoot()
-            else:
-                # Stop beam firing when space key is released
+            # Advance simulation time by one tick
+            self.game_clock.advance()
+            self.scheduler.run(self.profiler)
+
+    def create_scheduler(self):
+        """Return the scheduler with the game's systems in update order"""
+        scheduler = Scheduler(CHECK_UPDATES)
+        scheduler.add('input', 'input', self.update_fire)
+        scheduler.add('ai', None, self.move_enemies)  # enemy_movement
+        scheduler.add('ai', 'sprites', self.update_sprites)
+        scheduler.add('ai', 'enemy_bounds', self.keep_enemies_in_bounds)
+        scheduler.add('movement', 'emitters', self.update_emitters)
+        scheduler.add('movement', None, self.update_bullets)  # bullet_* 各系统分别计时
+        scheduler.add('movement', 'formation', self.update_formation_positions)
+        scheduler.add('movement', 'despawn', self.despawn)  # 碰撞检测前移除离开竞技场的子弹
+        scheduler.add('collision', 'collisions', self.check_collisions)
+        scheduler.add('collision', 'collisions', self.check_player_hits)
+        scheduler.add('cleanup', 'spawning', self.update_spawning)
+        scheduler.add('cleanup', 'round', self.update_round)
+        scheduler.add('cleanup', 'bookkeeping', self.update_bookkeeping)
+        return scheduler
+
+    def in_round_break(self):
+        """True while the round announcement shows or the next round is about to start"""
+        return self.showing_round_announcement or self.round_transition
+
+    def update_fire(self):
+        """Fire the beam while the fire key is held (other weapons fire on key presses)"""
+        if self.controls.fire and len(self.player_ships) > 0:
+            # Only handle continuous firing for beam weapon
+            if self.player_ships[0].current_weapon == 'beam':
                 for ship in self.player_ships:
-                    if ship.current_weapon == 'beam':
-                        ship.stop_beam()
-            
-            # Update all sprites
-            self.all_sprites.update()
-            
-            # Check for collisions
-            self.check_collisions()
-            
-            # Spawn enemies if needed
-            if len(self.enemies) < 5 + self.current_round and not self.boss_spawned:
-                self.spawn_enemy()
-            
-            # Check if it's time to spawn a boss
-            if self.round_score >= self.score_for_boss and not self.boss_spawned:
-                self.spawn_boss()
-            
-            # Check if round is complete
-            if self.boss_spawned and self.boss is None:
-                # Boss was spawned but is now dead, advance to next round
-                self.advance_round()
-            
-            # Update screen shake
-            self.shake_offset = self.screen_shake.update()
-            
-            # Get screen shake offset
-            shake_offset = self.screen_shake.update()
-            
-            # Update ship positions in formation
-            if len(self.player_ships) > 0:
-                main_ship = self.player_ships[0]
-                if len(self.player_ships) == 2:
-                    # Two ship formation
-                    self.player_ships[1].rect.centerx = main_ship.rect.centerx - self.ship_spacing
-                    self.player_ships[1].rect.centery = main_ship.rect.centery
-                elif len(self.player_ships) == 3:
-                    # Three ship formation
-                    self.player_ships[1].rect.centerx = main_ship.rect.centerx - self.ship_spacing
-                    self.player_ships[1].rect.centery = main_ship.rect.centery
-                    self.player_ships[2].rect.centerx = main_ship.rect.centerx + self.ship_spacing
-                    self.player_ships[2].rect.centery = main_ship.rect.centery
-            
-            # Handle round announcement
-            if self.showing_round_announcement:
-                if pygame.time.get_ticks() - self.round_announcement_start > self.round_announcement_duration:
-                    self.showing_round_announcement = False
-                return  # Don't update game while showing announcement
-            
-            # Handle round transition
-            if self.round_transition:
-                self.start_new_round()
-                return
-            
-            # Add bullets and their particles from all ships to all_sprites
-            for ship in self.player_ships:
-                for bullet in ship.bullets:
-                    if bullet not in self.all_sprites:
-                        self.all_sprites.add(bullet)
-                    for particle in bullet.particles:
-                        if particle not in self.all_sprites:
-                            self.all_sprites.add(particle)
-            
-            # Check if player health has dropped by 25% or more
-            current_health_percent = (self.player_ships[0].health / self.player_ships[0].max_health) * 100
-            health_drop = self.last_health_check - current_health_percent
-            
-            if health_drop >= 25:
-                self.spawn_redcross()
-                self.last_health_check = current_health_percent
-                cprint("Spawning a healing redcross ship!", "green")
-            
-            # Update particles
-            self.particles.update()
-            
-            # Add new particles to all_sprites
-            for particle in self.particles:
-                if particle not in self.all_sprites:
-                    self.all_sprites.add(particle)
-            
-            # Add particles from all player ships
+                    ship.shoot()
+        else:
+            # Stop beam firing when space key is released
             for ship in self.player_ships:
-                for particle in ship.particles:
-                    if particle not in self.all_sprites:
-                        self.all_sprites.add(particle)
-            
-            # Add enemy bullets and their particles to all_sprites
-            for enemy in self.enemies:
-                for particle in enemy.particles:
-                    if particle not in self.all_sprites:
-                        self.all_sprites.add(particle)
-                for bullet in enemy.bullets:
-                    if bullet not in self.all_sprites:
-                        self.all_sprites.add(bullet)
-                    for particle in bullet.particles:
-                        if particle not in self.all_sprites:
-                            self.all_sprites.add(particle)
-            
-            # Remove dead particles
-            for sprite in self.all_sprites.copy():
-                if isinstance(sprite, (Particle, Explosion)) and not sprite.alive():
-                    self.all_sprites.remove(sprite)
-            
-            # 检查玩家与敌人的碰撞
-            for i, ship in enumerate(self.player_ships):
-                hits = pygame.sprite.spritecollide(ship, self.enemies, False,
-                                                 pygame.sprite.collide_circle)
-                if hits:
-                    if i == 0:  # 主船撞击，减少生命
+                if ship.current_weapon == 'beam':
+                    ship.stop_beam()
+
+    def move_enemies(self):
+        """Move the regular enemies, one vectorized step per movement pattern"""
+        self.scheduler.mark(self.enemy_world.tables.values())
+        self.enemy_world.run(self.profiler)
+
+    def keep_enemies_in_bounds(self):
+        """Respawn regular enemies that fell off the screen and stop them at its edges (after they shot)"""
+        enemy_motion.keep_in_bounds(self.enemy_world)
+
+    def update_sprites(self):
+        """Update ships, enemies and power-ups (the boss moves; enemies shoot)"""
+        self.scheduler.mark(self.all_sprites)
+        self.all_sprites.update()
+
+    def update_bullets(self):
+        """Run the ECS systems of the player and enemy bullets"""
+        self.scheduler.mark(self.world.tables.values())
+        self.world.run(self.profiler)
+
+    def update_formation_positions(self):
+        """Keep the wing ships next to the main ship"""
+        if len(self.player_ships) > 0:
+            main_ship = self.player_ships[0]
+            if len(self.player_ships) == 2:
+                # Two ship formation
+                self.player_ships[1].rect.centerx = main_ship.rect.centerx - self.ship_spacing
+                self.player_ships[1].rect.centery = main_ship.rect.centery
+            elif len(self.player_ships) == 3:
+                # Three ship formation
+                self.player_ships[1].rect.centerx = main_ship.rect.centerx - self.ship_spacing
+                self.player_ships[1].rect.centery = main_ship.rect.centery
+                self.player_ships[2].rect.centerx = main_ship.rect.centerx + self.ship_spacing
+                self.player_ships[2].rect.centery = main_ship.rect.centery
+
+    def check_player_hits(self):
+        """Check enemies and enemy bullets hitting the player ships, and power-up pickups
+
+        Paused during the round announcement. Returns True when the main ship
+        died, which ends the tick.
+        """
+        if self.in_round_break():
+            return
+        
+        # 检查玩家与敌人的碰撞
+        for i, ship in enumerate(self.player_ships):
+            hits = pygame.sprite.spritecollide(ship, self.enemies, False,
+                                             pygame.sprite.collide_circle)
+            if hits:
+                if i == 0:  # 主船撞击，减少生命
+                    self.handle_player_death(ship)
+                    return True
+                else:  # 僚机撞击，只移除僚机
+                    self.handle_wingship_death(ship, i)
+                    break  # 处理完一个碰撞后退出循环
+
+        # 检查敌人子弹与玩家的碰撞（只有仍在敌人组中的敌人的子弹）
+        for ship in list(self.player_ships):
+            for bullet in enemy_bullets.collide_ship(self.world, ship, self.enemies):
+                bullet.kill()
+                ship.take_damage(bullet.damage)
+                explosion = Explosion(bullet.center, 10, self.particles)
+                if ship.health <= 0:
+                    i = self.player_ships.index(ship)
+                    if i == 0:  # 主船死亡，减少生命
                         self.handle_player_death(ship)
-                        return
-                    else:  # 僚机撞击，只移除僚机
+                        return True
+                    else:  # 僚机死亡，只移除僚机
                         self.handle_wingship_death(ship, i)
-                        break  # 处理完一个碰撞后退出循环
-
-            # 检查敌人子弹与玩家的碰撞
-            for enemy in self.enemies:
-                for i, ship in enumerate(self.player_ships):
-                    hits = pygame.sprite.spritecollide(ship, enemy.bullets, True,
-                                                     pygame.sprite.collide_circle)
-                    for bullet in hits:
-                        ship.take_damage(bullet.damage)
-                        explosion = Explosion(bullet.rect.center, 10, self.particles)
-                        if ship.health <= 0:
-                            if i == 0:  # 主船死亡，减少生命
-                                self.handle_player_death(ship)
-                                return
-                            else:  # 僚机死亡，只移除僚机
-                                self.handle_wingship_death(ship, i)
-                                break  # 处理完一个死亡后退出内层循环
-            
-            # Spawn boss when round score reaches threshold
-            if not self.boss_spawned and self.round_score >= self.score_for_boss:
-                self.spawn_boss()
+                        break  # 处理完一个死亡后检查下一艘飞船
+        
+        # Spawn boss when round score reaches threshold
+        if not self.boss_spawned and self.round_score >= self.score_for_boss:
+            self.spawn_boss()
 
-            # Check power-up collisions with player ships
-            for ship in self.player_ships:
-                hits = pygame.sprite.spritecollide(ship, self.power_ups, True)
-                for power_up in hits:
-                    self.apply_power_up(ship, power_up.type)
-                    # Add collection particles
-                    for _ in range(10):
-                        particle = Particle(power_up.rect.centerx, power_up.rect.centery,
-                                         power_up.config['color'],
-                                         random.uniform(-2, 2),
-                                         random.uniform(-2, 2))
-                        self.particles.add(particle)
-                        self.all_sprites.add(particle)
-
-    def draw(self):
-        """Draw the game screen"""
-        screen.fill(BLACK)
+        # Check power-up collisions with player ships
+        for ship in self.player_ships:
+            hits = pygame.sprite.spritecollide(ship, self.power_ups, True)
+            for power_up in hits:
+                self.apply_power_up(ship, power_up.type)
+                # Add collection particles
+                for _ in range(10):
+                    particle = particle_pool.acquire(power_up.rect.centerx, power_up.rect.centery,
+                                     power_up.config['color'],
+                                     rng.cosmetic.uniform(-2, 2),
+                                     rng.cosmetic.uniform(-2, 2))
+                    self.particles.add(particle)
+
+    def update_spawning(self):
+        """Let the spawn director send in enemies and spawn the boss"""
+        # Boss战期间不再加入普通敌人
+        if not self.boss_spawned:
+            self.director.update(self)
+        
+        # Check if it's time to spawn a boss
+        if self.round_score >= self.score_for_boss and not self.boss_spawned:
+            self.spawn_boss()
+        
+        # Check if round is complete
+        if self.boss_spawned and self.boss is None:
+            # Boss was spawned but is now dead, advance to next round
+            self.advance_round()
+
+    def update_round(self):
+        """End the round announcement, or start the next round once the boss is beaten"""
+        # Handle round announcement
+        if self.showing_round_announcement:
+            if game_clock.get_ticks() - self.round_announcement_start > self.round_announcement_duration:
+                self.showing_round_announcement = False
+        
+        # Handle round transition
+        elif self.round_transition:
+            self.start_new_round()
+
+    def update_bookkeeping(self):
+        """Track new emitters and spawn a healing redcross ship after heavy damage"""
+        # Track the ships', enemies' and power-ups' particles from now on (see update_emitters)
+        for ship in self.player_ships:
+            self.emitters[ship] = None
+        for enemy in self.enemies:
+            self.emitters[enemy] = None
+        for power_up in self.power_ups:
+            self.emitters[power_up] = None
+        
+        if self.in_round_break():
+            return
+        
+        # Check if player health has dropped by 25% or more
+        current_health_percent = (self.player_ships[0].health / self.player_ships[0].max_health) * 100
+        health_drop = self.last_health_check - current_health_percent
+        
+        if health_drop >= 25:
+            self.spawn_redcross()
+            self.last_health_check = current_health_percent
+            cprint("Spawning a healing redcross ship!", "green")
+
+    def update_emitters(self):
+        """Update the particle lists of every tracked emitter, and the game's own particles
+
+        This is the only update of these lists: ships, enemies and power-ups do
+        not update them in their own update(). Emitters that died keep their particles
+        moving until they are gone.
+        """
+        for emitter in list(self.emitters):
+            emitter.particles.update()
+            if not emitter.particles and not emitter.alive():
+                del self.emitters[emitter]
+        self.particles.update()
+
+    def despawn(self):
+        """Remove bullets and power-ups that left the arena or outlived their lifetime"""
+        self.despawner.cull_tables(self.world.query(projectiles.BODY, projectiles.PROJECTILE))
+        self.despawner.cull_tables(self.world.query(projectiles.BODY, enemy_bullets.HOSTILE), 'enemy_bullet')
+        self.despawner.cull(self.power_ups, 'power_up')
+
+    def entity_lists(self):
+        """Yield every list of particles in the world (bullets are in self.world)"""
+        yield self.particles
+        for emitter in self.emitters:
+            yield emitter.particles
+
+    def snapshot_positions(self):
+        """Remember sprite positions before a simulation tick for render interpolation"""
+        self.previous_positions = {sprite: sprite.rect.center
+                                   for sprite in itertools.chain(self.all_sprites, *self.entity_lists())}
+        projectiles.save_positions(self.world)
+
+    def draw(self, alpha=1.0):
+        """Draw the game screen
+
+        alpha (0..1) is how far the render time is between the previous and the
+        current simulation tick; sprites are drawn interpolated between them.
+        """
+        if self.renderer is None:
+            return
+        
+        # 菜单的图形用pygame.draw绘制，需要覆盖层；游戏画面的HUD只用缓存的文字和面板
+        screen = self.renderer.begin_frame(overlay=self.state == 'menu')
+        text = self.renderer.text
         
         if self.state == 'menu':
             self.menu.draw(screen)
@@ -739,30 +978,13 @@ class Game:
             # Apply screen shake offset
             shake_offset = self.screen_shake.update()
             
-            # Create a surface for the game view
-            game_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            game_surface.fill(BLACK)
-            
-            # Draw background stars
-            for x, y, _ in self.stars:
-                pygame.draw.circle(game_surface, WHITE, (int(x), int(y)), 1)
-            
-            # Draw game objects on the game surface
-            # 先绘制非子弹对象
-            for sprite in self.all_sprites:
-                if not hasattr(sprite, 'weapon_type'):  # 非子弹对象
-                    game_surface.blit(sprite.image, sprite.rect)
-            
-            # 然后绘制子弹（使用自定义draw方法显示轨迹）
-            for ship in self.player_ships:
-                for bullet in ship.bullets:
-                    if hasattr(bullet, 'draw'):
-                        bullet.draw(game_surface)
-                    else:
-                        game_surface.blit(bullet.image, bullet.rect)
-            
-            # Apply the shake offset when blitting to the screen
-            screen.blit(game_surface, shake_offset)
+            # Draw the world layer (stars, ships, bullets) with the shake offset
+            bullets = projectiles.draw_list(self.world)
+            enemy_motion.rotate_images(self.enemy_world)
+            sprites = itertools.chain(self.all_sprites, *self.entity_lists())
+            self.renderer.draw_world(screen, self.stars, sprites, bullets, shake_offset,
+                                     self.previous_positions, alpha)
+            self.profiler.lap('render_world')
             
             # Draw UI elements directly on the screen (no shake)
             # Round, Score, and Weapon in Chinese with better formatting
@@ -771,19 +993,19 @@ class Game:
             shadow_offset = 2
             
             # 使用不同字体大小创建更美观的UI（基于已加载的中文字体）
-            title_font, main_font, small_font = self.load_ui_fonts()
+            title_font, main_font, small_font = self.ui_fonts
             
             # 关卡显示 - 使用主要字体保持一致
-            round_shadow = main_font.render(f'第 {self.current_round} 关', True, shadow_color)
-            round_text = main_font.render(f'第 {self.current_round} 关', True, (255, 215, 0))  # 金色
+            round_shadow = text(main_font, f'第 {self.current_round} 关', shadow_color)
+            round_text = text(main_font, f'第 {self.current_round} 关', (255, 215, 0))  # 金色
             
             # 总分显示 - 使用中等字体
-            score_shadow = main_font.render(f'总分: {self.score}', True, shadow_color)
-            score_text = main_font.render(f'总分: {self.score}', True, (135, 206, 250))  # 天蓝色
+            score_shadow = text(main_font, f'总分: {self.score}', shadow_color)
+            score_text = text(main_font, f'总分: {self.score}', (135, 206, 250))  # 天蓝色
             
             # 当前关卡分数显示 - 使用中等字体
-            round_score_shadow = main_font.render(f'关卡分数: {self.round_score}', True, shadow_color)
-            round_score_text = main_font.render(f'关卡分数: {self.round_score}', True, (144, 238, 144))  # 浅绿色
+            round_score_shadow = text(main_font, f'关卡分数: {self.round_score}', shadow_color)
+            round_score_text = text(main_font, f'关卡分数: {self.round_score}', (144, 238, 144))  # 浅绿色
             
             # 武器名称中文化和颜色映射
             weapon_names = {
@@ -798,8 +1020,8 @@ class Game:
                 self.player_ships[0].current_weapon, 
                 (self.player_ships[0].current_weapon, WHITE)
             )
-            weapon_shadow = main_font.render(f'武器: {weapon_name} (TAB切换)', True, shadow_color)
-            weapon_text = main_font.render(f'武器: {weapon_name} (TAB切换)', True, weapon_color)
+            weapon_shadow = text(main_font, f'武器: {weapon_name} (TAB切换)', shadow_color)
+            weapon_text = text(main_font, f'武器: {weapon_name} (TAB切换)', weapon_color)
             
             # 信息面板切换功能
             if self.show_info_panel:
@@ -828,15 +1050,8 @@ class Game:
                 panel_height = content_height + panel_padding * 2
                 
                 # 绘制半透明背景面板
-                panel_surface = pygame.Surface((panel_width, panel_height))
-                panel_surface.set_alpha(180)
-                panel_surface.fill((20, 25, 35))  # 深蓝灰色
-                
-                # 添加边框
-                pygame.draw.rect(panel_surface, (80, 90, 110), 
-                               (0, 0, panel_width, panel_height), 2)
-                
-                screen.blit(panel_surface, (5, 5))
+                # 深蓝灰色，带边框
+                screen.blit(translucent_panel((panel_width, panel_height), (20, 25, 35), 180, (80, 90, 110)), (5, 5))
                 
                 # 开始绘制内容
                 current_y = 5 + panel_padding
@@ -844,19 +1059,19 @@ class Game:
                 
                 # === 模块1：关卡状态 ===
                 # 模块标题
-                section_title = small_font.render('■ 关卡状态', True, (255, 255, 100))  # 更亮的黄色
+                section_title = text(small_font, '■ 关卡状态', (255, 255, 100))  # 更亮的黄色
                 screen.blit(section_title, (panel_x, current_y))
                 current_y += 22
                 
                 # 关卡信息
-                round_text = small_font.render(f'关卡 {self.current_round}', True, (255, 215, 0))
+                round_text = text(small_font, f'关卡 {self.current_round}', (255, 215, 0))
                 screen.blit(round_text, (panel_x + 12, current_y))
                 current_y += line_height
                 
                 # Boss出现进度
                 if not self.boss_spawned:
                     boss_progress = min(1.0, self.round_score / self.score_for_boss)
-                    boss_text = small_font.render(f'Boss出现进度：{self.round_score}/{self.score_for_boss}', True, (255, 150, 150))
+                    boss_text = text(small_font, f'Boss出现进度：{self.round_score}/{self.score_for_boss}', (255, 150, 150))
                     screen.blit(boss_text, (panel_x + 12, current_y))
                     current_y += 20
                     
@@ -867,7 +1082,7 @@ class Game:
                     progress_y = current_y
                     
                     # 背景
-                    pygame.draw.rect(screen, (60, 60, 60), 
+                    self.renderer.draw_rect(screen, (60, 60, 60), 
                                    (progress_x, progress_y, progress_bar_width, progress_bar_height))
                     # 进度
                     progress_width = int(progress_bar_width * boss_progress)
@@ -877,46 +1092,46 @@ class Game:
                         color = (255, 255, 100)
                     else:
                         color = (255, 100, 100)
-                    pygame.draw.rect(screen, color, 
+                    self.renderer.draw_rect(screen, color, 
                                    (progress_x, progress_y, progress_width, progress_bar_height))
                     # 边框
-                    pygame.draw.rect(screen, (150, 150, 150), 
+                    self.renderer.draw_rect(screen, (150, 150, 150), 
                                    (progress_x, progress_y, progress_bar_width, progress_bar_height), 1)
                     current_y += 18
                 else:
-                    boss_text = small_font.render('🔥 Boss已出现！', True, (255, 80, 80))
+                    boss_text = text(small_font, '🔥 Boss已出现！', (255, 80, 80))
                     screen.blit(boss_text, (panel_x + 12, current_y))
                     current_y += line_height
                 
                 # 全局积分
-                score_text = small_font.render(f'全局积分：{self.score}', True, (135, 206, 250))
+                score_text = text(small_font, f'全局积分：{self.score}', (135, 206, 250))
                 screen.blit(score_text, (panel_x + 12, current_y))
                 current_y += line_height
                 
                 # 当前关卡积分
-                round_score_text = small_font.render(f'当前关卡积分：{self.round_score}', True, (144, 238, 144))
+                round_score_text = text(small_font, f'当前关卡积分：{self.round_score}', (144, 238, 144))
                 screen.blit(round_score_text, (panel_x + 12, current_y))
                 current_y += line_height + section_gap
                 
                 # 分隔线
-                pygame.draw.line(screen, (100, 100, 100), 
+                self.renderer.draw_line(screen, (100, 100, 100), 
                                (panel_x, current_y), (panel_x + panel_width - panel_padding*2, current_y), 1)
                 current_y += section_gap
                 
                 # === 模块2：装备配置 ===
-                section_title = small_font.render('◆ 装备配置', True, (255, 200, 100))  # 橙黄色
+                section_title = text(small_font, '◆ 装备配置', (255, 200, 100))  # 橙黄色
                 screen.blit(section_title, (panel_x, current_y))
                 current_y += 22
                 
                 # 当前武器
-                weapon_text = small_font.render(f'当前武器：{weapon_name} [TAB切换]', True, weapon_color)
+                weapon_text = text(small_font, f'当前武器：{weapon_name} [TAB切换]', weapon_color)
                 screen.blit(weapon_text, (panel_x + 12, current_y))
                 current_y += line_height
                 
                 # 编队模式
                 formation_names = {1: '单机', 2: '双机', 3: '三机'}
                 formation_name = formation_names.get(self.formation_type, '未知')
-                formation_text = small_font.render(f'编队模式：{formation_name} (1/2/3键切换)', True, (200, 200, 200))
+                formation_text = text(small_font, f'编队模式：{formation_name} (1/2/3键切换)', (200, 200, 200))
                 screen.blit(formation_text, (panel_x + 12, current_y))
                 current_y += line_height
                 
@@ -924,17 +1139,17 @@ class Game:
                 global DEBUG_MODE
                 debug_status = '开启' if DEBUG_MODE else '关闭'
                 debug_color = (100, 255, 100) if DEBUG_MODE else (255, 100, 100)
-                debug_text = small_font.render(f'Debug信息：{debug_status} [D切换]', True, debug_color)
+                debug_text = text(small_font, f'Debug信息：{debug_status} [D切换]', debug_color)
                 screen.blit(debug_text, (panel_x + 12, current_y))
                 current_y += line_height + section_gap
                 
                 # 分隔线
-                pygame.draw.line(screen, (100, 100, 100), 
+                self.renderer.draw_line(screen, (100, 100, 100), 
                                (panel_x, current_y), (panel_x + panel_width - panel_padding*2, current_y), 1)
                 current_y += section_gap
                 
                 # === 模块3：操作指引 ===
-                section_title = small_font.render('● 操作指引', True, (150, 200, 255))  # 浅蓝色
+                section_title = text(small_font, '● 操作指引', (150, 200, 255))  # 浅蓝色
                 screen.blit(section_title, (panel_x, current_y))
                 current_y += 22
                 
@@ -950,7 +1165,7 @@ class Game:
                 ]
                 
                 for control_text, color in controls:
-                    control_surface = small_font.render(control_text, True, color)
+                    control_surface = text(small_font, control_text, color)
                     screen.blit(control_surface, (panel_x + 12, current_y))
                     current_y += line_height
                     
@@ -965,10 +1180,10 @@ class Game:
             health_y = 20
             
             # Background
-            pygame.draw.rect(screen, RED, (health_x, health_y, health_width, health_height))
+            self.renderer.draw_rect(screen, RED, (health_x, health_y, health_width, health_height))
             # Health
             current_health = max(0, self.player_ships[0].health / self.player_ships[0].max_health * health_width)
-            pygame.draw.rect(screen, GREEN, (health_x, health_y, current_health, health_height))
+            self.renderer.draw_rect(screen, GREEN, (health_x, health_y, current_health, health_height))
             
             # Draw life icons with background - match health bar width
             health_width = 200  # 与血条相同的宽度
@@ -984,12 +1199,10 @@ class Game:
             icon_bg_y = health_y + health_height + 10
             
             # 半透明背景
-            bg_surface = pygame.Surface((health_width, icon_section_height), pygame.SRCALPHA)
-            pygame.draw.rect(bg_surface, (0, 0, 0, 128), bg_surface.get_rect(), border_radius=5)
-            screen.blit(bg_surface, (icon_bg_x, icon_bg_y))
+            screen.blit(rounded_panel((health_width, icon_section_height), (0, 0, 0, 128), 5), (icon_bg_x, icon_bg_y))
             
             # 添加边框
-            pygame.draw.rect(screen, (255, 255, 255, 64), 
+            self.renderer.draw_rect(screen, (255, 255, 255, 64), 
                            (icon_bg_x, icon_bg_y, health_width, icon_section_height),
                            1, border_radius=5)
             
@@ -1004,9 +1217,7 @@ class Game:
                 # 添加发光效果
                 if i >= (INITIAL_LIVES - self.lives):  # 从右边开始显示活跃图标
                     # 活跃生命图标的光效
-                    glow_surface = pygame.Surface((32, 32), pygame.SRCALPHA)
-                    pygame.draw.circle(glow_surface, (0, 255, 255, 30), (16, 16), 14)
-                    screen.blit(glow_surface, (icon_x-4, start_y-4))
+                    screen.blit(glow(16, 14, (0, 255, 255, 30)), (icon_x-4, start_y-4))
                     screen.blit(self.life_icon, (icon_x, start_y))
                 else:
                     screen.blit(self.life_icon_gray, (icon_x, start_y))
@@ -1021,69 +1232,55 @@ class Game:
                 hint_color = (150, 255, 150)  # Light green
             
             # Create the hint text surface
-            hint_surface = small_font.render(hint_text, True, hint_color)
+            hint_surface = text(small_font, hint_text, hint_color)
             hint_width = hint_surface.get_width()
             hint_x = SCREEN_WIDTH - hint_width - 10  # Align with right edge
             
             # Add subtle shadow for better readability
-            shadow_surface = small_font.render(hint_text, True, (0, 0, 0))
+            shadow_surface = text(small_font, hint_text, (0, 0, 0))
             screen.blit(shadow_surface, (hint_x + 1, hint_y + 1))
             screen.blit(hint_surface, (hint_x, hint_y))
             
             # Draw round announcement if active
             if self.showing_round_announcement:
                 # Create semi-transparent overlay
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                overlay.fill(BLACK)
-                overlay.set_alpha(128)
-                screen.blit(overlay, (0, 0))
+                screen.blit(translucent_panel((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 128), (0, 0))
                 
                 # Calculate animation progress (0 to 1)
-                progress = min(1.0, (pygame.time.get_ticks() - self.round_announcement_start) / 1000)
+                progress = min(1.0, (game_clock.get_ticks() - self.round_announcement_start) / 1000)
                 
                 # Animate the text scaling and fading
                 scale = 1.5 - (0.5 * progress)  # Start large and shrink
                 alpha = 255 if progress < 0.7 else int(255 * (1 - (progress - 0.7) / 0.3))
                 
                 # Render the round announcement in Chinese
-                round_text = self.round_font.render(f"第 {self.current_round} 关", True, WHITE)
-                round_text.set_alpha(alpha)
+                round_text = text(self.round_font, f"第 {self.current_round} 关", WHITE)
                 
                 # Scale and position the text
                 scaled_size = (int(round_text.get_width() * scale), 
                              int(round_text.get_height() * scale))
-                scaled_text = pygame.transform.scale(round_text, scaled_size)
-                text_rect = scaled_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+                text_rect = pygame.Rect((0, 0), scaled_size)
+                text_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
                 
-                screen.blit(scaled_text, text_rect)
+                self.renderer.blit_scaled(screen, round_text, text_rect, alpha)
             
-            # 绘制BGM音量条
+            # 绘制BGM音量条（界面提示使用真实时间）
             if pygame.time.get_ticks() - self.volume_display_time < self.volume_display_duration:
-                # 创建半透明的背景
-                volume_surface = pygame.Surface((200, 30))
-                volume_surface.fill(BLACK)
-                volume_surface.set_alpha(128)
-                
-                # 绘制音量条
-                bar_width = int(180 * self.volume)
-                pygame.draw.rect(volume_surface, (100, 100, 100), [10, 10, 180, 10])
-                pygame.draw.rect(volume_surface, GREEN, [10, 10, bar_width, 10])
+                # 半透明背景上的音量条（每档音量一张缓存的面板）
+                volume_surface = volume_bar(int(180 * self.volume))
                 
                 # 显示在屏幕上方
-                volume_text = self.font.render('BGM Volume', True, WHITE)
+                volume_text = text(self.font, 'BGM Volume', WHITE)
                 screen.blit(volume_text, (300, 15))
                 screen.blit(volume_surface, (400, 10))
             
             # If paused, draw pause menu
             if self.state == 'paused':
-                s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                s.set_alpha(128)
-                s.fill(BLACK)
-                screen.blit(s, (0,0))
+                screen.blit(translucent_panel((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 128), (0,0))
                 
-                pause_text = self.font.render('游戏暂停', True, WHITE)
-                resume_text = self.font.render('按 ESC 继续游戏', True, WHITE)
-                quit_text = self.font.render('按 Q 退出到菜单', True, WHITE)
+                pause_text = text(self.font, '游戏暂停', WHITE)
+                resume_text = text(self.font, '按 ESC 继续游戏', WHITE)
+                quit_text = text(self.font, '按 Q 退出到菜单', WHITE)
                 
                 screen.blit(pause_text, 
                            (SCREEN_WIDTH//2 - pause_text.get_width()//2, 
@@ -1096,9 +1293,9 @@ class Game:
                             SCREEN_HEIGHT//2 + 40))
                 
         elif self.state == 'game_over':
-            game_over_text = self.font.render('游戏结束', True, RED)
-            score_text = self.font.render(f'最终得分：{self.score}', True, WHITE)
-            continue_text = self.font.render('按任意键继续', True, WHITE)
+            game_over_text = text(self.font, '游戏结束', RED)
+            score_text = text(self.font, f'最终得分：{self.score}', WHITE)
+            continue_text = text(self.font, '按任意键继续', WHITE)
             
             screen.blit(game_over_text, 
                        (SCREEN_WIDTH//2 - game_over_text.get_width()//2, 
@@ -1110,7 +1307,9 @@ class Game:
                        (SCREEN_WIDTH//2 - continue_text.get_width()//2, 
                         SCREEN_HEIGHT//2 + 60))
         
-        pygame.display.flip()
+        self.profiler.lap('hud')
+        self.renderer.present()
+        self.profiler.lap('present')
 
     def update_volume(self):
         """Update BGM volume"""
@@ -1120,21 +1319,114 @@ class Game:
         self.volume_display_time = pygame.time.get_ticks()
         cprint(f"BGM音量调整为: {int(self.volume * 100)}%", "cyan")
     
+    def read_input(self):
+        """Return this tick's (events, input bits), or None when the replay being played has ended"""
+        if self.input_frames is not None:
+            bits = next(self.input_frames, None)
+            if bits is None:
+                cprint("录像回放结束", "green")
+                self.input_frames = None
+                self.running = False
+                return None
+            self.replay_tick += 1
+            # 回放时只接受退出事件，其余输入来自录像
+            events = [event for event in pygame.event.get() if event.type == pygame.QUIT]
+            return controls.press_events(bits) + events, bits
+        events = pygame.event.get()
+        bits = controls.held_bits(pygame.key.get_pressed()) | controls.press_bits(events)
+        if self.state in ('playing', 'paused'):
+            # 游戏中的按键按固定顺序处理，与回放时完全一致
+            events = [event for event in events if not controls.is_recorded_press(event)]
+            events += controls.press_events(bits)
+        return events, bits
+
+    def step(self):
+        """Run one fixed simulation tick; returns False if there was no input left to run it"""
+        self.snapshot_positions()
+        if self.state == 'playing':
+            # 每个模拟步的随机数只取决于种子和步数
+            rng.begin_tick(self.game_clock.tick_count)
+        frame = self.read_input()
+        if frame is None:
+            return False
+        events, bits = frame
+        recording = self.recording
+        self.controls.bits = bits & controls.HELD_MASK
+        self.handle_events(events)
+        self.profiler.lap('input')
+        self.update()
+        
+        if self.recording is not None:
+            # 开局这一步的按键是在菜单中按下的，只记录持续按住的键
+            self.recording.append(bits if self.recording is recording else bits & controls.HELD_MASK)
+            if not self.running or self.state not in ('playing', 'paused'):
+                self.stop_recording()
+            elif len(self.recording) % KEYFRAME_INTERVAL == 0:
+                self.recording.add_keyframe(len(self.recording), snapshot.encode(snapshot.capture(self)))
+        # 本步被销毁的子弹和粒子从下一步起才能复用
+        pool.flush()
+        return True
+
+    def run_headless(self, max_ticks=None):
+        """Run simulation ticks as fast as possible without presenting frames
+
+        Stops after max_ticks, on quit or on game over; returns the number of ticks run.
+        """
+        ticks = 0
+        while self.running and self.state != 'game_over':
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            if not self.step():
+                break
+            if self.renderer is not None:
+                self.draw()
+            ticks += 1
+        return ticks
+
     def run(self):
-        """Main game loop"""
+        """Main game loop
+
+        The simulation advances in fixed SIM_STEP_MS ticks independent of the
+        render rate; frames are drawn interpolated between the last two ticks.
+        The game clock's time scale sets how many ticks run per real second.
+        """
         global clock
         clock = pygame.time.Clock()
+        accumulator = 0.0
         
         # Main game loop
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
+            # 垂直同步时由present()节流，否则限制帧率
+            frame_time = clock.tick() if self.renderer.vsync else clock.tick(FPS)
+            
+            if self.game_clock.unbounded:
+                # 无上限快进：每帧用一帧的时间预算尽可能多地模拟
+                deadline = time.perf_counter() + SIM_STEP_MS / 1000
+                while self.running and time.perf_counter() < deadline:
+                    self.step()
+                if self.running:
+                    self.draw()
+                continue
             
-            # Cap the frame rate
-            clock.tick(FPS)
+            accumulator += frame_time * self.game_clock.time_scale
+            max_ticks = MAX_CATCH_UP_TICKS * max(1, math.ceil(self.game_clock.time_scale))
+            
+            # Run fixed simulation steps for the elapsed time
+            ticks = 0
+            while accumulator >= SIM_STEP_MS and self.running:
+                if ticks == max_ticks:
+                    # 落后太多时丢弃积压时间（游戏变慢而不是卡死）
+                    accumulator %= SIM_STEP_MS
+                    break
+                self.step()
+                accumulator -= SIM_STEP_MS
+                ticks += 1
+            
+            if self.running:
+                self.draw(accumulator / SIM_STEP_MS)
         
         # Clean up
+        self.stop_recording()
         pygame.quit()
 
     def spawn_boss(self):
@@ -1142,6 +1434,7 @@ class Game:
         cprint("警告：Boss出现！", "red", attrs=['bold'])
         self.boss = Enemy('boss', self.current_round)
         self.boss.player = self.player_ships[0]  # Add reference to player for aiming
+        self.boss.world = self.world
         self.all_sprites.add(self.boss)
         self.enemies.add(self.boss)
         self.boss_spawned = True
@@ -1149,8 +1442,10 @@ class Game:
     def spawn_redcross(self):
         """Spawn a healing redcross ship"""
         enemy = Enemy('redcross', self.current_round)  # Round number won't affect redcross
+        enemy.world = self.world
         self.all_sprites.add(enemy)
         self.enemies.add(enemy)
+        enemy_motion.add(self.enemy_world, enemy)
         cprint("生成了一个医疗救援船！", "green")
 
     def update_formation(self, formation_type):
@@ -1182,7 +1477,7 @@ class Game:
         
         # Add additional ships based on formation type
         if formation_type >= 2:
-            wing_ship1 = Player(self.resource_loader, random.choice(available_ships))
+            wing_ship1 = Player(self.resource_loader, rng.gameplay.choice(available_ships))
             wing_ship1.rect.centerx = main_ship.rect.centerx - self.ship_spacing
             wing_ship1.rect.bottom = main_ship.rect.bottom
             # 僚机使用与主机相同的武器
@@ -1191,7 +1486,7 @@ class Game:
             
         if formation_type == 3:
             remaining_ships = [s for s in available_ships if s != self.player_ships[1].ship_type]
-            wing_ship2 = Player(self.resource_loader, random.choice(remaining_ships))
+            wing_ship2 = Player(self.resource_loader, rng.gameplay.choice(remaining_ships))
             wing_ship2.rect.centerx = main_ship.rect.centerx + self.ship_spacing
             wing_ship2.rect.bottom = main_ship.rect.bottom
             # 僚机使用与主机相同的武器
@@ -1202,6 +1497,8 @@ class Game:
         for ship in self.player_ships:
             self.all_sprites.add(ship)
             ship.enemies = self.enemies  # 为导弹追踪设置敌人列表
+            ship.world = self.world
+            ship.controls = self.controls
             
         cprint(f"Formation updated: {len(self.player_ships)} ships", "cyan")
 
@@ -1252,17 +1549,11 @@ class Game:
         # 设置无敌状态
         for ship in self.player_ships:
             ship.is_invulnerable = True
-            ship.invulnerable_timer = pygame.time.get_ticks()
+            ship.invulnerable_timer = game_clock.get_ticks()
             
-        # 清除所有敌人和子弹
+        # 清除所有敌人（已发射的子弹不再属于敌人，不会击中玩家），新的一波由self.director安排
         for enemy in self.enemies:
             enemy.kill()
-        for enemy_bullet in [bullet for enemy in self.enemies for bullet in enemy.bullets]:
-            enemy_bullet.kill()
-        
-        # 重新生成敌人
-        for _ in range(4):
-            self.spawn_enemy()
     
     def apply_power_up(self, ship, power_type):
         """Apply power-up effects to the ship"""
@@ -1270,12 +1561,17 @@ class Game:
             ship.shield = 50
             cprint("Shield power-up activated!", "cyan")
         elif power_type == 'speed':
-            ship.speed_x *= 1.5
-            ship.speed_y *= 1.5
-            # Reset speed after duration
-            pygame.time.set_timer(pygame.USEREVENT + 1, PowerUp.TYPES['speed']['duration'])
+            # Reset speed after duration (only extend the timer if already boosted)
+            if ship.power_up_timers['speed'] == 0:
+                ship.speed_x *= 1.5
+                ship.speed_y *= 1.5
+            ship.power_up_timers['speed'] = game_clock.get_ticks() + PowerUp.TYPES['speed']['duration']
             cprint("Speed boost activated!", "yellow")
         elif power_type == 'weapon':
+            # Already powered up: only extend the duration
+            if ship.power_up_timers['weapon'] > 0:
+                ship.power_up_timers['weapon'] = game_clock.get_ticks() + PowerUp.TYPES['weapon']['duration']
+                return
             # Store current weapon and switch to enhanced version
             ship.previous_weapon = ship.current_weapon
             if ship.current_weapon == 'machine_gun':
@@ -1288,66 +1584,63 @@ class Game:
             elif ship.current_weapon == 'missile':
                 ship.weapons['missile'].damage *= 1.5
             # Reset weapon after duration
-            pygame.time.set_timer(pygame.USEREVENT + 2, PowerUp.TYPES['weapon']['duration'])
+            ship.power_up_timers['weapon'] = game_clock.get_ticks() + PowerUp.TYPES['weapon']['duration']
             cprint("Weapon power-up activated!", "magenta")
 
 
     def check_collisions(self):
         """检查所有碰撞"""
-        # 检查子弹与敌人的碰撞
-        for ship in self.player_ships:
-            for bullet in ship.bullets:
-                hits = pygame.sprite.spritecollide(bullet, self.enemies, False, 
-                                                 pygame.sprite.collide_circle)
-                for enemy in hits:
-                    if enemy.take_damage(bullet.damage):
-                        # 生成道具的概率
-                        if random.random() < self.power_up_spawn_chance:
-                            power_type = random.choice(['shield', 'speed', 'weapon'])
-                            power_up = PowerUp(enemy.rect.centerx, enemy.rect.centery, power_type)
-                            self.power_ups.add(power_up)
-                            self.all_sprites.add(power_up)
-                            self.debug_print(f"生成了 {power_type} 道具!", "cyan")
-                        
-                        # 添加屏幕震动效果
-                        shake_intensity = 10 if enemy.enemy_type == 'boss' else 5
-                        self.screen_shake.start_shake(shake_intensity, 250)
-                        
-                        # 处理红十字敌人的治疗效果
-                        if enemy.enemy_type == 'redcross':
-                            heal_amount = enemy.design['heal_amount']
-                            # 治疗编队中的所有飞船
-                            for player_ship in self.player_ships:
-                                player_ship.health = min(player_ship.max_health, 
-                                                       player_ship.health + heal_amount)
-                            self.debug_print(f"从红十字敌人获得了 {heal_amount} 点治疗!", "green")
-                            self.last_health_check = (self.player_ships[0].health / self.player_ships[0].max_health) * 100
-                        else:
-                            self.score += enemy.points
-                            self.round_score += enemy.points
-                            
-                            # 如果击败了Boss，触发下一轮
-                            if enemy.enemy_type == 'boss':
-                                self.round_transition = True
-                                continue
+        # 检查子弹与敌人的碰撞（所有子弹与所有敌人一次性检测，见projectiles.collide）
+        for bullet, hits in projectiles.collide(self.world, self.enemies):
+            for enemy in hits:
+                if enemy not in self.enemies:  # 已被之前的子弹击毁
+                    continue
+                if enemy.take_damage(bullet.damage):
+                    # 生成道具的概率
+                    if rng.gameplay.random() < self.power_up_spawn_chance:
+                        power_type = rng.gameplay.choice(['shield', 'speed', 'weapon'])
+                        power_up = PowerUp(enemy.rect.centerx, enemy.rect.centery, power_type)
+                        self.power_ups.add(power_up)
+                        self.all_sprites.add(power_up)
+                        self.debug_print(f"生成了 {power_type} 道具!", "cyan")
+                    
+                    # 添加屏幕震动效果
+                    shake_intensity = 10 if enemy.enemy_type == 'boss' else 5
+                    self.screen_shake.start_shake(shake_intensity, 250)
+                    
+                    # 处理红十字敌人的治疗效果
+                    if enemy.enemy_type == 'redcross':
+                        heal_amount = enemy.design['heal_amount']
+                        # 治疗编队中的所有飞船
+                        for player_ship in self.player_ships:
+                            player_ship.health = min(player_ship.max_health, 
+                                                   player_ship.health + heal_amount)
+                        self.debug_print(f"从红十字敌人获得了 {heal_amount} 点治疗!", "green")
+                        self.last_health_check = (self.player_ships[0].health / self.player_ships[0].max_health) * 100
+                    else:
+                        self.score += enemy.points
+                        self.round_score += enemy.points
                         
-                        # 创建爆炸效果
-                        explosion = Explosion(enemy.rect.center, 
-                                           60 if enemy.enemy_type == 'boss' else 
-                                           40 if enemy.enemy_type == 'elite' else 
-                                           30 if enemy.enemy_type == 'bomber' else 
-                                           20, 
-                                           self.particles)
-                        enemy.kill()
-                        if enemy.enemy_type not in ['boss', 'redcross']:
-                            self.spawn_enemy()
-                        self.debug_print(f"击毁了{enemy.enemy_type}敌人！得分：{enemy.points}", "yellow")
-                    # 如果不是激光，子弹在命中后消失
-                    if bullet.weapon_type != 'laser':
-                        bullet.kill()
-                        # 创建小爆炸效果
-                        explosion = Explosion(bullet.rect.center, 10, self.particles)
-        
+                        # 如果击败了Boss，触发下一轮
+                        if enemy.enemy_type == 'boss':
+                            self.round_transition = True
+                            continue
+                    
+                    # 创建爆炸效果
+                    explosion = Explosion(enemy.rect.center, 
+                                       60 if enemy.enemy_type == 'boss' else 
+                                       40 if enemy.enemy_type == 'elite' else 
+                                       30 if enemy.enemy_type == 'bomber' else 
+                                       20, 
+                                       self.particles)
+                    enemy.kill()
+                    self.debug_print(f"击毁了{enemy.enemy_type}敌人！得分：{enemy.points}", "yellow")
+                # 如果不是激光，子弹在命中后消失
+                if not bullet.pierce:
+                    bullet.kill()
+                    # 创建小爆炸效果
+                    explosion = Explosion(bullet.center, 10, self.particles)
+    
         # 检查玩家与敌人的碰撞
         for ship in self.player_ships:
             hits = pygame.sprite.spritecollide(ship, self.enemies, False,
@@ -1377,8 +1670,6 @@ class Game:
                                        20, 
                                        self.particles)
                     enemy.kill()
-                    if enemy.enemy_type != 'boss':
-                        self.spawn_enemy()
                 
                 # 添加屏幕震动效果
                 self.screen_shake.start_shake(10, 250)
@@ -1405,18 +1696,82 @@ class Game:
         for ship in self.player_ships:
             hits = pygame.sprite.spritecollide(ship, self.power_ups, True)
             for power_up in hits:
-                self.apply_power_up(power_up.type, ship)
+                self.apply_power_up(ship, power_up.type)
                 # Add collection particles
                 for _ in range(10):
-                    particle = Particle(power_up.rect.centerx, power_up.rect.centery,
+                    particle = particle_pool.acquire(power_up.rect.centerx, power_up.rect.centery,
                                      power_up.config['color'],
-                                     random.uniform(-2, 2),
-                                     random.uniform(-2, 2))
+                                     rng.cosmetic.uniform(-2, 2),
+                                     rng.cosmetic.uniform(-2, 2))
                     self.particles.add(particle)
-                    self.all_sprites.add(particle)
 
-def main():
-    game = Game()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument('--headless', action='store_true',
+                        help='run the simulation without a window or audio, as fast as possible')
+    parser.add_argument('--render', action='store_true',
+                        help='headless: still draw every tick to an offscreen surface')
+    parser.add_argument('--ticks', type=int, default=None,
+                        help='headless: number of simulation ticks to run (default: 3600 = 60s of play, '
+                             'or the whole replay)')
+    parser.add_argument('--ship', default='interceptor', choices=list(Player.SHIP_DESIGNS.keys()),
+                        help='headless or bot: ship type')
+    parser.add_argument('--formation', type=int, default=1, choices=[1, 2, 3],
+                        help='headless or bot: formation size')
+    parser.add_argument('--bot', action='store_true',
+                        help='let the autopilot play instead of the keyboard (starts a game right away)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='random seed (default: SEED env var, or a new seed per game)')
+    parser.add_argument('--record', metavar='PATH',
+                        help='record the input of each game to a replay file')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='play back a replay file headless at maximum speed')
+    parser.add_argument('--seek', type=int, metavar='TICK',
+                        help='replay: jump to TICK (via the nearest keyframe) and render that frame')
+    parser.add_argument('--screenshot', metavar='PATH',
+                        help='seek: image file for the rendered frame (default: replay_tick_TICK.png)')
+    args = parser.parse_args(argv)
+    if args.bot and args.replay:
+        parser.error('--bot cannot be combined with --replay')
+    
+    if args.replay and args.seek is not None:
+        game = Game(headless=True, render=True)
+        replay = Replay.load(args.replay)
+        start = time.perf_counter()
+        game.play_replay(replay, args.seek)
+        elapsed = time.perf_counter() - start
+        game.draw()
+        path = args.screenshot or f"replay_tick_{game.replay_tick}.png"
+        pygame.image.save(game.renderer.screen, path)
+        keyframe = replay.keyframe_before(args.seek)
+        cprint(f"定位到第 {game.replay_tick} 步（关键帧 {keyframe[0] if keyframe else 0}），用时 {elapsed:.2f}s，"
+               f"第 {game.current_round} 关, 得分 {game.score}，画面已保存: {path}", "green")
+        pygame.quit()
+        return
+    
+    if args.headless or args.replay:
+        game = Game(headless=True, render=args.render, seed=args.seed, record_path=args.record)
+        if args.replay:
+            game.play_replay(Replay.load(args.replay))
+            max_ticks = args.ticks
+        else:
+            game.start_game(args.ship, args.formation)
+            if args.bot:
+                game.input_frames = Bot(game)
+            max_ticks = args.ticks if args.ticks is not None else 3600
+        start = time.perf_counter()
+        ticks = game.run_headless(max_ticks)
+        elapsed = time.perf_counter() - start
+        game.stop_recording()
+        cprint(f"无头模式: {ticks} ticks, {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s), "
+               f"第 {game.current_round} 关, 得分 {game.score}, 种子 {game.seed}", "green")
+        pygame.quit()
+        return
+    
+    game = Game(seed=args.seed, record_path=args.record)
+    if args.bot:
+        game.start_game(args.ship, args.formation)
+        game.input_frames = Bot(game)
     game.run()
 
 if __name__ == "__main__":
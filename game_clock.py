@@ -0,0 +1,70 @@
+import math
+import pygame
+
+# 当前由Game安装的模拟时钟；未安装时回退到pygame的实时时钟
+_active_clock = None
+
+
+def get_ticks():
+    """Return the current simulation time in milliseconds.
+
+    Sprites read time through this instead of pygame.time.get_ticks(), so timers
+    stop while the game is paused and follow the simulation when it runs
+    faster or slower than real time.
+    """
+    if _active_clock is None:
+        return pygame.time.get_ticks()
+    return _active_clock.now
+
+
+class GameClock:
+    """Simulation clock owned by Game, advanced once per fixed simulation tick"""
+
+    def __init__(self, step_ms, time_scale=1.0):
+        self.step_ms = step_ms
+        self.time = 0.0
+        self.tick_count = 0
+        self.paused = False
+        self.time_scale = 1.0
+        self.set_time_scale(time_scale)
+
+    @property
+    def now(self):
+        """Simulation time in whole milliseconds"""
+        return int(self.time)
+
+    @property
+    def unbounded(self):
+        """True when fast-forwarding as fast as the CPU allows"""
+        return math.isinf(self.time_scale)
+
+    def install(self):
+        """Make this the clock returned by game_clock.get_ticks()"""
+        global _active_clock
+        _active_clock = self
+        return self
+
+    def reset(self):
+        self.time = 0.0
+        self.tick_count = 0
+        self.paused = False
+
+    def advance(self):
+        """Advance by one simulation tick (no-op while paused)"""
+        if self.paused:
+            return
+        self.time += self.step_ms
+        self.tick_count += 1
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def set_time_scale(self, scale):
+        """Set simulated time per real time: 0.5 is slow motion, 4 is 4x, inf is unbounded fast-forward"""
+        scale = float(scale)
+        if scale <= 0 or math.isnan(scale):
+            raise ValueError(f"time scale must be positive, got {scale}")
+        self.time_scale = scale
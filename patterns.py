@@ -0,0 +1,162 @@
+"""Boss bullet patterns as data: declarative volleys compiled to direction tables.
+
+A Pattern describes one volley of a boss attack (how many bullets, over which
+arc, how fast, in how many rings, how the volley turns over time) instead of
+a hand-written loop of cos/sin calls. Each pattern precomputes its table of
+unit directions when it is created; firing only rotates the table by the
+volley's heading and scales it by the speed profile, for all bullets at once,
+and the shooter adds the whole volley to its bullet list in one batch.
+
+Angles are in degrees, 0 pointing right and 90 straight down (screen y grows
+downwards). Speeds are the pattern speeds enemy_bullets.spawn() takes.
+"""
+import math
+import numpy as np
+import rng
+
+# 随机方向弹幕用的整数角度方向表（0..360度）
+DEGREES = np.radians(np.arange(361))
+DEGREE_DIRECTIONS = np.stack([np.cos(DEGREES), np.sin(DEGREES)], axis=1)
+# 随机子弹颜色的各通道取值范围
+RANDOM_COLOR = ((200, 255), (0, 100), (0, 255))
+
+
+class Pattern:
+    """One boss attack: the bullets of a volley and where they fly.
+
+    count bullets are spread over arc degrees around heading: a full circle
+    (arc=360) puts them 360/count apart starting at heading, a smaller arc
+    spreads them evenly from one end of the arc to the other, centered on
+    heading. heading is 'aim' to center the volley on the player. spin turns
+    the heading by that many degrees per second of game time (spirals).
+
+    speed is one speed or a profile cycled over the bullets; speed_range
+    draws a random speed per bullet instead, and scatter sends each bullet
+    in a random whole-degree direction. rings fires every direction once per
+    ring, starting that far from the origin. row fires one bullet every row
+    pixels across the shooter's width, straight down.
+
+    origin is 'center' or 'bottom' of the shooter. damage multiplies the
+    shooter's bullet damage; color is 'phase', 'design', 'random' or an RGB
+    tuple. flash particles are left per bullet at its start, in flash_color
+    (None: the bullet's color), moving at flash_speed times the bullet's
+    velocity or, with flash_jitter=(x, y), at a random velocity up to x, y.
+    """
+
+    def __init__(self, name, count=1, arc=360, heading=0, spin=0, speed=4, speed_range=None,
+                 scatter=False, rings=(0,), row=None, origin='center', damage=1, color='phase', size=6,
+                 flash=0, flash_color=None, flash_speed=0.5, flash_jitter=None, message='', message_color='white'):
+        self.name = name
+        self.count = count
+        self.arc = arc
+        self.heading = heading
+        self.spin = spin
+        self.speed_range = speed_range
+        self.scatter = scatter
+        self.row = row
+        self.origin = origin
+        self.damage = damage
+        self.color = color
+        self.size = size
+        self.flash = flash
+        self.flash_color = flash_color
+        self.flash_speed = flash_speed
+        self.flash_jitter = flash_jitter
+        self.message = message
+        self.message_color = message_color
+        self.rings = np.asarray(rings, dtype=np.float64)
+        self.speeds = np.resize(np.asarray(speed, dtype=np.float64), count)  # 每个方向的速度
+        self.directions = self.compile()
+
+    def compile(self):
+        """Return the unit direction of every bullet relative to the heading, shape (count, 2)
+
+        None for scattered and row patterns, whose directions are not fixed.
+        """
+        if self.scatter or self.row:
+            return None  # 方向在发射时决定
+        if self.arc >= 360:
+            angles = np.arange(self.count) * (360 / self.count)
+        elif self.count > 1:
+            angles = -self.arc / 2 + np.arange(self.count) * (self.arc / (self.count - 1))
+        else:
+            angles = np.zeros(1)
+        radians = np.radians(angles)
+        return np.stack([np.cos(radians), np.sin(radians)], axis=1)
+
+    def aim(self, shooter, now):
+        """Return the volley's heading in degrees"""
+        heading = self.heading
+        if heading == 'aim':
+            player = getattr(shooter, 'player', None)
+            if player is None:
+                heading = 90
+            else:
+                heading = math.degrees(math.atan2(player.rect.centery - shooter.rect.centery,
+                                                  player.rect.centerx - shooter.rect.centerx))
+        if self.spin:
+            heading += (now * self.spin / 1000) % 360
+        return heading
+
+    def volley(self, shooter, now):
+        """Return x, y, vx, vy arrays with the start and velocity of every bullet of one volley"""
+        rect = shooter.rect
+        origin_y = rect.centery if self.origin == 'center' else rect.bottom
+        if self.row:
+            x = np.arange(rect.left + 10, rect.right - 10, self.row, dtype=np.float64)
+            return x, np.full(len(x), float(origin_y)), np.zeros(len(x)), np.full(len(x), self.speeds[0])
+        if self.scatter:
+            # 与逐个创建子弹时相同的随机数顺序：每颗子弹先取角度再取速度
+            draws = [(rng.gameplay.randint(0, 360), rng.gameplay.uniform(*self.speed_range))
+                     for _ in range(self.count)]
+            directions = DEGREE_DIRECTIONS[[angle for angle, _ in draws]]
+            speeds = np.array([speed for _, speed in draws])
+        else:
+            angle = math.radians(self.aim(shooter, now))
+            cos, sin = math.cos(angle), math.sin(angle)
+            base_x, base_y = self.directions[:, 0], self.directions[:, 1]
+            directions = np.stack([base_x * cos - base_y * sin, base_x * sin + base_y * cos], axis=1)
+            speeds = self.speeds
+        # 每个方向依次发射各圈子弹
+        dx = np.repeat(directions[:, 0], len(self.rings))
+        dy = np.repeat(directions[:, 1], len(self.rings))
+        offsets = np.tile(self.rings, len(directions))
+        speeds = np.repeat(speeds, len(self.rings))
+        return rect.centerx + dx * offsets, origin_y + dy * offsets, dx * speeds, dy * speeds
+
+    def colors(self, shooter, count):
+        """Return the color of every bullet of a volley of count bullets"""
+        if self.color == 'random':
+            return [tuple(rng.cosmetic.randint(*channel) for channel in RANDOM_COLOR) for _ in range(count)]
+        if self.color == 'phase':
+            color = shooter.current_phase['color']
+        elif self.color == 'design':
+            color = shooter.design['color']
+        else:
+            color = self.color
+        return [color] * count
+
+
+PATTERNS = {pattern.name: pattern for pattern in (
+    # 伞形弹幕：全圈12发
+    Pattern('umbrella', count=12, speed=4, message="Boss: 雨伞模式攻击！", message_color='yellow'),
+    # 散射弹幕：朝玩家60度扇形5发
+    Pattern('spread', count=5, arc=60, heading='aim', speed=5, origin='bottom', damage=0.8,
+            message="Boss: 散射攻击！", message_color='cyan'),
+    # 激光弹幕：沿Boss宽度每20像素一发，向下
+    Pattern('laser_barrage', row=20, speed=6, origin='bottom', damage=1.2, size=4,
+            flash=2, flash_color=(0, 200, 255), flash_jitter=(0.5, 1),
+            message="Boss: 激光弹幕！", message_color='blue'),
+    # 十字火力：四个斜向，每个方向三发排成一列
+    Pattern('cross_fire', count=4, heading=45, speed=4 * math.sqrt(2), rings=(0, 20 * math.sqrt(2), 40 * math.sqrt(2)),
+            message="Boss: 十字火力攻击！", message_color='red'),
+    # 螺旋弹幕：三发，每秒转10度
+    Pattern('spiral', count=3, spin=10, speed=5, color='design', message="Boss: 螺旋攻击！", message_color='magenta'),
+    # 死亡螺旋：八发，每秒转10度
+    Pattern('death_spiral', count=8, spin=10, speed=4, damage=1.2, color=(255, 0, 128),
+            flash=1, flash_color=(255, 100, 200), flash_speed=0.5,
+            message="Boss: 死亡螺旋攻击！", message_color='magenta'),
+    # 地狱弹幕：12发随机方向和速度，随机颜色
+    Pattern('bullet_hell', count=12, scatter=True, speed_range=(3, 6), color='random',
+            flash=1, flash_speed=0.3, message="Boss: 弹幕地狱模式！", message_color='white'),
+)}
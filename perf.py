@@ -0,0 +1,80 @@
+import time
+
+
+def percentile(values, p):
+    """Return the p-th percentile (0-100) of values using the nearest-rank method"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(p / 100 * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def summarize(values):
+    """Return mean/p50/p95/p99/max of a list of milliseconds, rounded for reports"""
+    if not values:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'mean': round(sum(values) / len(values), 4),
+        'p50': round(percentile(values, 50), 4),
+        'p95': round(percentile(values, 95), 4),
+        'p99': round(percentile(values, 99), 4),
+        'max': round(max(values), 4),
+    }
+
+
+class NullProfiler:
+    """Default profiler of the game: every call is a no-op"""
+
+    def begin_frame(self):
+        pass
+
+    def lap(self, name):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+class FrameProfiler:
+    """Measures frame times and how they split into game systems.
+
+    The game calls lap(name) after each system; the time since the previous
+    lap (or since begin_frame) is booked to that system for the current frame.
+    """
+
+    def __init__(self):
+        self.frames = []  # 每帧总耗时（毫秒）
+        self.samples = []  # 每帧各系统耗时 {系统名: 毫秒}
+        self._current = {}
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def begin_frame(self):
+        self._current = {}
+        self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        frame = (now - self._frame_start) * 1000
+        # 最后一次lap之后的时间（以及提前返回跳过的系统）计入other
+        self._current['other'] = frame - sum(self._current.values())
+        self.frames.append(frame)
+        self.samples.append(self._current)
+
+    def report(self):
+        """Return frame time statistics and a per-system breakdown as a JSON-serializable dict"""
+        names = sorted({name for sample in self.samples for name in sample})
+        total = sum(self.frames) or 1.0
+        systems = {}
+        for name in names:
+            values = [sample.get(name, 0.0) for sample in self.samples]
+            stats = summarize(values)
+            stats['share'] = round(sum(values) / total, 4)
+            systems[name] = stats
+        return {'frames': len(self.frames), 'frame_ms': summarize(self.frames), 'systems': systems}
@@ -0,0 +1,83 @@
+"""Free lists for short-lived sprites (particles).
+
+A pooled class keeps its constructor arguments in reset(...), so a dead
+instance can be re-initialized instead of allocating a new sprite (and its
+particle group and image). Sprites are handed back with release(), normally
+from their kill(); released sprites only become available again after
+flush(), which the game calls at the end of every tick, so code that still
+looks at a sprite it just killed in the same tick never sees it reused.
+"""
+
+# 所有对象池，按创建顺序
+_pools = []
+
+
+class Pool:
+    """Reusable instances of one sprite class"""
+
+    def __init__(self, cls, name, template=()):
+        self.cls = cls
+        self.name = name
+        self.template = template  # 预热时构造对象用的参数
+        self.free = []
+        self.pending = []  # 本步释放的对象，flush()后才能复用
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self.high_water = 0
+        cls.pool = self
+        _pools.append(self)
+
+    def prewarm(self, count):
+        """Make sure at least count instances are ready to be acquired"""
+        while len(self.free) < count:
+            self.free.append(self.cls(*self.template))
+            self.created += 1
+
+    def acquire(self, *args, **kwargs):
+        """Return an instance initialized with the constructor arguments"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.pending.append(obj)
+        self.in_use -= 1
+
+    def flush(self):
+        """Make the sprites released since the last flush available again"""
+        if self.pending:
+            self.free.extend(self.pending)
+            self.pending.clear()
+
+    def reset_stats(self):
+        """Start counting afresh, e.g. when a new game drops all live sprites"""
+        self.created = self.reused = self.in_use = self.high_water = 0
+
+    def stats(self):
+        return {'created': self.created, 'reused': self.reused, 'in_use': self.in_use,
+                'high_water': self.high_water, 'free': len(self.free) + len(self.pending)}
+
+
+def flush():
+    """Flush every pool (called once per simulation tick)"""
+    for pool in _pools:
+        pool.flush()
+
+
+def reset_stats():
+    for pool in _pools:
+        pool.reset_stats()
+
+
+def stats():
+    """Return {pool name: statistics} for every pool"""
+    return {pool.name: pool.stats() for pool in _pools}
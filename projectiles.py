@@ -0,0 +1,350 @@
+"""Player bullets as ECS entities (see ecs.py): one archetype per weapon type and the systems that move them.
+
+Every bullet is a row in one of three tables: plain bullets, piercing
+bullets (laser) and homing missiles. The systems update whole columns at a
+time: movement is one vectorized step for all bullets, collision testing
+checks every bullet against every enemy in one pass, missile steering
+turns all missiles at once, and only the rare trail particles loop in
+Python.
+"""
+import functools
+import math
+import numpy as np
+import pygame
+import game_clock
+import rng
+from ecs import Bundle, Component, World
+from entities import particle_pool
+
+NAN = float('nan')
+
+POSITION = Component('position', x=0.0, y=0.0)
+VELOCITY = Component('velocity', vx=0.0, vy=0.0)
+# 与pygame.Rect相同的整数矩形；prev_left/prev_top是上一个模拟步的位置（NaN表示新生成），用于插值渲染
+BODY = Component('body', left=0, top=0, width=0, height=0, radius=0.0, prev_left=NAN, prev_top=NAN, image=None)
+# born是生成时的模拟时间，lifetime是最长存活时间（ms），超时后由despawn.Despawner移除
+PROJECTILE = Component('projectile', weapon_type='', damage=0, owner=None, born=0, lifetime=3000)
+TRAIL = Component('trail', trail_color=(255, 0, 0), last_particle=0, particle_delay=50)
+PIERCE = Component('pierce')  # 命中后不消失（激光）
+# 速度为每步位移。子弹原来每步更新两次，数值按两次更新换算：速度和加速度加倍，
+# 转向合成两次转向（每次转过剩余角度差的 0.15 * 0.8）
+HOMING = Component('homing', target=None, enemies=None, angle=0.0, turn_speed=(1 - (1 - 0.15 * 0.8) ** 2) / 0.8,
+                   max_speed=24.0, acceleration=0.6, current_speed=16.0, curve_factor=0.8, trail_positions=None)
+
+BULLET = (POSITION, VELOCITY, BODY, PROJECTILE, TRAIL)
+
+@functools.lru_cache(maxsize=None)
+def bullet_image(weapon_type):
+    """Return the shared image of a player bullet of the given weapon type"""
+    if weapon_type == 'machine_gun':  # 机枪，双发子弹
+        image = pygame.Surface((6, 12), pygame.SRCALPHA)
+        # 子弹主体
+        pygame.draw.rect(image, (255, 255, 0), [1, 0, 4, 10])
+        # 发光效果
+        pygame.draw.circle(image, (255, 255, 200), (3, 3), 2)
+    elif weapon_type == 'laser':  # 激光，穿透性
+        image = pygame.Surface((6, 25), pygame.SRCALPHA)
+        # 激光主体
+        pygame.draw.rect(image, (0, 255, 255), [1, 0, 4, 25])
+        # 发光核心
+        pygame.draw.rect(image, (200, 255, 255), [2, 5, 2, 15])
+    elif weapon_type == 'beam':  # 连续激光线
+        image = pygame.Surface((4, 35), pygame.SRCALPHA)
+        # 激光线主体
+        pygame.draw.rect(image, (255, 0, 255), [0, 0, 4, 35])
+        # 发光效果
+        pygame.draw.rect(image, (255, 200, 255), [1, 5, 2, 25])
+    elif weapon_type == 'cannon':  # 炮弹，大伤害
+        image = pygame.Surface((14, 14), pygame.SRCALPHA)
+        # 炮弹主体
+        pygame.draw.circle(image, (255, 100, 0), (7, 7), 6)
+        # 发光核心
+        pygame.draw.circle(image, (255, 200, 100), (7, 7), 3)
+    elif weapon_type == 'shotgun':  # 散弹
+        image = pygame.Surface((8, 20), pygame.SRCALPHA)
+        # 散弹主体
+        pygame.draw.polygon(image, (255, 50, 50), 
+                          [(4, 0), (0, 20), (8, 20)])
+        # 发光效果
+        pygame.draw.polygon(image, (255, 200, 200),
+                          [(4, 5), (2, 15), (6, 15)])
+    else:  # missile，追踪导弹
+        image = pygame.Surface((10, 25), pygame.SRCALPHA)
+        # 导弹主体（更大）
+        pygame.draw.polygon(image, (255, 0, 0), 
+                          [(5, 0), (0, 25), (10, 25)])
+        # 发光效果
+        pygame.draw.polygon(image, (255, 150, 150),
+                          [(5, 5), (3, 20), (7, 20)])
+        # 尾焰效果
+        pygame.draw.polygon(image, (255, 255, 0),
+                          [(5, 20), (2, 25), (8, 25)])
+    return image
+
+
+class ProjectileArchetype:
+    """Everything the bullets of one weapon type share, built once at startup (a flyweight).
+
+    The bundle holds the bullets' components and the default of every field,
+    image, size, speed and damage included, so spawning a bullet only adds
+    its position, owner and times to one copy of the defaults. volley is the
+    (x offset, angle) of every bullet of one shot, spread how much the angle
+    turns into sideways speed and flash_color the color of the muzzle flash.
+    Archetypes are immutable and their image must not be drawn on.
+    """
+    __slots__ = ('weapon_type', 'bundle', 'image', 'width', 'height', 'speed', 'damage', 'pierce', 'homing',
+                 'trail_color', 'spread', 'volley', 'flash_color')
+
+    def __init__(self, weapon_type, components, speed, damage, volley, flash_color, spread=0, **fields):
+        image = bullet_image(weapon_type)
+        width, height = image.get_size()
+        bundle = Bundle(weapon_type, components, weapon_type=weapon_type, vy=speed, damage=damage,
+                        image=image, width=width, height=height, radius=width // 2, **fields)
+        values = dict(weapon_type=weapon_type, bundle=bundle, image=image, width=width, height=height,
+                      speed=speed, damage=damage, pierce=PIERCE in bundle.components,
+                      homing=HOMING in bundle.components, trail_color=bundle.defaults['trail_color'],
+                      spread=spread, volley=volley, flash_color=flash_color)
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ProjectileArchetype is immutable (cannot set {name})")
+
+
+# 各武器的子弹；速度为每步位移（负数向上）
+PROJECTILES = {projectile.weapon_type: projectile for projectile in (
+    ProjectileArchetype('machine_gun', BULLET, speed=-16.0, damage=8, spread=4, trail_color=(255, 255, 100),
+                        volley=((-10, -5), (10, 5)), flash_color=(255, 255, 0)),  # 机枪，双发子弹
+    ProjectileArchetype('laser', BULLET + (PIERCE,), speed=-30.0, damage=15, lifetime=2000,
+                        trail_color=(100, 255, 255), volley=((0, 0),), flash_color=(0, 255, 255)),  # 激光，穿透性
+    ProjectileArchetype('beam', BULLET, speed=-50.0, damage=12, spread=3, lifetime=1000,
+                        volley=((0, -5), (0, 0), (0, 5)), flash_color=(255, 0, 255)),  # 连续激光线
+    ProjectileArchetype('cannon', BULLET, speed=-12.0, damage=40, trail_color=(255, 150, 50),
+                        volley=((0, 0),), flash_color=(255, 100, 0)),  # 炮弹，大伤害
+    ProjectileArchetype('shotgun', BULLET, speed=-14.0, damage=25, spread=6, trail_color=(255, 100, 100),
+                        volley=tuple((0, angle) for angle in (-30, -15, 0, 15, 30)),
+                        flash_color=(255, 50, 50)),  # 散弹
+    # 追踪导弹，六枚并排；绕着目标打转时靠存活时间移除
+    ProjectileArchetype('missile', BULLET + (HOMING,), speed=-16.0, damage=30, lifetime=5000,
+                        volley=tuple(((i - 2.5) * 8, 0) for i in range(6)), flash_color=(255, 0, 0)),
+)}
+
+
+def round_half_away(values):
+    """Round like pygame.Rect does when a float is assigned to it (halves away from zero)"""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+def create_world(capacity=64):
+    """Return a World with a table for every bullet type and the bullet systems registered"""
+    world = World()
+    for projectile in PROJECTILES.values():
+        world.register(projectile.bundle, capacity)
+    world.add_system('bullet_homing', steer_missiles, HOMING)
+    world.add_system('bullet_movement', move, POSITION, VELOCITY, BODY)
+    world.add_system('bullet_trails', emit_trails, BODY, TRAIL)
+    world.particles = None  # 拖尾粒子加入的列表，由Game设置
+    return world
+
+
+def spawn_bullet(world, x, y, weapon_type, angle=0, owner=None, target=None, enemies=None, damage=None):
+    """Spawn a player bullet centered on x with its bottom at y; return (table, row)
+
+    target and enemies are the missile's first target and the group it picks
+    new targets from; damage (default: the archetype's) is the firing weapon's
+    current damage, raised by weapon power-ups.
+    """
+    projectile = PROJECTILES.get(weapon_type, PROJECTILES['missile'])
+    x, y = float(x), float(y)
+    # 与pygame.Rect一样取整：rect.centerx = x; rect.bottom = y（int()向零截断，同round_half_away）
+    now = game_clock.get_ticks()
+    values = dict(x=x, y=y, left=int(x + math.copysign(0.5, x)) - projectile.width // 2,
+                  top=int(y + math.copysign(0.5, y)) - projectile.height, owner=owner,
+                  born=now, last_particle=now)
+    if damage is not None:
+        values['damage'] = damage
+    if projectile.spread:
+        values['vx'] = math.sin(math.radians(angle)) * projectile.spread
+    if projectile.homing:
+        values.update(target=target, enemies=enemies, trail_positions=[])
+    return world.spawn(projectile.bundle, **values)
+
+
+def steer_missiles(world, table):
+    """Turn every missile towards its target in one vectorized step (picking the nearest enemy when it has none)
+
+    The targets are looked up in one array of enemy positions: the enemies
+    of every missile's group plus targets that are in none of them.
+    """
+    count = len(table)
+    if not count:
+        return
+    targets = table['target']
+    groups = table['enemies']
+    index = {}  # 敌人 -> 在位置数组中的下标
+    members = {}  # id(敌人组) -> 组内敌人的下标，按组的遍历顺序
+    for key, group in {id(group): group for group in groups if group is not None}.items():
+        members[key] = [index.setdefault(enemy, len(index)) for enemy in group.sprites()]
+    enemies = list(index)
+    slot = []  # 每枚导弹的目标下标，-1表示没有目标
+    lost = {}  # id(敌人组) -> 需要新目标的导弹
+    for row, target in enumerate(targets):
+        if target is not None and target.alive():
+            j = index.get(target)
+            if j is None:
+                j = index[target] = len(enemies)
+                enemies.append(target)
+        else:
+            j = -1
+            if members.get(id(groups[row])):
+                lost.setdefault(id(groups[row]), []).append(row)
+        slot.append(j)
+    if not enemies:
+        return
+    slot = np.array(slot)
+    enemy_x = np.array([enemy.rect.centerx for enemy in enemies], dtype=np.float64)
+    enemy_y = np.array([enemy.rect.centery for enemy in enemies], dtype=np.float64)
+    centers_x = table['left'] + table['width'] // 2
+    centers_y = table['top'] + table['height'] // 2
+
+    # 如果目标不存在或已死亡，寻找最近的敌人作为新目标（距离相同时取组中靠前的）
+    for key, rows in lost.items():
+        candidates = np.array(members[key])
+        distance = np.sqrt((enemy_x[candidates] - centers_x[rows, None]) ** 2
+                           + (enemy_y[candidates] - centers_y[rows, None]) ** 2)
+        nearest = candidates[distance.argmin(axis=1)]
+        slot[rows] = nearest
+        for row, j in zip(rows, nearest.tolist()):
+            targets[row] = enemies[j]
+
+    # 曲线飞行追踪：对所有导弹一起计算，只写回有目标且不在目标中心的导弹
+    dx = enemy_x[slot] - centers_x
+    dy = enemy_y[slot] - centers_y
+    distance = np.sqrt(dx * dx + dy * dy)
+    steer = (slot >= 0) & (distance > 0)
+    vx, vy = table['vx'], table['vy']
+    current_angle = np.arctan2(vy, vx)
+    # 处理角度差，确保选择最短路径
+    angle_diff = np.arctan2(dy, dx) - current_angle
+    angle_diff -= (angle_diff > math.pi) * (2 * math.pi)
+    angle_diff += (angle_diff < -math.pi) * (2 * math.pi)
+    # 逐渐调整角度（曲线效果）
+    new_angle = current_angle + angle_diff * (table['turn_speed'] * table['curve_factor'])
+    np.copyto(table['angle'], new_angle, where=steer)
+    # 接近目标时加速
+    speed = table['current_speed']
+    np.copyto(speed, np.minimum(speed + table['acceleration'], table['max_speed']), where=steer & (distance < 100))
+    np.copyto(vx, np.cos(new_angle) * speed, where=steer)
+    np.copyto(vy, np.sin(new_angle) * speed, where=steer)
+    # 记录轨迹位置（用于绘制轨迹）
+    trails = table['trail_positions']
+    rows = np.flatnonzero(steer)
+    for row, cx, cy in zip(rows.tolist(), centers_x[rows].tolist(), centers_y[rows].tolist()):
+        trail = trails[row]
+        trail.append((cx, cy))
+        if len(trail) > 8:
+            trail.pop(0)
+
+
+def move(world, table):
+    x, y = table['x'], table['y']
+    x += table['vx']
+    y += table['vy']
+    table['left'][:] = round_half_away(x)
+    table['top'][:] = round_half_away(y)
+
+
+def emit_trails(world, table):
+    """Leave a trail particle behind every bullet whose particle delay has passed"""
+    now = game_clock.get_ticks()
+    last = table['last_particle']
+    due = np.flatnonzero(now - last > table['particle_delay'])
+    if not due.size:
+        return
+    colors = table['trail_color']
+    centers_x = (table['left'] + table['width'] // 2)[due].tolist()
+    bottoms = (table['top'] + table['height'])[due].tolist()
+    for row, x, y in zip(due.tolist(), centers_x, bottoms):
+        particle = particle_pool.acquire(x, y, colors[row], rng.cosmetic.uniform(-0.5, 0.5),
+                                         rng.cosmetic.uniform(0.5, 1.5), size=2)
+        world.particles.add(particle)
+    last[due] = now
+
+
+class Hit:
+    """A player bullet that overlaps enemies, handed to Game.check_collisions"""
+    __slots__ = ('center', 'damage', 'pierce', '_dead', '_row')
+
+    def __init__(self, center, damage, pierce, dead, row):
+        self.center = center
+        self.damage = damage
+        self.pierce = pierce
+        self._dead = dead
+        self._row = row
+
+    def kill(self):
+        """Remove the bullet once the hits of its table have been handled"""
+        self._dead[self._row] = True
+
+
+def collide(world, enemies):
+    """Yield (hit, enemies it overlaps) for every player bullet touching an enemy
+
+    All bullets of a table are tested against all enemies in one pass, with
+    the same test as pygame.sprite.collide_circle. Hit enemies are listed in
+    group order; the caller skips the ones it has killed in the meantime.
+    Enemies spawned while hits are handled are tested from the next step on.
+    """
+    targets = enemies.sprites()
+    if not targets:
+        return
+    enemy_x = np.array([enemy.rect.centerx for enemy in targets], dtype=np.float64)
+    enemy_y = np.array([enemy.rect.centery for enemy in targets], dtype=np.float64)
+    enemy_radius = np.array([enemy.radius for enemy in targets], dtype=np.float64)
+    for table in world.query(PROJECTILE, BODY):
+        count = len(table)
+        if not count:
+            continue
+        centers_x = table['left'] + table['width'] // 2
+        centers_y = table['top'] + table['height'] // 2
+        dx = centers_x[:, None] - enemy_x
+        dy = centers_y[:, None] - enemy_y
+        reach = table['radius'][:, None] + enemy_radius
+        overlaps = dx * dx + dy * dy < reach * reach
+        rows = np.flatnonzero(overlaps.any(axis=1))
+        if not rows.size:
+            continue
+        dead = np.zeros(count, dtype=bool)
+        pierce = table.has(PIERCE)
+        damage = table['damage']
+        try:
+            for row in rows.tolist():
+                hit = Hit((int(centers_x[row]), int(centers_y[row])), int(damage[row]), pierce, dead, row)
+                yield hit, [targets[j] for j in np.flatnonzero(overlaps[row]).tolist()]
+        finally:
+            table.compact(~dead)
+
+
+def save_positions(world):
+    """Remember where every bullet is before a simulation step, for render interpolation"""
+    for table in world.query(BODY):
+        table['prev_left'][:] = table['left']
+        table['prev_top'][:] = table['top']
+
+
+def draw_list(world):
+    """Return (images, left, top, dx, dy, trails) for every table of bullets, one batch per table
+
+    left/top are the integer rects, dx/dy (arrays) the movement since the last
+    saved positions (0 for new bullets); trails is the list of missile
+    trails, None for tables without them.
+    """
+    batches = []
+    for table in world.query(BODY):
+        if not len(table):
+            continue
+        left, top = table['left'], table['top']
+        batches.append((table['image'], left, top, np.nan_to_num(left - table['prev_left']),
+                        np.nan_to_num(top - table['prev_top']),
+                        table['trail_positions'] if table.has(HOMING) else None))
+    return batches
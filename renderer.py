@@ -0,0 +1,400 @@
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pygame
+from termcolor import cprint
+from entities import Particle
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+MISSILE_TRAIL_COLOR = (255, 100, 100)
+
+# 两个模拟状态之间位移超过该值视为瞬移（如敌人重生），不做插值
+MAX_INTERPOLATION_DISTANCE = 64
+
+# 缓存的HUD文字数量（分数等变化的文字按最近使用淘汰）
+TEXT_CACHE_SIZE = 256
+
+
+def interpolated_topleft(sprite, previous, alpha):
+    """Return the sprite's top-left corner blended between the previous and current tick.
+
+    previous maps sprites to their rect.center before the last simulation tick;
+    alpha is how far (0..1) the render time is past that tick.
+    """
+    rect = sprite.rect
+    prev = previous.get(sprite) if previous else None
+    if prev is None:
+        return rect.topleft
+    cx, cy = rect.center
+    return blend(rect.x, rect.y, cx - prev[0], cy - prev[1], alpha)
+
+
+def blend(x, y, dx, dy, alpha):
+    """Return (x, y) moved back by (1 - alpha) of the last tick's movement (dx, dy)"""
+    if abs(dx) > MAX_INTERPOLATION_DISTANCE or abs(dy) > MAX_INTERPOLATION_DISTANCE:
+        return x, y
+    # 在上一帧与当前帧之间插值（保持当前尺寸，避免旋转精灵抖动）
+    t = alpha - 1.0
+    return x + dx * t, y + dy * t
+
+
+def blend_columns(x, y, dx, dy, alpha):
+    """blend() for arrays of positions and movements"""
+    t = alpha - 1.0
+    smooth = (np.abs(dx) <= MAX_INTERPOLATION_DISTANCE) & (np.abs(dy) <= MAX_INTERPOLATION_DISTANCE)
+    return x + np.where(smooth, dx * t, 0.0), y + np.where(smooth, dy * t, 0.0)
+
+
+class TextCache:
+    """LRU cache of rendered HUD strings keyed by (font, text, color)"""
+
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = font.render(text, True, color)
+            if len(self.surfaces) > self.size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+class SurfaceRenderer:
+    """Draws the world layer (stars, ships, bullets, particles) with Surface.blit.
+
+    With a render scale below 1.0 the world is drawn into a smaller back buffer
+    and upscaled with pygame.transform.scale; the HUD is drawn afterwards by
+    the game directly on the display surface, so text stays at native resolution.
+    """
+    MIN_SCALE = 0.25
+    backend = 'surface'
+
+    def __init__(self, width, height, scale=1.0, caption="Space Shooter", vsync=False, offscreen=False):
+        self.width = width
+        self.height = height
+        self.scale = max(self.MIN_SCALE, min(1.0, float(scale)))
+        self.offscreen = offscreen
+
+        # 显示窗口，HUD和菜单直接绘制在上面（垂直同步需要SCALED模式）
+        # 离屏模式（无头运行）只绘制到内存中的Surface，不创建窗口
+        self.vsync = False
+        if offscreen:
+            self.screen = pygame.Surface((width, height))
+        elif vsync:
+            try:
+                self.screen = pygame.display.set_mode((width, height), pygame.SCALED, vsync=1)
+                self.vsync = True
+            except pygame.error as e:
+                cprint(f"无法开启垂直同步: {e}", "yellow")
+        if not offscreen and not self.vsync:
+            self.screen = pygame.display.set_mode((width, height))
+        if not offscreen:
+            pygame.display.set_caption(caption)
+
+        # 世界层后备缓冲区（按内部渲染比例缩小）
+        self.buffer_size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+        self.buffer = pygame.Surface(self.buffer_size)
+        self.upscaled = pygame.Surface((width, height)) if self.scale < 1.0 else None
+
+        # 缩放后的精灵图像缓存，原图像被回收时自动失效
+        self._scaled_images = weakref.WeakKeyDictionary()
+        self.text_cache = TextCache()
+
+    def begin_frame(self, overlay=False):
+        """Clear the display and return the surface the HUD and menus are drawn on"""
+        self.screen.fill(BLACK)
+        return self.screen
+
+    def present(self):
+        if not self.offscreen:
+            pygame.display.flip()
+
+    def text(self, font, text, color):
+        """Return the rendered (antialiased) text, cached until it changes"""
+        return self.text_cache.render(font, text, color)
+
+    def draw_rect(self, surface, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(surface, color, rect, width, border_radius=border_radius)
+
+    def draw_line(self, surface, color, start, end, width=1):
+        pygame.draw.line(surface, color, start, end, width)
+
+    def blit_scaled(self, surface, image, rect, alpha=255):
+        """Blit the image resized to rect with the given surface alpha"""
+        image = image.copy()
+        image.set_alpha(alpha)
+        surface.blit(pygame.transform.scale(image, rect.size), rect)
+
+    def scaled(self, image):
+        """Return the image resized to the internal render scale (cached)"""
+        if self.upscaled is None:
+            return image
+        cached = self._scaled_images.get(image)
+        if cached is None:
+            width, height = image.get_size()
+            cached = pygame.transform.scale(image, (max(1, round(width * self.scale)),
+                                                    max(1, round(height * self.scale))))
+            self._scaled_images[image] = cached
+        return cached
+
+    def blit(self, image, pos):
+        """Blit an image at native world coordinates onto the back buffer"""
+        s = self.scale
+        self.buffer.blit(self.scaled(image), (int(pos[0] * s), int(pos[1] * s)))
+
+    def draw_trail(self, trail):
+        """绘制导弹轨迹"""
+        s = self.scale
+        if len(trail) > 1:
+            width = max(1, round(2 * s))
+            for i in range(1, len(trail)):
+                start_x, start_y = trail[i-1]
+                end_x, end_y = trail[i]
+                pygame.draw.line(self.buffer, MISSILE_TRAIL_COLOR,
+                                 (start_x * s, start_y * s), (end_x * s, end_y * s), width)
+
+    def draw_world(self, surface, stars, sprites, bullets, offset=(0, 0), previous=None, alpha=1.0):
+        """Draw the world layer and present it on the target surface at the given shake offset.
+
+        previous/alpha interpolate sprite positions between the last two simulation ticks;
+        bullets is projectiles.draw_list() of the player and enemy bullets.
+        """
+        s = self.scale
+        self.buffer.fill(BLACK)
+
+        # Draw background stars
+        for x, y, _ in stars:
+            pygame.draw.circle(self.buffer, WHITE, (int(x * s), int(y * s)), 1)
+
+        # 先绘制非子弹对象
+        for sprite in sprites:
+            self.blit(sprite.image, interpolated_topleft(sprite, previous, alpha))
+
+        # 然后绘制子弹：每个表格先画导弹轨迹，再一次blits画出所有子弹
+        for images, x, y, dx, dy, trails in bullets:
+            if trails is not None:
+                for trail in trails:
+                    self.draw_trail(trail)
+            x, y = blend_columns(x, y, dx, dy, alpha)
+            # 与int()一样向零取整
+            positions = zip((x * s).astype(np.int64).tolist(), (y * s).astype(np.int64).tolist())
+            self.buffer.blits(zip(map(self.scaled, images), positions), False)
+
+        if self.upscaled is None:
+            surface.blit(self.buffer, offset)
+        else:
+            pygame.transform.scale(self.buffer, (self.width, self.height), self.upscaled)
+            surface.blit(self.upscaled, offset)
+
+
+class TextureRenderer:
+    """Draws the world layer with pygame._sdl2.video textures.
+
+    Sprite surfaces are uploaded once and drawn with Texture.draw, particles are
+    filled rects and nothing is blitted on the CPU. The in-game HUD is drawn through
+    a TextureCanvas from cached text and panel textures; only the menus, whose art is
+    drawn with pygame.draw, still go through an overlay surface streamed per frame.
+    Works with SDL's software renderer, no GPU required.
+    """
+    MIN_SCALE = SurfaceRenderer.MIN_SCALE
+    backend = 'texture'
+
+    def __init__(self, width, height, scale=1.0, caption="Space Shooter", vsync=False, hidden=False):
+        from pygame._sdl2 import video
+
+        self.width = width
+        self.height = height
+        self.scale = max(self.MIN_SCALE, min(1.0, float(scale)))
+
+        # hidden：不显示窗口（无头基准测试），渲染路径与正常窗口相同
+        self.window = video.Window(caption, (width, height), hidden=hidden)
+        self.renderer = video.Renderer(self.window, vsync=vsync)
+        self.renderer.draw_blend_mode = pygame.BLENDMODE_BLEND
+        self.vsync = vsync
+
+        # 游戏内HUD直接画纹理；菜单覆盖层在CPU上绘制，只在菜单界面每帧上传
+        self.canvas = TextureCanvas(self)
+        self.screen = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.overlay = video.Texture(self.renderer, (width, height), streaming=True)
+        self.overlay.blend_mode = pygame.BLENDMODE_BLEND
+        self.overlay_active = False
+        self.text_cache = TextCache()
+
+        # 低分辨率渲染目标
+        self.buffer_size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+        self.world_target = None
+        if self.scale < 1.0:
+            self.world_target = video.Texture(self.renderer, self.buffer_size, target=True)
+
+        # 每个精灵Surface只上传一次纹理，Surface被回收时纹理随之释放
+        self._textures = weakref.WeakKeyDictionary()
+        self._texture_from_surface = video.Texture.from_surface
+
+        star = pygame.Surface((3, 3), pygame.SRCALPHA)
+        pygame.draw.circle(star, WHITE, (1, 1), 1)
+        self.star_texture = self.texture(star)
+
+        cprint("使用SDL2纹理渲染器", "green")
+
+    def begin_frame(self, overlay=False):
+        """Clear the window and return what the HUD and menus are drawn on
+
+        overlay=True returns the CPU overlay surface (menus drawn with pygame.draw),
+        otherwise the TextureCanvas that draws straight into the window.
+        """
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self.overlay_active = overlay
+        if overlay:
+            self.screen.fill((0, 0, 0, 0))
+            return self.screen
+        return self.canvas
+
+    def present(self):
+        if self.overlay_active:
+            self.overlay.update(self.screen)
+            self.overlay.draw()
+        self.renderer.present()
+
+    def texture(self, image):
+        """Return the texture for a sprite surface, uploading it on first use"""
+        texture = self._textures.get(image)
+        if texture is None:
+            texture = self._texture_from_surface(self.renderer, image)
+            self._textures[image] = texture
+        return texture
+
+    def text(self, font, text, color):
+        """Return the rendered text; its texture is uploaded again only when the text changes"""
+        return self.text_cache.render(font, text, color)
+
+    def draw_rect(self, surface, color, rect, width=0, border_radius=0):
+        """pygame.draw.rect() into the window (corners are not rounded)"""
+        if surface is not self.canvas:
+            pygame.draw.rect(surface, color, rect, width, border_radius=border_radius)
+            return
+        renderer = self.renderer
+        renderer.draw_color = (*color, 255)[:4]
+        rect = pygame.Rect(rect)
+        if width <= 0:
+            renderer.fill_rect(rect)
+        else:
+            for i in range(width):
+                renderer.draw_rect(rect.inflate(-2 * i, -2 * i))
+
+    def draw_line(self, surface, color, start, end, width=1):
+        if surface is not self.canvas:
+            pygame.draw.line(surface, color, start, end, width)
+            return
+        self.renderer.draw_color = (*color, 255)[:4]
+        self.renderer.draw_line(start, end)
+
+    def blit_scaled(self, surface, image, rect, alpha=255):
+        """Draw the image's texture stretched to rect with the given alpha"""
+        if surface is not self.canvas:
+            SurfaceRenderer.blit_scaled(self, surface, image, rect, alpha)
+            return
+        texture = self.texture(image)
+        texture.alpha = alpha
+        texture.draw(dstrect=rect)
+
+    def draw_world(self, surface, stars, sprites, bullets, offset=(0, 0), previous=None, alpha=1.0):
+        """Draw the world layer directly into the window at the given shake offset"""
+        renderer = self.renderer
+        s = self.scale
+        if self.world_target is not None:
+            renderer.target = self.world_target
+            renderer.draw_color = (0, 0, 0, 255)
+            renderer.clear()
+            ox, oy = 0, 0
+        else:
+            ox, oy = int(offset[0]), int(offset[1])
+
+        # Draw background stars
+        star_texture = self.star_texture
+        for x, y, _ in stars:
+            star_texture.draw(dstrect=(int(x * s) + ox - 1, int(y * s) + oy - 1, 3, 3))
+
+        # 先绘制非子弹对象，粒子直接填充矩形
+        for sprite in sprites:
+            rect = sprite.rect
+            x, y = interpolated_topleft(sprite, previous, alpha)
+            if isinstance(sprite, Particle):
+                renderer.draw_color = (*sprite.color, 255)[:4]
+                renderer.fill_rect((int(x * s) + ox, int(y * s) + oy,
+                                    max(1, round(rect.width * s)), max(1, round(rect.height * s))))
+            else:
+                self.texture(sprite.image).draw(dstrect=(int(x * s) + ox, int(y * s) + oy,
+                                                         round(rect.width * s), round(rect.height * s)))
+
+        # 然后绘制子弹（显示导弹轨迹）
+        for images, x, y, dx, dy, trails in bullets:
+            for trail in trails or ():
+                if len(trail) > 1:
+                    renderer.draw_color = (*MISSILE_TRAIL_COLOR, 255)
+                    for i in range(1, len(trail)):
+                        start_x, start_y = trail[i-1]
+                        end_x, end_y = trail[i]
+                        renderer.draw_line((start_x * s + ox, start_y * s + oy), (end_x * s + ox, end_y * s + oy))
+            x, y = blend_columns(x, y, dx, dy, alpha)
+            for image, left, top in zip(images, (x * s).astype(np.int64).tolist(), (y * s).astype(np.int64).tolist()):
+                width, height = image.get_size()
+                self.texture(image).draw(dstrect=(left + ox, top + oy, round(width * s), round(height * s)))
+
+        if self.world_target is not None:
+            renderer.target = None
+            self.world_target.draw(dstrect=(int(offset[0]), int(offset[1]), self.width, self.height))
+
+
+class TextureCanvas:
+    """The surface-like target a TextureRenderer hands to the in-game HUD.
+
+    blit() draws the image's cached texture into the window, honouring the
+    surface alpha, so static panels and unchanged text are never uploaded again.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    def get_size(self):
+        return self.owner.width, self.owner.height
+
+    def get_width(self):
+        return self.owner.width
+
+    def get_height(self):
+        return self.owner.height
+
+    def blit(self, image, dest, area=None):
+        texture = self.owner.texture(image)
+        alpha = image.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+        x, y = dest[0], dest[1]
+        if area is None:
+            width, height = image.get_size()
+            texture.draw(dstrect=(x, y, width, height))
+        else:
+            area = pygame.Rect(area)
+            texture.draw(srcrect=area, dstrect=(x, y, area.width, area.height))
+
+
+def create_renderer(backend, width, height, scale=1.0, caption="Space Shooter", vsync=False, offscreen=False):
+    """Create the renderer for the configured backend ('surface' or 'texture')
+
+    offscreen (headless runs) renders into a plain Surface with no window, or for
+    the texture backend into a hidden window.
+    """
+    if backend == 'texture':
+        try:
+            return TextureRenderer(width, height, scale, caption, vsync, hidden=offscreen)
+        except Exception as e:
+            cprint(f"无法创建SDL2纹理渲染器，回退到Surface渲染: {e}", "yellow")
+    return SurfaceRenderer(width, height, scale, caption, vsync, offscreen)
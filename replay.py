@@ -0,0 +1,171 @@
+import bisect
+import struct
+
+# 录像文件格式（小端）：
+#   魔数 b'SSRP' | 格式版本 u8 | 随机种子 u64 | 编队 u8 | 飞船名长度 u8 + ASCII | 总步数 varint
+#   然后是若干段 (重复次数 varint, 输入位 varint)，相邻步输入相同则合并为一段，直到凑满总步数
+#   版本2起：关键帧数量 varint，每个关键帧为 (步数 varint, 长度 varint, 压缩后的游戏状态)
+#   版本3起：格式版本之后是模拟版本 u16
+MAGIC = b'SSRP'
+FORMAT_VERSION = 3
+SUPPORTED_VERSIONS = (1, 2, 3)
+_HEADER = struct.Struct('<4sBQB')
+_SIMULATION = struct.Struct('<H')
+
+# 模拟版本：任何改变游戏逻辑结果的修改（速度、生成规则、随机数的抽取顺序等）都要加1，
+# 旧模拟录制的录像回放时会失去同步，因此拒绝加载（版本3之前的录像视为0）
+SIMULATION_VERSION = 1
+
+
+class ReplayError(Exception):
+    """Raised for files that are not valid replays"""
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    """Return (value, new position)"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated replay")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """A recorded game: the seed and ship it started with plus one input bit mask per tick.
+
+    Keyframes hold the encoded game state after a given number of ticks, so
+    playback can start from the nearest one instead of from the beginning.
+    """
+
+    def __init__(self, seed, ship_type='interceptor', formation_type=1, runs=None,
+                 simulation_version=SIMULATION_VERSION):
+        self.seed = seed
+        self.ship_type = ship_type
+        self.formation_type = formation_type
+        self.simulation_version = simulation_version
+        self.runs = runs if runs is not None else []  # [[重复次数, 输入位], ...]
+        self.keyframes = []  # [(步数, 编码后的状态), ...]，按步数排序
+
+    def __len__(self):
+        return sum(count for count, _ in self.runs)
+
+    def __iter__(self):
+        """Yield the input bits of every tick"""
+        return self.iter_from(0)
+
+    def iter_from(self, tick):
+        """Yield the input bits of every tick starting at the given one"""
+        for count, bits in self.runs:
+            if tick >= count:
+                tick -= count
+                continue
+            for _ in range(count - tick):
+                yield bits
+            tick = 0
+
+    def add_keyframe(self, tick, data):
+        self.keyframes.append((tick, data))
+
+    def keyframe_before(self, tick):
+        """Return the last (tick, data) keyframe at or before tick, or None"""
+        i = bisect.bisect_right([t for t, _ in self.keyframes], tick)
+        return self.keyframes[i - 1] if i else None
+
+    def check_simulation_version(self):
+        """Raise ReplayError if the replay was recorded with a different simulation"""
+        if self.simulation_version != SIMULATION_VERSION:
+            raise ReplayError(f"replay was recorded with simulation version {self.simulation_version}, "
+                              f"this game runs version {SIMULATION_VERSION}; it would desync, re-record it")
+
+    def append(self, bits):
+        if self.runs and self.runs[-1][1] == bits:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, bits])
+
+    def to_bytes(self):
+        ship = self.ship_type.encode('ascii')
+        out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, self.seed, self.formation_type))
+        out += _SIMULATION.pack(self.simulation_version)
+        out.append(len(ship))
+        out += ship
+        write_varint(out, len(self))
+        for count, bits in self.runs:
+            write_varint(out, count)
+            write_varint(out, bits)
+        write_varint(out, len(self.keyframes))
+        for tick, data in self.keyframes:
+            write_varint(out, tick)
+            write_varint(out, len(data))
+            out += data
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay of any supported format (see check_simulation_version)"""
+        if len(data) < _HEADER.size + 1:
+            raise ReplayError("truncated replay")
+        magic, version, seed, formation_type = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version not in SUPPORTED_VERSIONS:
+            raise ReplayError(f"unsupported replay version {version}")
+        pos = _HEADER.size
+        simulation_version = 0
+        if version >= 3:
+            if len(data) < pos + _SIMULATION.size + 1:
+                raise ReplayError("truncated replay")
+            simulation_version, = _SIMULATION.unpack_from(data, pos)
+            pos += _SIMULATION.size
+        length = data[pos]
+        ship_type = data[pos + 1:pos + 1 + length].decode('ascii')
+        pos += 1 + length
+        ticks, pos = read_varint(data, pos)
+        replay = cls(seed, ship_type, formation_type, simulation_version=simulation_version)
+        recorded = 0
+        while recorded < ticks:
+            count, pos = read_varint(data, pos)
+            bits, pos = read_varint(data, pos)
+            replay.runs.append([count, bits])
+            recorded += count
+        if recorded != ticks:
+            raise ReplayError(f"replay has {recorded} ticks, header says {ticks}")
+        if version >= 2:
+            keyframes, pos = read_varint(data, pos)
+            for _ in range(keyframes):
+                tick, pos = read_varint(data, pos)
+                length, pos = read_varint(data, pos)
+                if pos + length > len(data):
+                    raise ReplayError("truncated replay")
+                replay.keyframes.append((tick, bytes(data[pos:pos + length])))
+                pos += length
+        return replay
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Load a replay recorded with this simulation version (ReplayError otherwise)"""
+        with open(path, 'rb') as f:
+            replay = cls.from_bytes(f.read())
+        replay.check_simulation_version()
+        return replay
@@ -0,0 +1,36 @@
+import random
+
+# 影响游戏结果的随机数（敌人生成、移动、Boss攻击、道具掉落）
+gameplay = random.Random()
+# 纯视觉效果的随机数（粒子、星空、屏幕震动），增减粒子不会改变游戏进程
+cosmetic = random.Random()
+
+_seed = 0
+
+
+def new_seed():
+    """Return a fresh random seed (used when none is given on the command line or in SEED)"""
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def get_seed():
+    return _seed
+
+
+def seed(value):
+    """Set the simulation seed and reset both streams to tick 0"""
+    global _seed
+    _seed = int(value)
+    begin_tick(0)
+
+
+def begin_tick(tick):
+    """Reseed both streams for a simulation tick.
+
+    Each stream is derived from (seed, stream, tick) only, so the random numbers a
+    tick sees do not depend on how many were drawn earlier. The same seed and
+    inputs always reproduce the same game, and a saved game state can be resumed
+    without storing the generators' internal state.
+    """
+    gameplay.seed(f"{_seed}:gameplay:{tick}")
+    cosmetic.seed(f"{_seed}:cosmetic:{tick}")
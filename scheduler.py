@@ -0,0 +1,70 @@
+"""Per-tick update order of the game's systems.
+
+The Scheduler runs the game's systems once per simulation tick, phase by
+phase (input, ai, movement, collision, cleanup) and in the order they were
+added within a phase, booking each to its own profiler lap. It is the one
+place that updates entities: sprites, bullet and particle lists and the ECS
+world are each updated by exactly one system, owners no longer update the
+lists they own.
+
+With check=True (CHECK_UPDATES=1) every update is recorded and an entity
+updated a second time in the same tick raises an AssertionError naming both
+systems.
+"""
+import entities
+
+PHASES = ('input', 'ai', 'movement', 'collision', 'cleanup')
+
+
+class Scheduler:
+    """The systems of one game in update order"""
+
+    def __init__(self, check=False):
+        self.phases = {phase: [] for phase in PHASES}
+        self.check = check
+        self.tick = 0
+        self.system = None  # 正在运行的系统
+        self._updated = None  # 检查模式：本步已更新的实体 id -> (系统, 实体)
+
+    def add(self, phase, name, function):
+        """Run function() every tick in the given phase; a system returning True ends the tick
+
+        name is the profiler lap of the system, None for systems that book
+        their own laps.
+        """
+        if phase not in self.phases:
+            raise ValueError(f"unknown phase {phase!r}, expected one of {PHASES}")
+        self.phases[phase].append((name, function))
+
+    def run(self, profiler):
+        """Run every system once"""
+        self.tick += 1
+        if self.check:
+            self._updated = {}
+            entities.update_hook = self.mark
+        try:
+            for phase in PHASES:
+                for name, function in self.phases[phase]:
+                    self.system = name or phase
+                    stop = function()
+                    if name is not None:
+                        profiler.lap(name)
+                    if stop:
+                        return
+        finally:
+            self.system = None
+            if self.check:
+                entities.update_hook = None
+                self._updated = None
+
+    def mark(self, updated):
+        """Record that the running system updates these entities (only in check mode)"""
+        if self._updated is None:
+            return
+        for entity in updated:
+            previous = self._updated.get(id(entity))
+            if previous is not None:
+                raise AssertionError(f"{entity!r} updated twice in tick {self.tick}: "
+                                     f"by {previous[0]} and by {self.system}")
+            # 保留实体的引用，本步内它的 id 不会被新对象复用
+            self._updated[id(entity)] = (self.system, entity)
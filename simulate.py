@@ -0,0 +1,198 @@
+"""Balance and soak simulator for Space Shooter.
+
+Runs many headless games in parallel (one process per core), each with its
+own seed, ship and formation and played by the autopilot, and aggregates how
+long they survive, which rounds they reach, how the score and score_for_boss
+grow and how long frames take into one JSON report.
+
+    python simulate.py --games 16 --ticks 18000
+    python simulate.py --ship guardian --ship striker --formation 1 --formation 3 --output balance.json
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from bot import Bot
+from director import ENEMY_WEIGHTS
+from game import Game, FPS
+from perf import summarize
+from sprites import Enemy, Player
+
+DEFAULT_GAMES = 8
+DEFAULT_TICKS = 18000  # 5分钟游戏时间
+SAMPLE_EVERY = 600  # 得分曲线的采样间隔（步）
+SEED = 1000
+
+
+def round_entry(game, tick):
+    """Describe the round the game has just entered"""
+    # 本关普通敌人按出现权重的平均属性（见 Enemy.archetype_for），不取决于此刻场上有哪些敌人：
+    # 第一波要等回合公告结束后才入场
+    archetypes = [(Enemy.archetype_for(enemy_type, game.current_round), weight)
+                  for enemy_type, weight in ENEMY_WEIGHTS.items()]
+    total = sum(ENEMY_WEIGHTS.values())
+    return {
+        'round': game.current_round,
+        'tick': tick,
+        'score': game.score,
+        'score_for_boss': game.score_for_boss,
+        'lives': game.lives,
+        'enemy_health': round(sum(archetype.health * weight for archetype, weight in archetypes) / total, 1),
+        'enemy_points': round(sum(archetype.points * weight for archetype, weight in archetypes) / total, 1),
+    }
+
+
+def play(seed, ship, formation, max_ticks=DEFAULT_TICKS, sample_every=SAMPLE_EVERY):
+    """Play one bot game and return its statistics (runs in a worker process)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(headless=True, seed=seed)
+        game.start_game(ship, formation)
+        game.input_frames = Bot(game)
+        rounds = [round_entry(game, 0)]
+        bosses = []
+        score_curve = []
+        frame_ms = []
+        ticks = 0
+        while ticks < max_ticks and game.running and game.state != 'game_over':
+            start = time.perf_counter()
+            game.step()
+            frame_ms.append((time.perf_counter() - start) * 1000)
+            ticks += 1
+            if game.current_round != rounds[-1]['round']:
+                rounds.append(round_entry(game, ticks))
+            if game.boss is not None and (not bosses or bosses[-1]['round'] != game.current_round):
+                bosses.append({'round': game.current_round, 'tick': ticks, 'health': game.boss.max_health})
+            if ticks % sample_every == 0:
+                score_curve.append(game.score)
+    return {
+        'seed': seed,
+        'ship': ship,
+        'formation': formation,
+        'ticks': ticks,
+        'survived_s': round(ticks / FPS, 1),
+        'game_over': game.state == 'game_over',
+        'round': game.current_round,
+        'score': game.score,
+        'lives': game.lives,
+        'rounds': rounds,
+        'bosses': bosses,
+        'score_curve': score_curve,
+        'frame_ms': frame_ms,
+    }
+
+
+def jobs(games, ships, formations, seed=SEED):
+    """Return (seed, ship, formation) for each game, cycling through every ship/formation pair"""
+    pairs = itertools.cycle(itertools.product(formations, ships))
+    return [(seed + i, ship, formation) for i, (formation, ship) in zip(range(games), pairs)]
+
+
+def aggregate(results, sample_every=SAMPLE_EVERY):
+    """Combine per-game results into per-(ship, formation) and overall statistics"""
+    groups = {}
+    for result in results:
+        groups.setdefault(f"{result['ship']}/{result['formation']}", []).append(result)
+
+    def describe(runs):
+        length = max(len(run['score_curve']) for run in runs)
+        # 游戏结束后得分不再变化，按最终得分补齐曲线
+        curves = [run['score_curve'] + [run['score']] * (length - len(run['score_curve'])) for run in runs]
+        per_round = {}
+        for run in runs:
+            for entry, following in zip(run['rounds'], run['rounds'][1:] + [None]):
+                stats = per_round.setdefault(entry['round'], {'reached': 0, 'ticks': [], 'lives_lost': []})
+                stats['reached'] += 1
+                stats['score_for_boss'] = entry['score_for_boss']
+                stats['enemy_health'] = entry['enemy_health']
+                stats['enemy_points'] = entry['enemy_points']
+                if following is not None:
+                    stats['ticks'].append(following['tick'] - entry['tick'])
+                    stats['lives_lost'].append(entry['lives'] - following['lives'])
+        for stats in per_round.values():
+            # 通关用时与损失的生命只统计已通过的关卡
+            ticks, lives_lost = stats.pop('ticks'), stats.pop('lives_lost')
+            stats['cleared'] = len(ticks)
+            stats['mean_ticks_to_clear'] = round(statistics.fmean(ticks), 1) if ticks else None
+            stats['mean_lives_lost'] = round(statistics.fmean(lives_lost), 2) if lives_lost else None
+        return {
+            'games': len(runs),
+            'game_overs': sum(run['game_over'] for run in runs),
+            'survived_s': summarize([run['survived_s'] for run in runs]),
+            'round_reached': dict(sorted(Counter(run['round'] for run in runs).items())),
+            'score': summarize([run['score'] for run in runs]),
+            'score_curve': {'every_ticks': sample_every,
+                            'mean': [round(statistics.fmean(values)) for values in zip(*curves)]},
+            'rounds': {str(number): per_round[number] for number in sorted(per_round)},
+            'frame_ms': summarize([ms for run in runs for ms in run['frame_ms']]),
+        }
+
+    return {
+        'overall': describe(results),
+        'groups': {name: describe(runs) for name, runs in sorted(groups.items())},
+    }
+
+
+def run(games=DEFAULT_GAMES, ships=None, formations=(1, 3), max_ticks=DEFAULT_TICKS,
+        workers=None, seed=SEED, sample_every=SAMPLE_EVERY):
+    """Play the games in a process pool and return the JSON report"""
+    ships = ships or list(Player.SHIP_DESIGNS)
+    todo = jobs(games, ships, formations, seed)
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play, job_seed, ship, formation, max_ticks, sample_every)
+                   for job_seed, ship, formation in todo]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"[{len(results)}/{len(todo)}] seed {result['seed']} {result['ship']}/{result['formation']}: "
+                  f"{result['ticks']} ticks, round {result['round']}, score {result['score']}"
+                  + (" (game over)" if result['game_over'] else ''), file=sys.stderr)
+    results.sort(key=lambda result: result['seed'])
+    report = aggregate(results, sample_every)
+    report['meta'] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': workers or os.cpu_count(),
+        'max_ticks': max_ticks,
+        'seed': seed,
+        'wall_s': round(time.perf_counter() - start, 1),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    # 逐局明细不含逐帧耗时，避免报告过大
+    report['games'] = [{key: value for key, value in result.items() if key != 'frame_ms'} for result in results]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter balance and soak simulator")
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help='number of games to play')
+    parser.add_argument('--ticks', type=int, default=DEFAULT_TICKS, help='maximum ticks per game')
+    parser.add_argument('--ship', action='append', choices=list(Player.SHIP_DESIGNS),
+                        help='ship type to play (repeatable, default: all)')
+    parser.add_argument('--formation', action='append', type=int, choices=[1, 2, 3],
+                        help='formation to play (repeatable, default: 1 and 3)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--seed', type=int, default=SEED, help='seed of the first game, the others count up')
+    parser.add_argument('--output', metavar='PATH', help='write the JSON report to a file instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = run(args.games, args.ship, args.formation or (1, 3), args.ticks, args.workers, args.seed)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+import json
+import zlib
+import pygame
+import pool
+import projectiles
+import enemy_bullets
+import enemy_motion
+from entities import EntityList
+from sprites import Player, Enemy, PowerUp
+
+# 关键帧：某个模拟步结束时的完整游戏状态（不含粒子等纯视觉效果），
+# 用于录像快速定位。随机数每步按(种子, 步数)重新播种，因此不需要保存随机数状态。
+SNAPSHOT_VERSION = 8
+
+GAME_FIELDS = ('state', 'score', 'round_score', 'current_round', 'score_for_boss',
+               'boss_spawned', 'showing_round_announcement', 'round_announcement_start',
+               'round_transition', 'lives', 'formation_type', 'selected_ship',
+               'last_health_check', 'seed')
+SHAKE_FIELDS = ('shake_intensity', 'shake_duration', 'shake_timer')
+PLAYER_FIELDS = ('speed_x', 'speed_y', 'health', 'max_health', 'shield', 'is_invulnerable',
+                 'invulnerable_timer', 'current_weapon', 'last_shot', 'beam_active',
+                 'beam_start_time', 'shield_pulse', 'speed_multiplier', 'damage_multiplier',
+                 'power_up_timers')
+ENEMY_FIELDS = ('health', 'max_health', 'shoot_delay',
+                'speed_x', 'speed_y', 'movement_pattern', 'pattern_offset', 'angle',
+                'last_shot', 'spawn_time')
+# 玩家子弹（ECS表格中的列）
+BULLET_FIELDS = ('x', 'y', 'vx', 'vy', 'left', 'top', 'damage', 'born', 'last_particle')
+MISSILE_FIELDS = ('angle', 'turn_speed', 'max_speed', 'acceleration', 'current_speed', 'curve_factor')
+ENEMY_BULLET_FIELDS = ('x', 'y', 'vx', 'vy', 'left', 'top', 'damage', 'born', 'last_glow')
+POWER_UP_FIELDS = ('angle', 'x_speed', 'y_speed', 'last_particle')
+
+
+class SnapshotError(Exception):
+    """Raised for keyframes that cannot be restored"""
+
+
+class _Target:
+    """Stand-in for a sprite that is only referenced for its position (e.g. a dead ship the boss aims at)"""
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+
+
+def _get(obj, fields):
+    return {name: getattr(obj, name) for name in fields}
+
+
+def _set(obj, data, fields):
+    for name in fields:
+        setattr(obj, name, data[name])
+
+
+def _rect(rect):
+    return [rect.x, rect.y, rect.width, rect.height]
+
+
+def _collect(game):
+    """Return the gameplay entities: sprites in update order (all_sprites first, then ones only
+    held by the game)"""
+    entities = [sprite for sprite in game.all_sprites if isinstance(sprite, (Player, Enemy, PowerUp))]
+    in_all_sprites = len(entities)
+    seen = set(entities)
+    owned = [*game.player_ships, *game.enemies, *game.power_ups]
+    if game.boss is not None:
+        owned.append(game.boss)  # 玩家重生时Boss会被移出所有组，但仍被引用
+    owned.extend(enemy for _, enemy in game.director.queue if enemy is not None)  # 预先建造、尚未入场的敌人
+    for sprite in owned:
+        if sprite not in seen:
+            seen.add(sprite)
+            entities.append(sprite)
+    return entities, in_all_sprites
+
+
+def _capture_entity(sprite, index):
+    if isinstance(sprite, Player):
+        data = _get(sprite, PLAYER_FIELDS)
+        data.update(kind='player', ship_type=sprite.ship_type, rect=_rect(sprite.rect),
+                    weapons={name: [w.damage, w.shoot_delay] for name, w in sprite.weapons.items()})
+        if hasattr(sprite, 'previous_weapon'):
+            data['previous_weapon'] = sprite.previous_weapon
+    elif isinstance(sprite, Enemy):
+        data = _get(sprite, ENEMY_FIELDS)
+        data.update(kind='enemy', enemy_type=sprite.enemy_type, round_number=sprite.round_number,
+                    rect=_rect(sprite.rect))
+        if sprite.enemy_type == 'boss':
+            data['phase'] = sprite.phases.index(sprite.current_phase) if sprite.current_phase else None
+            player = getattr(sprite, 'player', None)
+            if player is not None:
+                data['player'] = index[player] if player in index else _rect(player.rect)
+    else:
+        data = _get(sprite, POWER_UP_FIELDS)
+        data.update(kind='power_up', type=sprite.type, rect=_rect(sprite.rect))
+    return data
+
+
+def _capture_bullets(world, index):
+    """Return the player bullets, table by table in row order"""
+    bullets = []
+    for table in world.query(projectiles.PROJECTILE):
+        homing = table.has(projectiles.HOMING)
+        fields = BULLET_FIELDS + MISSILE_FIELDS if homing else BULLET_FIELDS
+        columns = [table[name].tolist() for name in fields]
+        for row in range(len(table)):
+            data = dict(zip(fields, (column[row] for column in columns)))
+            data['weapon_type'] = table['weapon_type'][row]
+            data['owner'] = index.get(table['owner'][row])
+            if homing:
+                target = table['target'][row]
+                data['target'] = index[target] if target is not None and target.alive() and target in index else None
+                data['trail'] = table['trail_positions'][row]
+                data['tracking'] = table['enemies'][row] is not None
+            bullets.append(data)
+    return bullets
+
+
+def _capture_enemy_bullets(world, index):
+    """Return the enemy bullets in row order (bullets of dead enemies have no owner)"""
+    bullets = []
+    for table in world.query(enemy_bullets.HOSTILE):
+        columns = [table[name].tolist() for name in ENEMY_BULLET_FIELDS]
+        for row in range(len(table)):
+            data = dict(zip(ENEMY_BULLET_FIELDS, (column[row] for column in columns)))
+            color, size = enemy_bullets.STYLES[table['style'][row]]
+            data.update(color=color, size=size, owner=index.get(table['owner'][row]))
+            bullets.append(data)
+    return bullets
+
+
+def capture(game):
+    """Return the game state as a JSON-serializable dict"""
+    entities, in_all_sprites = _collect(game)
+    index = {sprite: i for i, sprite in enumerate(entities)}
+    clock = game.game_clock
+    return {
+        'version': SNAPSHOT_VERSION,
+        'game': _get(game, GAME_FIELDS),
+        'clock': [clock.time, clock.tick_count, clock.paused],
+        'shake': _get(game.screen_shake, SHAKE_FIELDS),
+        'entities': [_capture_entity(sprite, index) for sprite in entities],
+        'bullets': _capture_bullets(game.world, index),
+        'enemy_bullets': _capture_enemy_bullets(game.world, index),
+        'all_sprites': in_all_sprites,
+        'players': [index[ship] for ship in game.player_ships],
+        'enemies': [index[enemy] for enemy in game.enemies],
+        'power_ups': [index[power_up] for power_up in game.power_ups],
+        'boss': index[game.boss] if game.boss is not None else None,
+        # 已死亡精灵留下的粒子属于视觉效果，不保存
+        'emitters': [index[emitter] for emitter in game.emitters if emitter in index],
+        'director': {'queue': [[enemy_type, index[enemy] if enemy is not None else None]
+                               for enemy_type, enemy in game.director.queue],
+                     'next_entry': game.director.next_entry},
+    }
+
+
+def _restore_entity(game, data):
+    kind = data['kind']
+    if kind == 'player':
+        sprite = Player(game.resource_loader, data['ship_type'])
+        _set(sprite, data, PLAYER_FIELDS)
+        for name, (damage, shoot_delay) in data['weapons'].items():
+            sprite.weapons[name].damage = damage
+            sprite.weapons[name].shoot_delay = shoot_delay
+        if 'previous_weapon' in data:
+            sprite.previous_weapon = data['previous_weapon']
+        sprite.enemies = game.enemies
+        sprite.world = game.world
+        sprite.controls = game.controls
+    elif kind == 'enemy':
+        sprite = Enemy(data['enemy_type'], data['round_number'])
+        _set(sprite, data, ENEMY_FIELDS)
+        sprite.world = game.world
+        if data['enemy_type'] == 'boss' and data['phase'] is not None:
+            sprite.current_phase = sprite.phases[data['phase']]
+            sprite.redraw_boss()
+        if sprite.angle:
+            sprite.image = pygame.transform.rotate(sprite.original_image, sprite.angle)
+    elif kind == 'power_up':
+        sprite = PowerUp(0, 0, data['type'])
+        _set(sprite, data, POWER_UP_FIELDS)
+        sprite.image = pygame.transform.rotate(sprite.original_image, sprite.angle)
+    else:
+        raise SnapshotError(f"unknown entity kind {kind!r}")
+    sprite.rect = pygame.Rect(data['rect'])
+    return sprite
+
+
+def _restore_bullet(game, data, entities):
+    owner = entities[data['owner']] if data['owner'] is not None else None
+    table, row = projectiles.spawn_bullet(game.world, 0, 0, data['weapon_type'], owner=owner)
+    fields = BULLET_FIELDS
+    if table.has(projectiles.HOMING):
+        fields += MISSILE_FIELDS
+        table['target'][row] = entities[data['target']] if data['target'] is not None else None
+        table['enemies'][row] = game.enemies if data['tracking'] else None
+        table['trail_positions'][row] = [tuple(pos) for pos in data['trail']]
+    for name in fields:
+        table[name][row] = data[name]
+
+
+def _restore_enemy_bullet(game, data, entities):
+    owner = entities[data['owner']] if data['owner'] is not None else None
+    table, row = enemy_bullets.spawn(game.world, 0, 0, 0, 0, data['damage'], data['color'], data['size'], owner)
+    for name in ENEMY_BULLET_FIELDS:
+        table[name][row] = data[name]
+
+
+def restore(game, state):
+    """Replace the running game's state with a captured one (the game must have been started)"""
+    if state.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot version {state.get('version')}")
+    _set(game, state['game'], GAME_FIELDS)
+    clock = game.game_clock
+    clock.time, clock.tick_count, clock.paused = state['clock']
+    _set(game.screen_shake, state['shake'], SHAKE_FIELDS)
+
+    # 粒子属于视觉效果，不保存；定位后从空的粒子组开始
+    pool.reset_stats()
+    game.all_sprites = pygame.sprite.Group()
+    game.enemies = pygame.sprite.Group()
+    game.particles = EntityList()
+    game.power_ups = pygame.sprite.Group()
+    game.world.clear()
+    game.world.particles = game.particles
+    enemy_motion.clear(game.enemy_world)
+    game.previous_positions = {}
+
+    records = state['entities']
+    entities = [_restore_entity(game, data) for data in records]
+    game.all_sprites.add(*entities[:state['all_sprites']])
+    game.player_ships = [entities[i] for i in state['players']]
+    game.enemies.add(*[entities[i] for i in state['enemies']])
+    for enemy in game.enemies:
+        if enemy.enemy_type != 'boss':
+            enemy_motion.add(game.enemy_world, enemy)
+    game.power_ups.add(*[entities[i] for i in state['power_ups']])
+    game.boss = entities[state['boss']] if state['boss'] is not None else None
+    game.emitters = dict.fromkeys(entities[i] for i in state['emitters'])
+    director = state['director']
+    game.director.queue.clear()
+    game.director.queue.extend([enemy_type, entities[i] if i is not None else None]
+                               for enemy_type, i in director['queue'])
+    game.director.next_entry = director['next_entry']
+    for data in state['bullets']:
+        _restore_bullet(game, data, entities)
+    for data in state['enemy_bullets']:
+        _restore_enemy_bullet(game, data, entities)
+
+    # 恢复实体之间的引用
+    for sprite, data in zip(entities, records):
+        if data.get('target') is not None:
+            sprite.target = entities[data['target']]
+        if 'player' in data:
+            player = data['player']
+            sprite.player = entities[player] if isinstance(player, int) else _Target(player)
+
+
+def encode(state):
+    """Serialize a captured state to compact zlib-compressed JSON"""
+    return zlib.compress(json.dumps(state, separators=(',', ':')).encode('utf-8'), 9)
+
+
+def decode(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
@@ -1,9 +1,18 @@
 import pygame
 import math
-import random
+import functools
+import types
+import rng
 from array import array
 from math import sin, pi
 from termcolor import cprint
+import game_clock
+from controls import Controls
+from entities import EntityList, particle_pool
+from projectiles import PROJECTILES, spawn_bullet
+import enemy_bullets
+import enemy_motion
+from patterns import PATTERNS
 
 # Global debug function
 def debug_print(message, color="white"):
@@ -17,30 +26,6 @@ def debug_print(message, color="white"):
         # 如果导入失败，不输出debug信息
         pass
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, x, y, color, speed_x, speed_y, size=3, gravity=0):
-        super().__init__()
-        self.image = pygame.Surface((size, size))
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.x = float(x)
-        self.y = float(y)
-        self.speed_x = speed_x
-        self.speed_y = speed_y
-        self.gravity = gravity
-        self.alpha = 255
-        self.fade_speed = random.randint(5, 10)
-
-    def update(self):
-        self.speed_y += self.gravity
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.rect.x = self.x
-        self.rect.y = self.y
-        self.alpha -= self.fade_speed
-        if self.alpha <= 0:
-            self.kill()
-
 class Explosion(pygame.sprite.Sprite):
     def __init__(self, center, size, particle_group):
         super().__init__()
@@ -48,7 +33,7 @@ class Explosion(pygame.sprite.Sprite):
         self.center = center
         self.particle_group = particle_group
         self.frame = 0
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = game_clock.get_ticks()
         self.frame_rate = 50  # 爆炸动画速度
         
         # 创建一个空的surface作为image属性
@@ -63,55 +48,56 @@ class Explosion(pygame.sprite.Sprite):
         
         # 主爆炸圈
         for angle in range(0, 360, 360 // particle_count):
-            speed = random.uniform(2, 5) * (self.size / 20)
+            speed = rng.cosmetic.uniform(2, 5) * (self.size / 20)
             rad = math.radians(angle)
             speed_x = math.cos(rad) * speed
             speed_y = math.sin(rad) * speed
-            size = random.randint(2, 4) * (self.size / 20)
+            size = rng.cosmetic.randint(2, 4) * (self.size / 20)
             # 橙色到红色的随机颜色
-            color = (random.randint(200, 255), 
-                    random.randint(50, 150), 
+            color = (rng.cosmetic.randint(200, 255), 
+                    rng.cosmetic.randint(50, 150), 
                     0)
-            particle = Particle(self.center[0], self.center[1], 
+            particle = particle_pool.acquire(self.center[0], self.center[1], 
                               color, speed_x, speed_y, size, 0.1)
             self.particle_group.add(particle)
         
         # 火花效果
         spark_count = int(self.size * 0.8)
         for _ in range(spark_count):
-            speed = random.uniform(3, 8) * (self.size / 20)
-            angle = random.uniform(0, 360)
+            speed = rng.cosmetic.uniform(3, 8) * (self.size / 20)
+            angle = rng.cosmetic.uniform(0, 360)
             rad = math.radians(angle)
             speed_x = math.cos(rad) * speed
             speed_y = math.sin(rad) * speed
-            size = random.randint(1, 3) * (self.size / 20)
+            size = rng.cosmetic.randint(1, 3) * (self.size / 20)
             # 明亮的黄色火花
-            color = (255, random.randint(200, 255), 0)
-            particle = Particle(self.center[0], self.center[1], 
+            color = (255, rng.cosmetic.randint(200, 255), 0)
+            particle = particle_pool.acquire(self.center[0], self.center[1], 
                               color, speed_x, speed_y, size, 0.2)
             self.particle_group.add(particle)
         
         # 烟雾效果
         smoke_count = int(self.size * 0.6)
         for _ in range(smoke_count):
-            speed = random.uniform(1, 3) * (self.size / 20)
-            angle = random.uniform(0, 360)
+            speed = rng.cosmetic.uniform(1, 3) * (self.size / 20)
+            angle = rng.cosmetic.uniform(0, 360)
             rad = math.radians(angle)
             speed_x = math.cos(rad) * speed
             speed_y = math.sin(rad) * speed - 1  # 向上飘
-            size = random.randint(3, 6) * (self.size / 20)
+            size = rng.cosmetic.randint(3, 6) * (self.size / 20)
             # 灰色烟雾
-            gray = random.randint(60, 120)
+            gray = rng.cosmetic.randint(60, 120)
             color = (gray, gray, gray)
-            particle = Particle(self.center[0], self.center[1], 
+            particle = particle_pool.acquire(self.center[0], self.center[1], 
                               color, speed_x, speed_y, size, 0.05)
             self.particle_group.add(particle)
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
         if now - self.last_update > self.frame_rate:
             self.kill()  # 爆炸效果完成后移除自身
 
+@functools.lru_cache(maxsize=None)
 def generate_sound(frequency, duration, volume=0.5, sample_rate=44100):
     n_samples = int(duration * sample_rate)
     buf = array('h', [0] * n_samples)
@@ -122,9 +108,12 @@ def generate_sound(frequency, duration, volume=0.5, sample_rate=44100):
     return pygame.mixer.Sound(buf)
 
 class Weapon:
-    def __init__(self, damage, bullet_speed, shoot_delay, bullet_type='normal'):
-        self.damage = damage
-        self.bullet_speed = bullet_speed
+    def __init__(self, bullet_type, shoot_delay):
+        # 伤害和子弹速度取自子弹的原型（见projectiles.PROJECTILES）；
+        # 武器道具会提高damage，发射的子弹带上武器当前的伤害
+        self.projectile = PROJECTILES[bullet_type]
+        self.damage = self.projectile.damage
+        self.bullet_speed = self.projectile.speed
         self.shoot_delay = shoot_delay
         self.bullet_type = bullet_type
         try:
@@ -140,215 +129,6 @@ class Weapon:
             self.sound = None
             cprint(f"Could not generate sound for {bullet_type}", "red")
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, weapon_type='normal', angle=0):
-        super().__init__()
-        self.weapon_type = weapon_type
-        self.angle = angle
-        
-        if weapon_type == 'machine_gun':  # 机枪，双发子弹
-            self.image = pygame.Surface((6, 12), pygame.SRCALPHA)
-            # 子弹主体
-            pygame.draw.rect(self.image, (255, 255, 0), [1, 0, 4, 10])
-            # 发光效果
-            pygame.draw.circle(self.image, (255, 255, 200), (3, 3), 2)
-            self.speed_y = -8
-            self.speed_x = math.sin(math.radians(angle)) * 2
-            self.damage = 8
-            
-        elif weapon_type == 'laser':  # 激光，穿透性
-            self.image = pygame.Surface((6, 25), pygame.SRCALPHA)
-            # 激光主体
-            pygame.draw.rect(self.image, (0, 255, 255), [1, 0, 4, 25])
-            # 发光核心
-            pygame.draw.rect(self.image, (200, 255, 255), [2, 5, 2, 15])
-            self.speed_y = -15
-            self.speed_x = 0
-            self.damage = 15
-            
-        elif weapon_type == 'beam':  # 连续激光线
-            self.image = pygame.Surface((4, 35), pygame.SRCALPHA)
-            # 激光线主体
-            pygame.draw.rect(self.image, (255, 0, 255), [0, 0, 4, 35])
-            # 发光效果
-            pygame.draw.rect(self.image, (255, 200, 255), [1, 5, 2, 25])
-            self.speed_y = -25
-            self.speed_x = math.sin(math.radians(angle)) * 1.5
-            self.damage = 12
-            
-        elif weapon_type == 'cannon':  # 炮弹，大伤害
-            self.image = pygame.Surface((14, 14), pygame.SRCALPHA)
-            # 炮弹主体
-            pygame.draw.circle(self.image, (255, 100, 0), (7, 7), 6)
-            # 发光核心
-            pygame.draw.circle(self.image, (255, 200, 100), (7, 7), 3)
-            self.speed_y = -6
-            self.speed_x = 0
-            self.damage = 40
-            
-        elif weapon_type == 'shotgun':  # 散弹
-            self.image = pygame.Surface((8, 20), pygame.SRCALPHA)
-            # 散弹主体
-            pygame.draw.polygon(self.image, (255, 50, 50), 
-                              [(4, 0), (0, 20), (8, 20)])
-            # 发光效果
-            pygame.draw.polygon(self.image, (255, 200, 200),
-                              [(4, 5), (2, 15), (6, 15)])
-            self.speed_y = -7
-            self.speed_x = math.sin(math.radians(angle)) * 3
-            self.damage = 25
-        
-        else:  # missile，追踪导弹
-            self.image = pygame.Surface((10, 25), pygame.SRCALPHA)
-            # 导弹主体（更大）
-            pygame.draw.polygon(self.image, (255, 0, 0), 
-                              [(5, 0), (0, 25), (10, 25)])
-            # 发光效果
-            pygame.draw.polygon(self.image, (255, 150, 150),
-                              [(5, 5), (3, 20), (7, 20)])
-            # 尾焰效果
-            pygame.draw.polygon(self.image, (255, 255, 0),
-                              [(5, 20), (2, 25), (8, 25)])
-            self.speed_y = -8
-            self.speed_x = 0
-            self.damage = 30
-            self.target = None  # 追踪目标
-            self.turn_speed = 0.15  # 转向速度
-            self.max_speed = 12  # 最大速度
-            self.acceleration = 0.3  # 加速度
-            self.current_speed = 8  # 当前速度
-            # 曲线飞行参数
-            self.curve_factor = 0.8  # 曲线因子
-            self.angle = 0  # 当前角度
-            self.trail_positions = []  # 轨迹位置记录
-            # 确保target属性存在
-            if not hasattr(self, 'target'):
-                self.target = None
-            
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.bottom = y
-        self.radius = self.rect.width // 2
-        self.x = float(x)
-        self.y = float(y)
-        
-        # 添加拖尾粒子效果
-        self.particles = pygame.sprite.Group()
-        self.last_particle = pygame.time.get_ticks()
-        self.particle_delay = 50  # 每50ms添加一个粒子
-
-    def update(self):
-        # 追踪导弹逻辑
-        if self.weapon_type == 'missile' and hasattr(self, 'target'):
-            # 如果目标不存在或已死亡，寻找新目标
-            if self.target is None or not self.target.alive():
-                if hasattr(self, 'enemies') and self.enemies:
-                    # 寻找最近的敌人作为新目标
-                    closest_enemy = None
-                    closest_distance = float('inf')
-                    for enemy in self.enemies:
-                        if enemy.alive():
-                            distance = math.sqrt((enemy.rect.centerx - self.rect.centerx)**2 + 
-                                               (enemy.rect.centery - self.rect.centery)**2)
-                            if distance < closest_distance:
-                                closest_distance = distance
-                                closest_enemy = enemy
-                    self.target = closest_enemy
-            
-            # 如果有目标，曲线飞行追踪
-            if self.target and self.target.alive():
-                target_x = self.target.rect.centerx
-                target_y = self.target.rect.centery
-                
-                # 计算到目标的方向
-                dx = target_x - self.rect.centerx
-                dy = target_y - self.rect.centery
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                if distance > 0:
-                    # 计算目标角度
-                    target_angle = math.atan2(dy, dx)
-                    
-                    # 当前运动角度
-                    current_angle = math.atan2(self.speed_y, self.speed_x)
-                    
-                    # 计算角度差
-                    angle_diff = target_angle - current_angle
-                    
-                    # 处理角度差，确保选择最短路径
-                    if angle_diff > math.pi:
-                        angle_diff -= 2 * math.pi
-                    elif angle_diff < -math.pi:
-                        angle_diff += 2 * math.pi
-                    
-                    # 逐渐调整角度（曲线效果）
-                    self.angle = current_angle + angle_diff * self.turn_speed * self.curve_factor
-                    
-                    # 根据距离调整速度
-                    if distance < 100:  # 接近目标时加速
-                        self.current_speed = min(self.current_speed + self.acceleration, self.max_speed)
-                    
-                    # 更新速度分量
-                    self.speed_x = math.cos(self.angle) * self.current_speed
-                    self.speed_y = math.sin(self.angle) * self.current_speed
-                    
-                    # 记录轨迹位置（用于绘制轨迹）
-                    self.trail_positions.append((self.rect.centerx, self.rect.centery))
-                    if len(self.trail_positions) > 8:  # 保留最近8个位置
-                        self.trail_positions.pop(0)
-        
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.rect.x = self.x
-        self.rect.y = self.y
-        
-        # 更新拖尾粒子
-        now = pygame.time.get_ticks()
-        if now - self.last_particle > self.particle_delay:
-            if self.weapon_type == 'machine_gun':
-                color = (255, 255, 100)
-            elif self.weapon_type == 'laser':
-                color = (100, 255, 255)
-            elif self.weapon_type == 'cannon':
-                color = (255, 150, 50)
-            elif self.weapon_type == 'shotgun':
-                color = (255, 100, 100)
-            else:  # missile
-                color = (255, 0, 0)
-                
-            particle = Particle(self.rect.centerx, self.rect.bottom,
-                              color, random.uniform(-0.5, 0.5), 
-                              random.uniform(0.5, 1.5), size=2)
-            self.particles.add(particle)
-            self.last_particle = now
-        
-        self.particles.update()
-        # 移除消失的粒子
-        for particle in self.particles.copy():
-            if not particle.alive():
-                particle.kill()
-    
-    def draw(self, screen):
-        """绘制子弹和导弹轨迹"""
-        # 绘制导弹轨迹
-        if self.weapon_type == 'missile' and hasattr(self, 'trail_positions') and len(self.trail_positions) > 1:
-            # 绘制轨迹线
-            for i in range(1, len(self.trail_positions)):
-                start_pos = self.trail_positions[i-1]
-                end_pos = self.trail_positions[i]
-                # 轨迹颜色渐变
-                alpha = int(255 * (i / len(self.trail_positions)))
-                color = (255, 100, 100)
-                
-                # 绘制轨迹线
-                pygame.draw.line(screen, color, start_pos, end_pos, 2)
-        
-        # 绘制子弹本体
-        screen.blit(self.image, self.rect)
-        
-        # 绘制粒子效果
-        self.particles.draw(screen)
-
 class Player(pygame.sprite.Sprite):
     SHIP_DESIGNS = {
         'interceptor': {
@@ -425,24 +205,24 @@ class Player(pygame.sprite.Sprite):
         
         # Weapon system
         self.weapons = {
-            'machine_gun': Weapon(8, -12, 150, 'machine_gun'),   # 机枪，快速连发
-            'laser': Weapon(15, -20, 200, 'laser'),    # 激光，穿透
-            'cannon': Weapon(40, -8, 500, 'cannon'),   # 炮弹，大伤害
-            'beam': Weapon(12, -25, 50, 'beam'),  # 连续激光线，快速射击
-            'shotgun': Weapon(25, -10, 400, 'shotgun'), # 散弹，分散
-            'missile': Weapon(30, -15, 600, 'missile') # 导弹，追踪
+            'machine_gun': Weapon('machine_gun', 150),   # 机枪，快速连发
+            'laser': Weapon('laser', 200),    # 激光，穿透
+            'cannon': Weapon('cannon', 500),   # 炮弹，大伤害
+            'beam': Weapon('beam', 50),  # 连续激光线，快速射击
+            'shotgun': Weapon('shotgun', 400), # 散弹，分散
+            'missile': Weapon('missile', 600) # 导弹，追踪
         }
         self.current_weapon = 'machine_gun'
-        self.last_shot = pygame.time.get_ticks()
+        self.last_shot = game_clock.get_ticks()
         
         # Beam weapon specific attributes
         self.beam_active = False
         self.beam_start_time = 0
         self.beam_max_duration = 3000  # 3 seconds maximum
         
-        # Bullets and particles
-        self.bullets = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
+        # Particles; bullets live in the game's ECS world (see projectiles.py), set by Game
+        self.world = None
+        self.particles = EntityList()
         
         # Shield effect
         self.shield_surface = pygame.Surface((70, 70), pygame.SRCALPHA)
@@ -458,21 +238,23 @@ class Player(pygame.sprite.Sprite):
             'speed': 0,
             'weapon': 0
         }
+        
+        # 当前模拟步的输入，由Game设置（键盘、录像或自动驾驶）
+        self.controls = Controls()
 
     def update(self):
-        # Get pressed keys
-        keys = pygame.key.get_pressed()
+        controls = self.controls
         
         # Horizontal movement
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if controls.left:
             self.rect.x -= self.speed_x
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if controls.right:
             self.rect.x += self.speed_x
             
         # Vertical movement
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
+        if controls.up:
             self.rect.y -= self.speed_y
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        if controls.down:
             self.rect.y += self.speed_y
         
         # Keep player on screen with new window size
@@ -485,25 +267,16 @@ class Player(pygame.sprite.Sprite):
         if self.rect.bottom > 768:
             self.rect.bottom = 768
             
-        # Update bullets and particles
-        self.bullets.update()
-        self.particles.update()
-        
-        # Remove bullets that are off screen
-        for bullet in self.bullets:
-            if bullet.rect.bottom < 0:
-                bullet.kill()
-                
         # Check invulnerability
         if self.is_invulnerable:
-            if pygame.time.get_ticks() - self.invulnerable_timer > 1000:
+            if game_clock.get_ticks() - self.invulnerable_timer > 1000:
                 self.is_invulnerable = False
             
         # Engine particles
-        if random.random() < 0.3:
-            speed_x = random.uniform(-1, 1)
-            speed_y = random.uniform(1, 3)
-            particle = Particle(self.rect.centerx, self.rect.bottom,
+        if rng.cosmetic.random() < 0.3:
+            speed_x = rng.cosmetic.uniform(-1, 1)
+            speed_y = rng.cosmetic.uniform(1, 3)
+            particle = particle_pool.acquire(self.rect.centerx, self.rect.bottom,
                               (100, 100, 255), speed_x, speed_y)
             self.particles.add(particle)
         
@@ -522,11 +295,17 @@ class Player(pygame.sprite.Sprite):
                              (35, 35), current_radius, 2)
         
         # Update power-up timers
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         for effect, timer in self.power_up_timers.items():
             if timer > 0 and current_time > timer:
                 self.reset_power_up(effect)
 
+    def kill(self):
+        super().kill()
+        # 飞船被摧毁时它的子弹一起消失
+        if self.world is not None:
+            self.world.despawn('owner', self)
+
     def draw(self, surface):
         # Draw the ship
         surface.blit(self.image, self.rect)
@@ -543,16 +322,18 @@ class Player(pygame.sprite.Sprite):
             self.power_up_timers['speed'] = 0
             cprint("Speed boost expired!", "yellow")
         elif effect == 'weapon':
-            if self.current_weapon == 'machine_gun':
+            # 恢复被强化的武器（玩家可能已切换武器）
+            weapon = getattr(self, 'previous_weapon', self.current_weapon)
+            if weapon == 'machine_gun':
                 self.weapons['machine_gun'].damage /= 2
                 self.weapons['machine_gun'].shoot_delay *= 2
-            else:
-                self.weapons[self.current_weapon].damage /= 1.5
+            elif weapon in ('laser', 'cannon', 'missile'):
+                self.weapons[weapon].damage /= 1.5
             self.power_up_timers['weapon'] = 0
             cprint("Weapon power-up expired!", "magenta")
             
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
         weapon = self.weapons[self.current_weapon]
         if now - self.last_shot > weapon.shoot_delay:
             self.last_shot = now
@@ -560,38 +341,15 @@ class Player(pygame.sprite.Sprite):
             # 播放武器音效
             self.resource_loader.play_weapon_sound(self.current_weapon)
             
-            if self.current_weapon == 'machine_gun':  # 双发子弹
-                bullet1 = Bullet(self.rect.centerx - 10, self.rect.top, self.current_weapon, -5)
-                bullet2 = Bullet(self.rect.centerx + 10, self.rect.top, self.current_weapon, 5)
-                self.bullets.add(bullet1, bullet2)
-                
-            elif self.current_weapon == 'shotgun':  # 散弹
-                angles = [-30, -15, 0, 15, 30]
-                for angle in angles:
-                    bullet = Bullet(self.rect.centerx, self.rect.top, self.current_weapon, angle)
-                    self.bullets.add(bullet)
-            
-            elif self.current_weapon == 'missile':  # 追踪导弹
+            targets = []
+            if self.current_weapon == 'missile':  # 追踪导弹
                 # 获取最多6个不同的敌人作为目标
-                targets = []
                 if hasattr(self, 'enemies') and self.enemies:
                     enemies_list = list(self.enemies)
                     # 按距离排序，优先攻击近距离敌人
                     enemies_list.sort(key=lambda e: math.sqrt((e.rect.centerx - self.rect.centerx)**2 + 
                                                             (e.rect.centery - self.rect.centery)**2))
                     targets = enemies_list[:6]  # 取前6个敌人
-                
-                for i in range(6):  # 发出6个导弹
-                    bullet = Bullet(self.rect.centerx + (i-2.5)*8, self.rect.top, self.current_weapon, 0)
-                    # 为每个导弹分配不同的目标
-                    if i < len(targets):
-                        bullet.target = targets[i]
-                    else:
-                        bullet.target = None
-                    # 设置敌人列表用于重新寻找目标
-                    if hasattr(self, 'enemies'):
-                        bullet.enemies = self.enemies
-                    self.bullets.add(bullet)
             
             elif self.current_weapon == 'beam':  # 连续激光线
                 # Check if beam has been active for too long
@@ -603,29 +361,23 @@ class Player(pygame.sprite.Sprite):
                 if not self.beam_active:
                     self.beam_active = True
                     self.beam_start_time = now
-                
-                angles = [-5, 0, 5]
-                for angle in angles:
-                    bullet = Bullet(self.rect.centerx, self.rect.top, self.current_weapon, angle)
-                    self.bullets.add(bullet)
-                    
-            else:  # 激光和炮弹
-                bullet = Bullet(self.rect.centerx, self.rect.top, self.current_weapon)
-                self.bullets.add(bullet)
+            
+            # 按子弹原型的齐射方式发射（机枪双发、散弹五发、光束三发、导弹六枚）；
+            # 每枚导弹分配不同的目标，并设置敌人列表用于重新寻找目标
+            projectile = weapon.projectile
+            for i, (offset, angle) in enumerate(projectile.volley):
+                spawn_bullet(self.world, self.rect.centerx + offset, self.rect.top, self.current_weapon, angle,
+                             owner=self, target=targets[i] if i < len(targets) else None,
+                             enemies=getattr(self, 'enemies', None), damage=weapon.damage)
             
             # 武器音效已由resource_loader处理
             
             # Add muzzle flash particles
             for _ in range(5):
-                speed_x = random.uniform(-2, 2)
-                speed_y = random.uniform(-2, 0)
-                color = (255, 255, 0) if self.current_weapon == 'machine_gun' else \
-                        (0, 255, 255) if self.current_weapon == 'laser' else \
-                        (255, 100, 0) if self.current_weapon == 'cannon' else \
-                        (255, 50, 50) if self.current_weapon == 'shotgun' else \
-                        (255, 0, 0) if self.current_weapon == 'missile' else \
-                        (255, 0, 255)  # beam
-                particle = Particle(self.rect.centerx, self.rect.top, color, speed_x, speed_y)
+                speed_x = rng.cosmetic.uniform(-2, 2)
+                speed_y = rng.cosmetic.uniform(-2, 0)
+                particle = particle_pool.acquire(self.rect.centerx, self.rect.top, projectile.flash_color,
+                                                 speed_x, speed_y)
                 self.particles.add(particle)
             
             debug_print(f"Player fired a {self.current_weapon}!", "yellow")
@@ -808,56 +560,79 @@ class Player(pygame.sprite.Sprite):
                 # Shield break effect
                 if self.shield <= 0:
                     for _ in range(20):
-                        angle = random.uniform(0, math.pi * 2)
-                        speed = random.uniform(3, 7)
+                        angle = rng.cosmetic.uniform(0, math.pi * 2)
+                        speed = rng.cosmetic.uniform(3, 7)
                         speed_x = math.cos(angle) * speed
                         speed_y = math.sin(angle) * speed
-                        particle = Particle(self.rect.centerx, self.rect.centery,
+                        particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
                                          self.shield_color, speed_x, speed_y, size=3)
                         self.particles.add(particle)
                     self.shield = 0
                 
             self.health -= amount
             self.is_invulnerable = True
-            self.invulnerable_timer = pygame.time.get_ticks()
+            self.invulnerable_timer = game_clock.get_ticks()
             
             # 受伤特效 - 红色碎片
             for _ in range(15):
-                angle = random.uniform(0, math.pi * 2)
-                speed = random.uniform(4, 8)
+                angle = rng.cosmetic.uniform(0, math.pi * 2)
+                speed = rng.cosmetic.uniform(4, 8)
                 speed_x = math.cos(angle) * speed
                 speed_y = math.sin(angle) * speed
-                color = random.choice([
+                color = rng.cosmetic.choice([
                     (255, 0, 0),    # 纯红
                     (255, 100, 0),  # 橙红
                     (255, 50, 50)   # 亮红
                 ])
-                particle = Particle(self.rect.centerx, self.rect.centery,
-                                 color, speed_x, speed_y, size=random.randint(2, 4))
+                particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
+                                 color, speed_x, speed_y, size=rng.cosmetic.randint(2, 4))
                 self.particles.add(particle)
             
             # 受伤特效 - 火花
             for _ in range(8):
-                angle = random.uniform(0, math.pi * 2)
-                speed = random.uniform(2, 5)
+                angle = rng.cosmetic.uniform(0, math.pi * 2)
+                speed = rng.cosmetic.uniform(2, 5)
                 speed_x = math.cos(angle) * speed
                 speed_y = math.sin(angle) * speed
-                particle = Particle(self.rect.centerx, self.rect.centery,
+                particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
                                  (255, 255, 0), speed_x, speed_y, 
                                  size=2, gravity=0.2)
                 self.particles.add(particle)
                 
             # 受伤特效 - 烟雾
             for _ in range(5):
-                angle = random.uniform(0, math.pi * 2)
-                speed = random.uniform(1, 3)
+                angle = rng.cosmetic.uniform(0, math.pi * 2)
+                speed = rng.cosmetic.uniform(1, 3)
                 speed_x = math.cos(angle) * speed
                 speed_y = math.sin(angle) * speed
-                particle = Particle(self.rect.centerx, self.rect.centery,
+                particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
                                  (100, 100, 100), speed_x, speed_y, 
                                  size=5, gravity=-0.1)
                 self.particles.add(particle)
 
+class EnemyArchetype:
+    """What all enemies of one type share in one round: scaled stats, design and ship image.
+
+    Built once per (type, round) by Enemy.archetype_for() and shared by
+    reference (a flyweight), so an Enemy only holds its own health, timers,
+    movement and position. Archetypes are immutable: design is a read-only
+    view, and the image must not be drawn on (tilting makes a new surface).
+    The boss has no shared image, it redraws its own for every phase.
+    """
+    __slots__ = ('enemy_type', 'round_number', 'design', 'health', 'points', 'collision_damage',
+                 'shoot_delay', 'image', 'radius')
+
+    def __init__(self, enemy_type, round_number, design, health, points, collision_damage, shoot_delay, image, radius):
+        values = dict(enemy_type=enemy_type, round_number=round_number, design=types.MappingProxyType(design),
+                      health=health, points=points, collision_damage=collision_damage, shoot_delay=shoot_delay,
+                      image=image, radius=radius)
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"EnemyArchetype is immutable (cannot set {name})")
+
+
 class Enemy(pygame.sprite.Sprite):
     ENEMY_DESIGNS = {
         'scout': {
@@ -1012,14 +787,10 @@ class Enemy(pygame.sprite.Sprite):
         super().__init__()
         self.enemy_type = enemy_type
         self.round_number = round_number
-        self.design = self.ENEMY_DESIGNS[enemy_type].copy()
-        
-        # Initialize core attributes first
-        self.health = self.design['health']
-        self.max_health = self.health
-        self.points = self.design['points']
-        self.collision_damage = self.design.get("collision_damage", 10)  # 默认碰撞伤害为10
-        self.shoot_delay = self.design['shoot_delay'] if 'shoot_delay' in self.design else None
+        # 同类型、同关卡的敌人共享属性和图像（见EnemyArchetype），实例只保存会变化的状态
+        self.archetype = self.archetype_for(enemy_type, round_number)
+        self.health = self.max_health = self.archetype.health
+        self.shoot_delay = self.archetype.shoot_delay
         
         # Initialize boss phase system if this is a boss
         if enemy_type == 'boss':
@@ -1058,102 +829,144 @@ class Enemy(pygame.sprite.Sprite):
             if self.current_phase is None:
                 self.current_phase = sorted_phases[-1]
             
-            # 设置初始属性
-            self.shoot_delay = self.current_phase['shoot_delay']
-            self.speed_x = self.design['speed'] * self.current_phase['speed_multiplier']
-            self.speed_y = self.design['speed'] * self.current_phase['speed_multiplier']
-            
             # 打印Boss初始化信息
             cprint(f"Boss出现了！进入{self.current_phase['name']}", "yellow")
+            
+            # Health bar properties for boss
+            self.health_bar_height = 10
+            self.health_bar_width = 200
+            self.health_bar_surface = pygame.Surface((self.health_bar_width + 4, self.health_bar_height + 4))
+            self.phase_text_surface = pygame.Surface((300, 30), pygame.SRCALPHA)
+            self.phase_text_color = (255, 255, 255)
+            
+            # 重绘Boss精灵（每个Boss有自己的图像，随相位重绘）
+            self.redraw_boss()
+            self.add_engine_effects(self.original_image, 'boss', self.design)
+        else:
+            self.original_image = self.archetype.image
+        
+        self.image = self.original_image
+        self.rect = self.image.get_rect()
+        
+        # Initialize sprite properties
+        self.world = None  # 子弹加入的ECS世界（见enemy_bullets.py），由Game设置
+        self.particles = EntityList()
+        self.last_shot = game_clock.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
+        
+        # Initialize position and movement
+        self.rect.x = rng.gameplay.randint(0, 1024 - self.rect.width)
+        self.rect.y = rng.gameplay.randint(-150, -50) if enemy_type != 'boss' else -100
+        self.speed_y = self.design['speed']
+        self.speed_x = 0
+        
+        # Movement pattern variables
+        self.movement_pattern = 'boss_pattern' if enemy_type == 'boss' else rng.gameplay.choice(['straight', 'zigzag', 'sine'])
+        self.pattern_offset = rng.gameplay.randint(0, 360)
+        self.angle = 0
+        self.motion = None  # 普通敌人移动所在的ECS表格（见enemy_motion.py），由Game加入
+
+    @property
+    def design(self):
+        return self.archetype.design
+
+    @property
+    def points(self):
+        return self.archetype.points
+
+    @property
+    def collision_damage(self):
+        return self.archetype.collision_damage
+
+    @property
+    def radius(self):
+        return self.archetype.radius
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def archetype_for(enemy_type, round_number):
+        """Return the EnemyArchetype of an enemy type in a round, built on first use"""
+        design = Enemy.ENEMY_DESIGNS[enemy_type].copy()
+        health = design['health']
+        points = design['points']
         
         # Scale enemy attributes based on round number
         if round_number > 1 and enemy_type != 'redcross':  # Don't scale healing ships
             scale = 1 + (round_number - 1) * 0.2  # 20% increase per round
-            self.health = int(self.health * scale)
-            self.max_health = self.health
-            self.design['speed'] = self.design['speed'] * (1 + (round_number - 1) * 0.1)  # 10% speed increase
-            self.points = int(self.points * scale)
+            health = int(health * scale)
+            design['speed'] = design['speed'] * (1 + (round_number - 1) * 0.1)  # 10% speed increase
+            points = int(points * scale)
             
             # Scale boss more aggressively
             if enemy_type == 'boss':
-                self.health = int(self.health * (1 + (round_number - 1) * 0.5))  # 50% more health per round
-                self.max_health = self.health
-                if self.shoot_delay:
-                    self.shoot_delay = max(1000, 3000 - (round_number - 1) * 200)  # Shoot faster each round, min 1 second
+                health = int(health * (1 + (round_number - 1) * 0.5))  # 50% more health per round
         
-        # Create the enemy ship surface
-        self.original_image = pygame.Surface(self.design['size'], pygame.SRCALPHA)
-        self.image = self.original_image
-        self.rect = self.image.get_rect()
+        # Shooting delay: 10% faster per round, at least 1.5 seconds (healing ships don't shoot)
+        shoot_delay = design['shoot_delay']
+        if shoot_delay is not None:
+            shoot_delay = max(1500, int(shoot_delay * (0.9 ** (round_number - 1))))
         
-        # Draw enemy ship based on type
-        if enemy_type == 'boss':
-            # 重绘Boss精灵
-            self.redraw_boss()
-        else:
-            # Common measurements
-            width, height = self.design['size']
-            center_x = width // 2
-            center_y = height // 2
-            
-            # Lower wing structures
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
-                (center_x - 30, height - 20), # Right base
-                (center_x - 50, height - 15), # Right tip
-                (center_x - 25, height - 30)  # Right top
-            ])
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
-                (center_x + 30, height - 20), # Left base
-                (center_x + 50, height - 15), # Left tip
-                (center_x + 25, height - 30)  # Left top
-            ])
-            
-            # Advanced weapon systems (visible cannons)
-            pygame.draw.rect(self.original_image, self.design['engine_color'],
-                           [center_x - 25, height - 35, 10, 20])  # Left cannon
-            pygame.draw.rect(self.original_image, self.design['engine_color'],
-                           [center_x + 15, height - 35, 10, 20])  # Right cannon
-            
-            # Central cannon
-            pygame.draw.polygon(self.original_image, self.design['engine_color'], [
-                (center_x - 8, height - 15),
-                (center_x + 8, height - 15),
-                (center_x + 5, height - 5),
-                (center_x - 5, height - 5)
-            ])
-            
-            # Energy core
-            pygame.draw.circle(self.original_image, self.design['core_color'],
-                             (center_x, center_y), 15)
-            pygame.draw.circle(self.original_image, self.design['engine_color'],
-                             (center_x, center_y), 10)
-            
-            # Command bridge
-            pygame.draw.polygon(self.original_image, self.design['cockpit_color'], [
-                (center_x - 15, center_y + 15),
-                (center_x + 15, center_y + 15),
-                (center_x + 10, center_y - 5),
-                (center_x - 10, center_y - 5)
-            ])
-            
-        # Initialize boss battle variables
-        self.last_shot = pygame.time.get_ticks()
-        self.shoot_delay = self.design['shoot_delay'] if 'shoot_delay' in self.design else 3000
-        self.bullets = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
+        return EnemyArchetype(enemy_type, round_number, design, health, points,
+                              design.get('collision_damage', 10),  # 默认碰撞伤害为10
+                              shoot_delay, None if enemy_type == 'boss' else Enemy.ship_image(enemy_type),
+                              min(design['size']) // 2)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def ship_image(enemy_type):
+        """Return the image shared by all regular enemies of a type (the boss draws its own)"""
+        design = Enemy.ENEMY_DESIGNS[enemy_type]
+        image = pygame.Surface(design['size'], pygame.SRCALPHA)
+        
+        # Common measurements
+        width, height = design['size']
+        center_x = width // 2
+        center_y = height // 2
         
-        # Health bar properties for boss
-        if enemy_type == 'boss':
-            self.health_bar_height = 10
-            self.health_bar_width = 200
-            self.health_bar_surface = pygame.Surface((self.health_bar_width + 4, self.health_bar_height + 4))
-            self.phase_text_surface = pygame.Surface((300, 30), pygame.SRCALPHA)
-            self.phase_text_color = (255, 255, 255)
+        # Lower wing structures
+        pygame.draw.polygon(image, design['wing_color'], [
+            (center_x - 30, height - 20), # Right base
+            (center_x - 50, height - 15), # Right tip
+            (center_x - 25, height - 30)  # Right top
+        ])
+        pygame.draw.polygon(image, design['wing_color'], [
+            (center_x + 30, height - 20), # Left base
+            (center_x + 50, height - 15), # Left tip
+            (center_x + 25, height - 30)  # Left top
+        ])
+        
+        # Advanced weapon systems (visible cannons)
+        pygame.draw.rect(image, design['engine_color'],
+                       [center_x - 25, height - 35, 10, 20])  # Left cannon
+        pygame.draw.rect(image, design['engine_color'],
+                       [center_x + 15, height - 35, 10, 20])  # Right cannon
+        
+        # Central cannon
+        pygame.draw.polygon(image, design['engine_color'], [
+            (center_x - 8, height - 15),
+            (center_x + 8, height - 15),
+            (center_x + 5, height - 5),
+            (center_x - 5, height - 5)
+        ])
+        
+        # Energy core
+        pygame.draw.circle(image, design['core_color'],
+                         (center_x, center_y), 15)
+        pygame.draw.circle(image, design['engine_color'],
+                         (center_x, center_y), 10)
+        
+        # Command bridge
+        pygame.draw.polygon(image, design['cockpit_color'], [
+            (center_x - 15, center_y + 15),
+            (center_x + 15, center_y + 15),
+            (center_x + 10, center_y - 5),
+            (center_x - 10, center_y - 5)
+        ])
         
         if enemy_type == 'scout':
             # Fast, arrow-like ship with swept-back wings
             # Main body (pointed downward)
-            pygame.draw.polygon(self.original_image, self.design['color'], [
+            pygame.draw.polygon(image, design['color'], [
                 (center_x, height - 5),        # Nose (bottom)
                 (center_x + 8, 15),            # Right mid
                 (center_x, 10),                # Top
@@ -1161,25 +974,25 @@ class Enemy(pygame.sprite.Sprite):
             ])
             
             # Wings (swept forward)
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x - 8, 15),            # Wing root left
                 (5, 5),                        # Wing tip left
                 (center_x - 5, 18)             # Wing back left
             ])
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x + 8, 15),            # Wing root right
                 (width - 5, 5),                # Wing tip right
                 (center_x + 5, 18)             # Wing back right
             ])
             
             # Cockpit
-            pygame.draw.ellipse(self.original_image, self.design['cockpit_color'],
+            pygame.draw.ellipse(image, design['cockpit_color'],
                               [center_x - 3, height - 18, 6, 8])
             
         elif enemy_type == 'fighter':
             # X-wing style fighter with distinct wings and body
             # Main body (sleek and pointed)
-            pygame.draw.polygon(self.original_image, self.design['color'], [
+            pygame.draw.polygon(image, design['color'], [
                 (center_x, 10),                # Nose
                 (center_x + 10, height - 15),  # Right bottom
                 (center_x + 8, 15),            # Right top
@@ -1190,42 +1003,42 @@ class Enemy(pygame.sprite.Sprite):
             
             # Wings (more defined X-wing style)
             # Left wing
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x - 8, height - 20),   # Wing base
                 (5, height - 25),              # Wing tip
                 (8, height - 15),              # Wing back
                 (center_x - 6, height - 15)    # Wing join
             ])
             # Right wing
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x + 8, height - 20),   # Wing base
                 (width - 5, height - 25),      # Wing tip
                 (width - 8, height - 15),      # Wing back
                 (center_x + 6, height - 15)    # Wing join
             ])
             # Upper wings
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x - 6, 20),            # Left wing
                 (10, 5),                       # Left tip
                 (center_x - 4, 15)             # Left base
             ])
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x + 6, 20),            # Right wing
                 (width - 10, 5),               # Right tip
                 (center_x + 4, 15)             # Right base
             ])
             
             # Cockpit (more detailed)
-            pygame.draw.ellipse(self.original_image, self.design['cockpit_color'],
+            pygame.draw.ellipse(image, design['cockpit_color'],
                               [center_x - 5, height - 25, 10, 12])
             # Cockpit detail
-            pygame.draw.ellipse(self.original_image, self.design['engine_color'],
+            pygame.draw.ellipse(image, design['engine_color'],
                               [center_x - 3, height - 23, 6, 8])
             
         elif enemy_type == 'bomber':
             # Heavy bomber with distinct sections and heavy armor
             # Main body (armored and wide)
-            pygame.draw.polygon(self.original_image, self.design['color'], [
+            pygame.draw.polygon(image, design['color'], [
                 (center_x, height - 5),        # Nose (bottom)
                 (center_x + 20, height - 15),  # Right bottom
                 (center_x + 15, 10),           # Right top
@@ -1235,14 +1048,14 @@ class Enemy(pygame.sprite.Sprite):
             ])
             
             # Side armor plates
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x - 20, height - 15),  # Bottom left
                 (center_x - 15, height - 25),  # Mid left
                 (center_x - 12, 15),           # Top left
                 (center_x - 8, 12),            # Inner top left
                 (center_x - 10, height - 15)   # Inner bottom left
             ])
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x + 20, height - 15),  # Bottom right
                 (center_x + 15, height - 25),  # Mid right
                 (center_x + 12, 15),           # Top right
@@ -1251,7 +1064,7 @@ class Enemy(pygame.sprite.Sprite):
             ])
             
             # Top armor section
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x - 8, 15),            # Left
                 (center_x, 8),                 # Top
                 (center_x + 8, 15),            # Right
@@ -1260,17 +1073,17 @@ class Enemy(pygame.sprite.Sprite):
             
             # Multiple engine effects (three thrusters)
             for x, size in [(center_x - 12, 4), (center_x, 5), (center_x + 12, 4)]:
-                pygame.draw.polygon(self.original_image, self.design['engine_color'], [
+                pygame.draw.polygon(image, design['engine_color'], [
                     (x - size, 12),
                     (x, 7),
                     (x + size, 12)
                 ])
                 # Engine glow
-                pygame.draw.circle(self.original_image, self.design['core_color'],
+                pygame.draw.circle(image, design['core_color'],
                                  (x, 10), size - 2)
             
             # Cockpit (armored)
-            pygame.draw.polygon(self.original_image, self.design['cockpit_color'], [
+            pygame.draw.polygon(image, design['cockpit_color'], [
                 (center_x - 6, height - 25),   # Left
                 (center_x, height - 30),       # Top
                 (center_x + 6, height - 25),   # Right
@@ -1280,7 +1093,7 @@ class Enemy(pygame.sprite.Sprite):
         elif enemy_type == 'elite':
             # Advanced ship with energy shield and high-tech design
             # Main body (sleek and angular)
-            pygame.draw.polygon(self.original_image, self.design['color'], [
+            pygame.draw.polygon(image, design['color'], [
                 (center_x, height - 5),        # Nose (bottom)
                 (center_x + 15, height - 20),  # Right bottom
                 (center_x + 12, center_y),     # Right middle
@@ -1302,22 +1115,22 @@ class Enemy(pygame.sprite.Sprite):
                 (center_x - 15, center_y),     # Left middle
                 (center_x - 18, height - 22)   # Left bottom
             ]
-            pygame.draw.lines(self.original_image, self.design['wing_color'], True, points, 2)
+            pygame.draw.lines(image, design['wing_color'], True, points, 2)
             
             # Energy field patterns
             for y in range(20, height - 20, 10):
-                pygame.draw.line(self.original_image, self.design['engine_color'],
+                pygame.draw.line(image, design['engine_color'],
                                (center_x - 10, y), (center_x + 10, y), 1)
             
             # Advanced cockpit with energy glow
-            pygame.draw.polygon(self.original_image, self.design['cockpit_color'], [
+            pygame.draw.polygon(image, design['cockpit_color'], [
                 (center_x - 5, height - 25),   # Left
                 (center_x, height - 30),       # Top
                 (center_x + 5, height - 25),   # Right
                 (center_x, height - 20)        # Bottom
             ])
             # Cockpit glow
-            pygame.draw.polygon(self.original_image, self.design['core_color'], [
+            pygame.draw.polygon(image, design['core_color'], [
                 (center_x - 3, height - 24),
                 (center_x, height - 28),
                 (center_x + 3, height - 24),
@@ -1326,42 +1139,42 @@ class Enemy(pygame.sprite.Sprite):
             
             # Side energy emitters
             for x in [center_x - 12, center_x + 12]:
-                pygame.draw.circle(self.original_image, self.design['engine_color'],
+                pygame.draw.circle(image, design['engine_color'],
                                  (x, center_y), 3)
-                pygame.draw.circle(self.original_image, self.design['core_color'],
+                pygame.draw.circle(image, design['core_color'],
                                  (x, center_y), 1)
         elif enemy_type == 'redcross':
             # Medical ship with cross symbol
-            width, height = self.design['size']
+            width, height = design['size']
             center_x = width // 2
             center_y = height // 2
             
             # Main body (circular white ship)
-            pygame.draw.circle(self.original_image, self.design['color'],
+            pygame.draw.circle(image, design['color'],
                              (center_x, center_y), 20)
             
             # Red cross symbol
             # Vertical bar
-            pygame.draw.rect(self.original_image, self.design['wing_color'],
+            pygame.draw.rect(image, design['wing_color'],
                            [center_x - 4, center_y - 15, 8, 30])
             # Horizontal bar
-            pygame.draw.rect(self.original_image, self.design['wing_color'],
+            pygame.draw.rect(image, design['wing_color'],
                            [center_x - 15, center_y - 4, 30, 8])
             
             # Healing aura effect (concentric circles)
-            pygame.draw.circle(self.original_image, self.design['engine_color'],
+            pygame.draw.circle(image, design['engine_color'],
                              (center_x, center_y), 22, 1)
-            pygame.draw.circle(self.original_image, self.design['engine_color'],
+            pygame.draw.circle(image, design['engine_color'],
                              (center_x, center_y), 24, 1)
             
             # Cockpit
-            pygame.draw.circle(self.original_image, self.design['cockpit_color'],
+            pygame.draw.circle(image, design['cockpit_color'],
                              (center_x, center_y - 8), 5)
         
         elif enemy_type == 'striker':
             # Striker design - sleek and aggressive green ship
             # Main body (arrow-shaped)
-            pygame.draw.polygon(self.original_image, self.design['color'], [
+            pygame.draw.polygon(image, design['color'], [
                 (center_x, 10),                # Nose
                 (center_x + 15, height - 15),  # Right bottom
                 (center_x, height - 10),       # Bottom point
@@ -1369,36 +1182,36 @@ class Enemy(pygame.sprite.Sprite):
             ])
             
             # Side wings (swept forward)
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x - 15, height - 15),  # Wing base left
                 (center_x - 25, height - 25),  # Wing tip left
                 (center_x - 10, height - 30)   # Wing top left
             ])
-            pygame.draw.polygon(self.original_image, self.design['wing_color'], [
+            pygame.draw.polygon(image, design['wing_color'], [
                 (center_x + 15, height - 15),  # Wing base right
                 (center_x + 25, height - 25),  # Wing tip right
                 (center_x + 10, height - 30)   # Wing top right
             ])
             
             # Engine exhausts (three thrusters)
-            pygame.draw.polygon(self.original_image, self.design['engine_color'], [
+            pygame.draw.polygon(image, design['engine_color'], [
                 (center_x - 10, height - 12),
                 (center_x - 8, height - 5),
                 (center_x - 6, height - 12)
             ])
-            pygame.draw.polygon(self.original_image, self.design['engine_color'], [
+            pygame.draw.polygon(image, design['engine_color'], [
                 (center_x - 2, height - 12),
                 (center_x, height - 5),
                 (center_x + 2, height - 12)
             ])
-            pygame.draw.polygon(self.original_image, self.design['engine_color'], [
+            pygame.draw.polygon(image, design['engine_color'], [
                 (center_x + 6, height - 12),
                 (center_x + 8, height - 5),
                 (center_x + 10, height - 12)
             ])
             
             # Cockpit (streamlined)
-            pygame.draw.polygon(self.original_image, self.design['cockpit_color'], [
+            pygame.draw.polygon(image, design['cockpit_color'], [
                 (center_x - 4, height - 25),
                 (center_x, height - 30),
                 (center_x + 4, height - 25),
@@ -1406,91 +1219,49 @@ class Enemy(pygame.sprite.Sprite):
             ])
             
             # Energy core
-            pygame.draw.circle(self.original_image, self.design['core_color'],
+            pygame.draw.circle(image, design['core_color'],
                              (center_x, height - 25), 3)
         
         # Add engine effects to all ships (now at top)
-        self.add_engine_effects()
-            
-        self.image = self.original_image
-        self.rect = self.image.get_rect()
-        self.radius = min(self.design['size']) // 2
-        
-        # Initialize sprite properties
-        self.bullets = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
-        self.last_shot = pygame.time.get_ticks()
-        self.spawn_time = pygame.time.get_ticks()
-        
-        # Initialize position and movement
-        self.rect.x = random.randint(0, pygame.display.get_surface().get_width() - self.rect.width)
-        self.rect.y = random.randint(-150, -50) if enemy_type != 'boss' else -100
-        self.speed_y = self.design['speed']
-        self.speed_x = 0
-        
-        # Movement pattern variables
-        self.movement_pattern = 'boss_pattern' if enemy_type == 'boss' else random.choice(['straight', 'zigzag', 'sine'])
-        self.pattern_offset = random.randint(0, 360)
-        self.angle = 0
-        
-        # Initialize shooting variables with type-specific delay
-        self.shoot_delay = self.design['shoot_delay']
-        if self.shoot_delay is not None:  # Only for shooting ships
-            self.shoot_delay = int(self.shoot_delay * (0.9 ** (round_number - 1)))  # 10% faster per round
-            self.shoot_delay = max(1500, self.shoot_delay)  # Minimum 1.5 second delay
-        self.last_shot = pygame.time.get_ticks()
-        self.bullets = pygame.sprite.Group()
-        self.spawn_time = pygame.time.get_ticks()
-        
-        # Initialize sprite properties
-        self.bullets = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
-        self.last_shot = pygame.time.get_ticks()
-        self.spawn_time = pygame.time.get_ticks()
-        
-        # Particles
-        self.particles = pygame.sprite.Group()
+        Enemy.add_engine_effects(image, enemy_type, design)
+        return image
 
-    def add_engine_effects(self):
-        """Add engine glow and core effects"""
-        width, height = self.design['size']
+    @staticmethod
+    def add_engine_effects(image, enemy_type, design):
+        """Add engine glow and core effects to a ship image"""
+        width, height = design['size']
         center_x = width // 2
         
-        if self.enemy_type == 'boss':
+        if enemy_type == 'boss':
             # Engine glow for boss (at the top)
-            pygame.draw.polygon(self.original_image, self.design['engine_color'], [
+            pygame.draw.polygon(image, design['engine_color'], [
                 (center_x - 8, 5),
                 (center_x, 15),
                 (center_x + 8, 5)
             ])
             
             # Core glow
-            pygame.draw.circle(self.original_image, self.design['core_color'],
+            pygame.draw.circle(image, design['core_color'],
                              (center_x, 10), 4)
         else:
             # Engine glow for regular enemies
-            pygame.draw.polygon(self.original_image, self.design['engine_color'], [
+            pygame.draw.polygon(image, design['engine_color'], [
                 (center_x - 4, 8),
                 (center_x, 3),
                 (center_x + 4, 8)
             ])
             
             # Core glow
-            pygame.draw.circle(self.original_image, self.design['core_color'],
+            pygame.draw.circle(image, design['core_color'],
                              (center_x, 8), 2)
 
+    def kill(self):
+        super().kill()
+        if self.motion is not None:
+            enemy_motion.remove(self)
+
     def rotate(self):
-        """Rotate the enemy ship based on its movement pattern"""
-        if self.movement_pattern == 'straight':
-            return  # No rotation for straight movement
-            
-        # Calculate rotation angle
-        if self.movement_pattern == 'zigzag':
-            self.angle = math.sin(pygame.time.get_ticks() * 0.003 + self.pattern_offset) * 30
-        elif self.movement_pattern == 'sine':
-            self.angle = math.cos(pygame.time.get_ticks() * 0.002 + self.pattern_offset) * 20
-            
-        # Apply rotation
+        """Rotate the boss by its angle (regular enemies tilt in enemy_motion.py)"""
         rotated_image = pygame.transform.rotate(self.original_image, self.angle)
         old_center = self.rect.center
         self.image = rotated_image
@@ -1507,31 +1278,28 @@ class Enemy(pygame.sprite.Sprite):
         
         # Add muzzle flash effect
         for _ in range(3):
-            particle = Particle(self.rect.centerx, self.rect.bottom,
+            particle = particle_pool.acquire(self.rect.centerx, self.rect.bottom,
                              (255, 200, 0), 0, 1)
             self.particles.add(particle)
         
         if bullet_type == 'small_laser':
             # Single fast laser
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom, 0, 4, 
-                               damage, color=(255, 0, 0), size=3)
-            self.bullets.add(bullet)
+            enemy_bullets.spawn(self.world, self.rect.centerx, self.rect.bottom, 0, 4,
+                                damage, color=(255, 0, 0), size=3, owner=self)
             debug_print(f"Scout fired a laser! Damage: {damage}", "yellow")
             
         elif bullet_type == 'dual_shot':
             # Two bullets side by side
-            bullet1 = EnemyBullet(self.rect.centerx - 10, self.rect.bottom, -0.5, 4, 
-                                damage, color=(148, 0, 211), size=4)
-            bullet2 = EnemyBullet(self.rect.centerx + 10, self.rect.bottom, 0.5, 4, 
-                                damage, color=(148, 0, 211), size=4)
-            self.bullets.add(bullet1, bullet2)
+            enemy_bullets.spawn(self.world, self.rect.centerx - 10, self.rect.bottom, -0.5, 4,
+                                damage, color=(148, 0, 211), size=4, owner=self)
+            enemy_bullets.spawn(self.world, self.rect.centerx + 10, self.rect.bottom, 0.5, 4,
+                                damage, color=(148, 0, 211), size=4, owner=self)
             debug_print(f"Fighter fired dual shots! Damage: {damage}", "magenta")
             
         elif bullet_type == 'plasma':
             # Large slow plasma ball
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom, 0, 3, 
-                               damage, color=(0, 255, 0), size=8)
-            self.bullets.add(bullet)
+            enemy_bullets.spawn(self.world, self.rect.centerx, self.rect.bottom, 0, 3,
+                                damage, color=(0, 255, 0), size=8, owner=self)
             debug_print(f"Bomber fired plasma! Damage: {damage}", "green")
             
         elif bullet_type == 'spread':
@@ -1540,10 +1308,8 @@ class Enemy(pygame.sprite.Sprite):
                 rad = math.radians(angle)
                 speed_x = math.sin(rad) * 3
                 speed_y = math.cos(rad) * 3
-                bullet = EnemyBullet(self.rect.centerx, self.rect.bottom,
-                                   speed_x, speed_y, damage, 
-                                   color=(0, 0, 255), size=5)
-                self.bullets.add(bullet)
+                enemy_bullets.spawn(self.world, self.rect.centerx, self.rect.bottom,
+                                    speed_x, speed_y, damage, color=(0, 0, 255), size=5, owner=self)
             debug_print(f"Elite fired spread shot! Damage: {damage}", "blue")
 
     def redraw_boss(self):
@@ -1603,7 +1369,7 @@ class Enemy(pygame.sprite.Sprite):
                           [center_x-12, center_y-5, 24, 10])
         
         # 能量核心 - 脉动效果
-        pulse = abs(math.sin(pygame.time.get_ticks() * 0.01)) * 0.3 + 0.7
+        pulse = abs(math.sin(game_clock.get_ticks() * 0.01)) * 0.3 + 0.7
         core_color = tuple(int(c * pulse) for c in (255, 255, 255))
         pygame.draw.circle(self.original_image, core_color, (center_x, center_y), 8)
         pygame.draw.circle(self.original_image, (0, 255, 255), (center_x, center_y), 5)
@@ -1691,91 +1457,55 @@ class Enemy(pygame.sprite.Sprite):
                 
                 # 添加相位转换特效
                 for _ in range(30):
-                    angle = random.uniform(0, math.pi * 2)
-                    speed = random.uniform(3, 7)
+                    angle = rng.cosmetic.uniform(0, math.pi * 2)
+                    speed = rng.cosmetic.uniform(3, 7)
                     speed_x = math.cos(angle) * speed
                     speed_y = math.sin(angle) * speed
                     
                     # 使用旧相位和新相位的颜色混合
                     old_color = old_phase['color'] if old_phase else new_phase['color']
-                    color = old_color if random.random() < 0.5 else new_phase['color']
+                    color = old_color if rng.cosmetic.random() < 0.5 else new_phase['color']
                     
-                    particle = Particle(self.rect.centerx, self.rect.centery,
+                    particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
                                       color, speed_x, speed_y, 
-                                      size=random.randint(3, 6))
+                                      size=rng.cosmetic.randint(3, 6))
                     self.particles.add(particle)
     
     def update(self):
-        self.rotate()
-        
         # Update position based on movement pattern
         if self.movement_pattern == 'boss_pattern':
+            self.rotate()
             # Boss moves in a slow side-to-side pattern at the top of the screen
             if self.rect.y < 100:  # Move to position first
                 self.rect.y += self.speed_y
             else:
-                self.rect.x += math.cos(pygame.time.get_ticks() * 0.001) * 2
+                self.rect.x += math.cos(game_clock.get_ticks() * 0.001) * 2
             
             # Update boss phase
             self.update_phase()
             
             # Boss shooting pattern based on current phase
-            now = pygame.time.get_ticks()
+            now = game_clock.get_ticks()
             if now - self.last_shot > self.shoot_delay:
                 # 根据当前相位选择攻击模式
                 if self.current_phase:
-                    attack_pattern = random.choice(self.current_phase['attack_patterns'])
-                    if attack_pattern == 'umbrella':
-                        self.shoot_umbrella()
-                        cprint("Boss: 雨伞模式攻击！", "yellow")
-                    elif attack_pattern == 'spread':
-                        self.shoot_spread()
-                        cprint("Boss: 散射攻击！", "cyan")
-                    elif attack_pattern == 'laser_barrage':
-                        self.shoot_laser_barrage()
-                        cprint("Boss: 激光弹幕！", "blue")
-                    elif attack_pattern == 'cross_fire':
-                        self.shoot_cross_fire()
-                        cprint("Boss: 十字火力攻击！", "red")
-                    elif attack_pattern == 'spiral':
-                        self.shoot_spiral()
-                        cprint("Boss: 螺旋攻击！", "magenta")
-                    elif attack_pattern == 'death_spiral':
-                        self.shoot_death_spiral()
-                        cprint("Boss: 死亡螺旋攻击！", "magenta")
-                    elif attack_pattern == 'bullet_hell':
-                        self.shoot_bullet_hell()
-                        cprint("Boss: 弹幕地狱模式！", "white")
+                    pattern = PATTERNS.get(rng.gameplay.choice(self.current_phase['attack_patterns']))
+                    if pattern is not None:
+                        self.fire_pattern(pattern)
+                        cprint(pattern.message, pattern.message_color)
                 self.last_shot = now
         else:
-            if self.movement_pattern == 'straight':
-                self.rect.y += self.speed_y
-            elif self.movement_pattern == 'zigzag':
-                self.rect.x += math.sin(pygame.time.get_ticks() * 0.003 + self.pattern_offset) * 3
-                self.rect.y += self.speed_y
-            elif self.movement_pattern == 'sine':
-                self.rect.x += math.cos(pygame.time.get_ticks() * 0.002 + self.pattern_offset) * 2
-                self.rect.y += self.speed_y
-            
+            # 普通敌人的移动、重生和边界由enemy_motion.py整批处理
             # Regular enemy shooting
-            now = pygame.time.get_ticks()
+            now = game_clock.get_ticks()
             # Only start shooting 1 second after spawning and if ship has shooting capability
             if self.shoot_delay is not None and now - self.spawn_time > 1000:
                 if now - self.last_shot > self.shoot_delay:
                     self.shoot()
                     self.last_shot = now
         
-        # Update and remove off-screen bullets
-        self.bullets.update()
-        for bullet in self.bullets.copy():
-            if bullet.rect.top > 768 + 50 or bullet.rect.bottom < -50:
-                bullet.kill()
-        
-        # Update particles
-        self.particles.update()
-        
         # Add engine particles
-        if random.random() < 0.2:
+        if rng.cosmetic.random() < 0.2:
             color = {
                 'scout': (255, 100, 100),    # Red laser
                 'fighter': (200, 100, 255),  # Purple energy
@@ -1786,25 +1516,20 @@ class Enemy(pygame.sprite.Sprite):
                 'redcross': (255, 255, 255)  # White healing
             }[self.enemy_type]
                 
-            speed_x = random.uniform(-1, 1)
-            speed_y = random.uniform(-3, -1)
-            particle = Particle(self.rect.centerx, self.rect.bottom - 5,
+            speed_x = rng.cosmetic.uniform(-1, 1)
+            speed_y = rng.cosmetic.uniform(-3, -1)
+            particle = particle_pool.acquire(self.rect.centerx, self.rect.bottom - 5,
                               color, speed_x, speed_y)
             self.particles.add(particle)
         
-        # Reset position when off screen (only for non-boss enemies)
-        if self.enemy_type != 'boss' and self.rect.top > 768 + 50:  # 给予更大的缓冲区
-            self.rect.x = random.randrange(1024 - self.rect.width)
-            self.rect.y = random.randrange(-100, -40)
-            self.speed_y = self.design['speed']
-            
-        # Bounce off screen edges
-        if self.rect.left < 0:
-            self.rect.left = 0
-            self.speed_x = abs(self.speed_x)
-        elif self.rect.right > 1024:
-            self.rect.right = 1024
-            self.speed_x = -abs(self.speed_x)
+        # Bounce off screen edges (regular enemies: enemy_motion.keep_in_bounds)
+        if self.movement_pattern == 'boss_pattern':
+            if self.rect.left < 0:
+                self.rect.left = 0
+                self.speed_x = abs(self.speed_x)
+            elif self.rect.right > 1024:
+                self.rect.right = 1024
+                self.speed_x = -abs(self.speed_x)
             
     def take_damage(self, amount):
         """处理敌人受到伤害的逻辑"""
@@ -1823,10 +1548,10 @@ class Enemy(pygame.sprite.Sprite):
         
         # 添加伤害粒子特效
         for _ in range(particle_count):
-            speed_x = random.uniform(-3, 3)
-            speed_y = random.uniform(-3, 3)
-            size = random.randint(2, 4)
-            particle = Particle(self.rect.centerx, self.rect.centery,
+            speed_x = rng.cosmetic.uniform(-3, 3)
+            speed_y = rng.cosmetic.uniform(-3, 3)
+            size = rng.cosmetic.randint(2, 4)
+            particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
                               particle_color, speed_x, speed_y, size)
             self.particles.add(particle)
         
@@ -1837,267 +1562,30 @@ class Enemy(pygame.sprite.Sprite):
         
         return self.health <= 0
 
-    def shoot_umbrella(self):
-        """创建伞形弹幕"""
-        bullet_count = 12
-        spread = 360  # 全圈
-        
-        for i in range(bullet_count):
-            angle = (360 * i / bullet_count)
-            rad = math.radians(angle)
-            speed_x = math.cos(rad) * 4
-            speed_y = math.sin(rad) * 4
-            
-            # 创建子弹
-            bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                                speed_x, speed_y, self.design['bullet_damage'],
-                                color=self.current_phase['color'])
-            self.bullets.add(bullet)
-    
-    def shoot_spread(self):
-        """创建散射弹幕"""
-        angles = [-45, -30, -15, 0, 15, 30, 45]
-        for angle in angles:
-            rad = math.radians(angle)
-            speed_x = math.sin(rad) * 5
-            speed_y = math.cos(rad) * 5
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom,
-                               speed_x, speed_y, self.design['bullet_damage'],
-                               color=self.design['color'])
-            self.bullets.add(bullet)
-    
-    def shoot_laser_barrage(self):
-        """创建激光弹幕"""
-        for i in range(5):
-            offset = random.randint(-30, 30)
-            speed_x = math.sin(math.radians(offset)) * 6
-            speed_y = math.cos(math.radians(offset)) * 6
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom,
-                               speed_x, speed_y, self.design['bullet_damage'],
-                               color=self.design['color'], size=3)
-            self.bullets.add(bullet)
-    
-    def shoot_cross_fire(self):
-        """十字弹幕"""
-        angles = [0, 90, 180, 270]
-        for angle in angles:
-            rad = math.radians(angle)
-            speed_x = math.cos(rad) * 4
-            speed_y = math.sin(rad) * 4
-            bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                               speed_x, speed_y, self.design['bullet_damage'],
-                               color=self.design['color'])
-            self.bullets.add(bullet)
-    
-    def shoot_spiral(self):
-        """螺旋弹幕"""
-        now = pygame.time.get_ticks()
-        angle = (now / 100) % 360  # 每100ms旋转一圈
-        for i in range(3):  # 发射3个子弹
-            rad = math.radians(angle + i * 120)
-            speed_x = math.cos(rad) * 5
-            speed_y = math.sin(rad) * 5
-            bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                               speed_x, speed_y, self.design['bullet_damage'],
-                               color=self.design['color'])
-            self.bullets.add(bullet)
-    
-    def shoot_death_spiral(self):
-        """死亡螺旋弹幕"""
-        now = pygame.time.get_ticks()
-        base_angle = (now / 50) % 360  # 更快的旋转
-        for i in range(2):  # 两个螺旋
-            for j in range(6):  # 每个螺旋6个子弹
-                angle = base_angle + i * 180 + j * 60
-                rad = math.radians(angle)
-                speed = 3 + (j % 2)  # 交替的速度
-                speed_x = math.cos(rad) * speed
-                speed_y = math.sin(rad) * speed
-                bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                                   speed_x, speed_y, self.design['bullet_damage'],
-                                   color=self.current_phase['color'])
-                self.bullets.add(bullet)
-    
-    def shoot_bullet_hell(self):
-        """地狱弹幕"""
-        bullet_count = 16
-        now = pygame.time.get_ticks()
-        base_angle = (now / 200) % 360
-        
-        for i in range(bullet_count):
-            angle = base_angle + (360 * i / bullet_count)
-            rad = math.radians(angle)
-            speed_x = math.cos(rad) * 4
-            speed_y = math.sin(rad) * 4
-            
-            # 创建两圈子弹
-            for radius in [30, 60]:
-                bullet_x = self.rect.centerx + math.cos(rad) * radius
-                bullet_y = self.rect.centery + math.sin(rad) * radius
-                bullet = EnemyBullet(bullet_x, bullet_y,
-                                   speed_x, speed_y, self.design['bullet_damage'],
-                                   color=self.current_phase['color'])
-                self.bullets.add(bullet)
-            
-            # Add muzzle flash particles
-            for _ in range(2):
-                particle = Particle(self.rect.centerx, self.rect.centery,
-                                 (255, 200, 0), speed_x * 0.5, speed_y * 0.5)
-                self.particles.add(particle)
-                
-    def shoot_spread(self):
-        """Create a spread shot pattern"""
-        bullet_count = 5
-        spread = 60
-        
-        # Calculate base angle towards player if available
-        if hasattr(self, 'player') and self.player:
-            dx = self.player.rect.centerx - self.rect.centerx
-            dy = self.player.rect.centery - self.rect.centery
-            base_angle = math.degrees(math.atan2(dy, dx))
-        else:
-            base_angle = 90
-        
-        for i in range(bullet_count):
-            angle = base_angle - (spread / 2) + (spread * i / (bullet_count - 1))
-            rad = math.radians(angle)
-            speed_x = math.cos(rad) * 5
-            speed_y = math.sin(rad) * 5
-            
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom,
-                                speed_x, speed_y, self.design['bullet_damage'] * 0.8,
-                                color=self.current_phase['color'])
-            self.bullets.add(bullet)
-            
-    def shoot_laser_barrage(self):
-        """Create a laser barrage pattern"""
-        for x in range(self.rect.left + 10, self.rect.right - 10, 20):
-            bullet = EnemyBullet(x, self.rect.bottom, 0, 6,
-                                self.design['bullet_damage'] * 1.2,
-                                color=self.current_phase['color'], size=4)
-            self.bullets.add(bullet)
-            
-            # Add laser charging effect
-            for _ in range(2):
-                particle = Particle(x, self.rect.bottom,
-                                 (0, 200, 255),
-                                 random.uniform(-0.5, 0.5),
-                                 random.uniform(-1, 1))
-                self.particles.add(particle)
-                
-    def shoot_cross_fire(self):
-        """Create a cross-shaped bullet pattern"""
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-        speed = 4
-        
-        for dx, dy in directions:
-            for i in range(3):
-                offset = i * 20
-                bullet = EnemyBullet(self.rect.centerx + offset * dx,
-                                    self.rect.centery + offset * dy,
-                                    dx * speed, dy * speed,
-                                    self.design['bullet_damage'],
-                                    color=self.current_phase['color'])
-                self.bullets.add(bullet)
-            
-    def shoot_death_spiral(self):
-        """Create a spiral pattern of bullets"""
-        now = pygame.time.get_ticks()
-        angle = (now // 100) % 360
-        speed = 4
-        
-        for i in range(8):
-            spiral_angle = angle + i * 45
-            rad = math.radians(spiral_angle)
-            speed_x = math.cos(rad) * speed
-            speed_y = math.sin(rad) * speed
-            
-            bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                                speed_x, speed_y,
-                                self.design['bullet_damage'] * 1.2,
-                                color=(255, 0, 128))
-            self.bullets.add(bullet)
-            
-            # Add spiral effect particles
-            particle = Particle(self.rect.centerx, self.rect.centery,
-                             (255, 100, 200),
-                             speed_x * 0.5, speed_y * 0.5)
-            self.particles.add(particle)
-            
-    def shoot_bullet_hell(self):
-        """Create a random bullet hell pattern"""
-        for _ in range(12):
-            angle = random.randint(0, 360)
-            rad = math.radians(angle)
-            speed = random.uniform(3, 6)
-            speed_x = math.cos(rad) * speed
-            speed_y = math.sin(rad) * speed
-            
-            # Random bullet color for visual variety
-            color = (random.randint(200, 255),
-                    random.randint(0, 100),
-                    random.randint(0, 255))
-            
-            bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                                speed_x, speed_y,
-                                self.design['bullet_damage'],
-                                color=color)
-            self.bullets.add(bullet)
-            
-            # Add chaotic particles
-            particle = Particle(self.rect.centerx, self.rect.centery,
-                             color,
-                             speed_x * 0.3, speed_y * 0.3)
-            self.particles.add(particle)
+    def fire_pattern(self, pattern):
+        """Fire one volley of a boss bullet pattern (see patterns.py), spawned in one batch"""
+        x, y, vx, vy = pattern.volley(self, game_clock.get_ticks())
+        colors = pattern.colors(self, len(x))
+        damage = self.design['bullet_damage'] * pattern.damage
+        enemy_bullets.spawn_volley(self.world, x, y, vx, vy, damage, colors, pattern.size, owner=self)
+        if not pattern.flash:
+            return
+        x, y, vx, vy = x.tolist(), y.tolist(), vx.tolist(), vy.tolist()
+        # 发射时的粒子效果
+        particles = []
+        for bullet_x, bullet_y, speed_x, speed_y, color in zip(x, y, vx, vy, colors):
+            for _ in range(pattern.flash):
+                if pattern.flash_jitter:
+                    jitter_x, jitter_y = pattern.flash_jitter
+                    speed = (rng.cosmetic.uniform(-jitter_x, jitter_x), rng.cosmetic.uniform(-jitter_y, jitter_y))
+                else:
+                    speed = (speed_x * pattern.flash_speed, speed_y * pattern.flash_speed)
+                particles.append(particle_pool.acquire(bullet_x, bullet_y, pattern.flash_color or color, *speed))
+        self.particles.add(*particles)
 
-class EnemyBullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed_x, speed_y, damage=10, color=(255, 100, 0), size=6):
-        super().__init__()
-        self.image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        # 子弹主体
-        pygame.draw.circle(self.image, color, (size, size), size)
-        # 发光效果
-        glow_color = tuple(min(c + 100, 255) for c in color[:3])  # 更亮的颜色
-        pygame.draw.circle(self.image, glow_color, (size, size), size // 2)
-        
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
-        self.x = float(x)
-        self.y = float(y)
-        self.speed_x = speed_x * 0.7  # 降低速度
-        self.speed_y = speed_y * 0.7  # 降低速度
-        self.damage = damage
-        
-        # 添加拖尾粒子效果
-        self.particles = pygame.sprite.Group()
-        self.last_particle = pygame.time.get_ticks()
-        self.particle_delay = 50  # 每50ms添加一个粒子
-        self.color = color
-
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.rect.x = self.x
-        self.rect.y = self.y
-        
-        # 更新拖尾粒子
-        now = pygame.time.get_ticks()
-        if now - self.last_particle > self.particle_delay:
-            glow_color = tuple(min(c + 50, 255) for c in self.color[:3])
-            particle = Particle(self.rect.centerx, self.rect.centery,
-                              glow_color, random.uniform(-0.5, 0.5),
-                              random.uniform(-0.5, 0.5), size=2)
-            self.particles.add(particle)
-            self.last_particle = now
-        
-        self.particles.update()
-        # 移除消失的粒子
-        for particle in self.particles.copy():
-            if not particle.alive():
-                particle.kill()
 
 class PowerUp(pygame.sprite.Sprite):
+    lifetime = None  # 只在飘出屏幕后移除（见despawn.py）
     TYPES = {
         'shield': {
             'color': (0, 255, 255),  # Cyan
@@ -2132,12 +1620,12 @@ class PowerUp(pygame.sprite.Sprite):
         
         # Movement properties
         self.y_speed = 2
-        self.x_speed = math.sin(pygame.time.get_ticks() * 0.001) * 2
+        self.x_speed = math.sin(game_clock.get_ticks() * 0.001) * 2
         self.angle = 0
         
         # Particles
-        self.particles = pygame.sprite.Group()
-        self.last_particle = pygame.time.get_ticks()
+        self.particles = EntityList()
+        self.last_particle = game_clock.get_ticks()
         self.particle_delay = 100
         
     def update(self):
@@ -2148,24 +1636,19 @@ class PowerUp(pygame.sprite.Sprite):
         
         # Update position with floating movement
         self.rect.y += self.y_speed
-        self.rect.x += math.sin(pygame.time.get_ticks() * 0.002) * 2
+        self.rect.x += math.sin(game_clock.get_ticks() * 0.002) * 2
         
         # Add trailing particles
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
         if now - self.last_particle > self.particle_delay:
-            particle = Particle(self.rect.centerx, self.rect.centery,
+            particle = particle_pool.acquire(self.rect.centerx, self.rect.centery,
                               self.config['color'],
-                              random.uniform(-0.5, 0.5),
-                              random.uniform(-0.5, 0.5),
+                              rng.cosmetic.uniform(-0.5, 0.5),
+                              rng.cosmetic.uniform(-0.5, 0.5),
                               size=3)
             self.particles.add(particle)
             self.last_particle = now
-        
-        # Update particles
-        self.particles.update()
-        for particle in self.particles.copy():
-            if not particle.alive():
-                particle.kill()
+        # 拖尾粒子由Game.update_emitters更新
 
 class ScreenShake:
     def __init__(self):
@@ -2177,11 +1660,11 @@ class ScreenShake:
     def start_shake(self, intensity, duration):
         self.intensity = intensity
         self.duration = duration
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = game_clock.get_ticks()
     
     def update(self):
         if self.intensity > 0:
-            current_time = pygame.time.get_ticks()
+            current_time = game_clock.get_ticks()
             elapsed = current_time - self.start_time
             
             if elapsed < self.duration:
@@ -2191,8 +1674,8 @@ class ScreenShake:
                 
                 # Generate random offset
                 self.offset = [
-                    random.uniform(-current_intensity, current_intensity),
-                    random.uniform(-current_intensity, current_intensity)
+                    rng.cosmetic.uniform(-current_intensity, current_intensity),
+                    rng.cosmetic.uniform(-current_intensity, current_intensity)
                 ]
             else:
                 self.intensity = 0
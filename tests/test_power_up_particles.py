@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from sprites import PowerUp, particle_pool
+
+
+class PowerUpParticlesTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True, seed=1)
+        self.game.start_game('striker', 1)
+        self.power_up = PowerUp(100, 100, 'shield')
+        self.game.power_ups.add(self.power_up)
+        self.game.all_sprites.add(self.power_up)
+
+    def test_particles_are_drawn_with_the_other_entity_lists(self):
+        for _ in range(30):
+            self.game.step()
+        self.assertTrue(self.power_up.particles)
+        self.assertIn(self.power_up.particles, list(self.game.entity_lists()))
+
+    def test_particles_of_a_collected_power_up_go_back_to_the_pool(self):
+        for _ in range(30):
+            self.game.step()
+        self.assertTrue(self.power_up.particles)
+        self.power_up.kill()
+        for _ in range(300):
+            self.game.step()
+        self.assertFalse(self.power_up.particles)
+        self.assertNotIn(self.power_up, self.game.emitters)
+        # 每个借出的粒子都还在某个实体列表中（被丢弃的粒子会让in_use只增不减）
+        self.assertEqual(particle_pool.in_use, sum(len(particles) for particles in self.game.entity_lists()))
+
+
+if __name__ == '__main__':
+    unittest.main()
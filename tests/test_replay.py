@@ -0,0 +1,60 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import replay
+from replay import Replay, ReplayError
+
+
+def recorded(simulation_version=replay.SIMULATION_VERSION):
+    rec = Replay(42, 'striker', 2, simulation_version=simulation_version)
+    for bits in (0, 0, 1, 3, 3):
+        rec.append(bits)
+    return rec
+
+
+class SimulationVersionTest(unittest.TestCase):
+    def save(self, data):
+        fd, path = tempfile.mkstemp(suffix='.rpl')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_round_trip_keeps_the_simulation_version(self):
+        loaded = Replay.load(self.save(recorded().to_bytes()))
+        self.assertEqual(loaded.simulation_version, replay.SIMULATION_VERSION)
+        self.assertEqual((loaded.seed, loaded.ship_type, loaded.formation_type), (42, 'striker', 2))
+        self.assertEqual(list(loaded), [0, 0, 1, 3, 3])
+
+    def test_other_simulation_version_is_rejected(self):
+        path = self.save(recorded(replay.SIMULATION_VERSION + 1).to_bytes())
+        with self.assertRaises(ReplayError):
+            Replay.load(path)
+
+    def test_replays_from_before_the_simulation_version_are_rejected(self):
+        # 格式版本2：没有模拟版本字段
+        data = bytearray(struct.pack('<4sBQB', replay.MAGIC, 2, 42, 1))
+        data += bytes([len(b'striker')]) + b'striker'
+        data += bytes([5, 5, 0, 0])  # 5步，一段输入0，没有关键帧
+        old = Replay.from_bytes(bytes(data))
+        self.assertEqual(old.simulation_version, 0)
+        self.assertEqual(len(old), 5)
+        with self.assertRaises(ReplayError):
+            Replay.load(self.save(bytes(data)))
+
+    def test_play_replay_rejects_other_simulation_versions(self):
+        from game import Game
+        game = Game(headless=True)
+        with self.assertRaises(ReplayError):
+            game.play_replay(recorded(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulate
+
+
+def fake_game(round_number):
+    return SimpleNamespace(current_round=round_number, score=0, score_for_boss=1000, lives=3)
+
+
+class RoundEntryTest(unittest.TestCase):
+    def test_enemy_stats_for_every_round(self):
+        for round_number in (1, 2, 5, 10):
+            entry = simulate.round_entry(fake_game(round_number), 0)
+            self.assertIsNotNone(entry['enemy_health'], round_number)
+            self.assertIsNotNone(entry['enemy_points'], round_number)
+
+    def test_enemy_stats_grow_with_the_round(self):
+        first = simulate.round_entry(fake_game(1), 0)
+        later = simulate.round_entry(fake_game(5), 0)
+        self.assertGreater(later['enemy_health'], first['enemy_health'])
+        self.assertGreater(later['enemy_points'], first['enemy_points'])
+
+    def test_played_game_reports_enemy_stats(self):
+        # 开局时场上还没有敌人（第一波在回合公告后入场）
+        result = simulate.play(1, 'striker', 1, max_ticks=60)
+        self.assertEqual(result['rounds'][0]['round'], 1)
+        for entry in result['rounds']:
+            self.assertIsNotNone(entry['enemy_health'])
+            self.assertIsNotNone(entry['enemy_points'])
+
+
+if __name__ == '__main__':
+    unittest.main()
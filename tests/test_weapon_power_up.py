@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import projectiles
+from game import Game
+
+
+class WeaponPowerUpTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True, seed=1)
+        self.game.start_game('striker', 1)
+        self.ship = self.game.player_ships[0]
+        self.ship.current_weapon = 'machine_gun'
+
+    def fired_damage(self):
+        self.game.world.clear()
+        self.ship.last_shot = -10 ** 9
+        self.ship.shoot()
+        table = self.game.world.register(projectiles.PROJECTILES['machine_gun'].bundle)
+        return set(table['damage'][:len(table)].tolist())
+
+    def test_bullets_carry_the_weapon_damage(self):
+        base = projectiles.PROJECTILES['machine_gun'].damage
+        self.assertEqual(self.fired_damage(), {base})
+
+        self.game.apply_power_up(self.ship, 'weapon')
+        self.assertEqual(self.ship.weapons['machine_gun'].damage, base * 2)
+        self.assertEqual(self.fired_damage(), {base * 2})
+
+        self.ship.reset_power_up('weapon')
+        self.assertEqual(self.fired_damage(), {base})
+
+
+if __name__ == '__main__':
+    unittest.main()